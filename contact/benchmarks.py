@@ -0,0 +1,241 @@
+"""Microbenchmarks for the hot serialisation, validation, export and query paths.
+
+Each benchmark is a setup function returning the zero-argument callable to
+time. The suite runs on a throwaway database seeded with
+:mod:`contact.services.seed_data`, so results depend on the code and the
+machine, not on whatever the working database holds. Results are compared
+with a baseline stored per machine tag.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import json
+import platform
+import re
+import statistics
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.utils import timezone
+
+from . import tokens
+from .forms import ContactForm, DownloadMessagesForm, MessageFilterForm
+from .models import ContactMessage, _generate_access_token
+from .services import messages as message_service
+from .services.pdf_service import build_messages_pdf
+from .views.admin import _serialise_admin_message
+from .views.helpers import serialise_client_message
+
+PDF_SIZES = (10, 100, 500)
+MIN_ROUND_SECONDS = 0.05
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    name: str
+    setup: Callable[[], Callable[[], object]]
+
+
+@dataclass(frozen=True)
+class Result:
+    name: str
+    loops: int
+    median: float
+    best: float
+
+    def as_dict(self) -> dict[str, float | int]:
+        return {'loops': self.loops, 'median': self.median, 'best': self.best}
+
+
+@dataclass(frozen=True)
+class Comparison:
+    name: str
+    current: float
+    baseline: float | None
+    threshold: float
+
+    @property
+    def change(self) -> float | None:
+        if not self.baseline:
+            return None
+        return self.current / self.baseline - 1
+
+    @property
+    def regressed(self) -> bool:
+        change = self.change
+        return change is not None and change > self.threshold
+
+
+def machine_tag() -> str:
+    """Baselines are only comparable on the same host and interpreter."""
+
+    raw = f'{platform.node()}-{platform.machine()}-py{platform.python_version()}'
+    return re.sub(r'[^A-Za-z0-9_.-]+', '-', raw).strip('-') or 'unknown'
+
+
+def baseline_file() -> Path:
+    return Path(getattr(settings, 'BENCHMARK_BASELINE_FILE', Path(settings.BASE_DIR) / 'benchmarks' / 'baselines.json'))
+
+
+def load_baselines(path: Path) -> dict:
+    try:
+        with path.open(encoding='utf-8') as handle:
+            return json.load(handle)
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(path: Path, machine: str, results: Iterable[Result], *, commit: str | None = None) -> None:
+    """Store ``results`` for ``machine``, keeping other machines and benchmarks not re-run."""
+
+    data = load_baselines(path)
+    entry = data.setdefault(machine, {'results': {}})
+    entry['recorded_at'] = timezone.now().isoformat()
+    entry['commit'] = commit
+    entry['results'].update({result.name: result.as_dict() for result in results})
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    tmp_path.write_text(json.dumps(data, indent=2, sort_keys=True) + '\n', encoding='utf-8')
+    tmp_path.replace(path)
+
+
+def compare(results: Iterable[Result], baseline: dict, *, threshold: float) -> list[Comparison]:
+    stored = baseline.get('results', {})
+    return [
+        Comparison(
+            name=result.name,
+            current=result.median,
+            baseline=stored.get(result.name, {}).get('median'),
+            threshold=threshold,
+        )
+        for result in results
+    ]
+
+
+def select(patterns: Iterable[str] | None = None) -> list[Benchmark]:
+    patterns = list(patterns or [])
+    return [
+        benchmark
+        for benchmark in BENCHMARKS
+        if not patterns or any(fnmatch.fnmatchcase(benchmark.name, pattern) for pattern in patterns)
+    ]
+
+
+def measure(benchmark: Benchmark, *, rounds: int = 5) -> Result:
+    """Time ``rounds`` rounds of the benchmark; each round lasts at least ``MIN_ROUND_SECONDS``.
+
+    The loop count per round is calibrated first, like ``timeit.autorange``;
+    the median per-call time is what baselines are compared on.
+    """
+
+    func = benchmark.setup()
+    func()  # warm-up: imports, template and query caches
+    loops = 1
+    while True:
+        elapsed = _time_loops(func, loops)
+        if elapsed >= MIN_ROUND_SECONDS:
+            break
+        loops *= 10 if elapsed < MIN_ROUND_SECONDS / 10 else 2
+    timings = [_time_loops(func, loops) / loops for _ in range(max(1, rounds))]
+    return Result(benchmark.name, loops, statistics.median(timings), min(timings))
+
+
+def _time_loops(func: Callable[[], object], loops: int) -> float:
+    started = time.perf_counter()
+    for _ in range(loops):
+        func()
+    return time.perf_counter() - started
+
+
+def _sample_message() -> ContactMessage:
+    # A request with attachments and client edits, so every branch is serialised.
+    candidates = ContactMessage.objects.filter(is_deleted=False).order_by('id')
+    return candidates.filter(attachments__isnull=False, client_logs__isnull=False).first() or candidates.first()
+
+
+def _serialise_admin() -> Callable[[], object]:
+    message = _sample_message()
+    return lambda: _serialise_admin_message(message, 'pl')
+
+
+def _serialise_client() -> Callable[[], object]:
+    message = _sample_message()
+    return lambda: serialise_client_message(message, language='pl')
+
+
+def _contact_form() -> Callable[[], object]:
+    data = {
+        'full_name': 'Jan Kowalski',
+        'phone': '+48123456789',
+        'email': 'jan.kowalski@example.com',
+        'company': ContactForm.COMPANY_CHOICES[0][0],
+        'company_name': 'Kowalski Sp. z o.o.',
+        'message': 'Proszę o kontakt w sprawie oferty. ' * 10,
+        'bot_check': 'on',
+    }
+
+    def run() -> object:
+        form = ContactForm(data, language='pl')
+        if not form.is_valid():
+            raise AssertionError(form.errors.as_json())
+        return form.cleaned_data
+
+    return run
+
+
+def _pdf(size: int) -> Callable[[], Callable[[], object]]:
+    def setup() -> Callable[[], object]:
+        ids = list(ContactMessage.objects.order_by('id').values_list('id', flat=True)[:size])
+        fields = [value for value, _ in DownloadMessagesForm.FIELD_CHOICES]
+
+        def run() -> object:
+            return build_messages_pdf(ContactMessage.objects.filter(id__in=ids), fields=fields, language='pl')
+
+        return run
+
+    return setup
+
+
+def _get_messages(sort_by: str) -> Callable[[], Callable[[], object]]:
+    def setup() -> Callable[[], object]:
+        def run() -> object:
+            # What the admin panel does with it: count plus the first page.
+            page = Paginator(message_service.get_messages(sort_by=sort_by), 10).get_page(1)
+            return list(page.object_list)
+
+        return run
+
+    return setup
+
+
+def _token_generate() -> Callable[[], object]:
+    def run() -> object:
+        return tokens.hash_token(_generate_access_token())
+
+    return run
+
+
+def _token_verify() -> Callable[[], object]:
+    token = _generate_access_token()
+    encoded = tokens.hash_token(token)
+
+    def run() -> object:
+        return tokens.verify_token(token, encoded)
+
+    return run
+
+
+BENCHMARKS: list[Benchmark] = [
+    Benchmark('serialise_admin_message', _serialise_admin),
+    Benchmark('serialise_client_message', _serialise_client),
+    Benchmark('contact_form_validation', _contact_form),
+    *(Benchmark(f'build_messages_pdf[{size}]', _pdf(size)) for size in PDF_SIZES),
+    *(Benchmark(f'get_messages[{value}]', _get_messages(value)) for value, _ in MessageFilterForm.SORT_CHOICES),
+    Benchmark('token_generate', _token_generate),
+    Benchmark('token_verify', _token_verify),
+]
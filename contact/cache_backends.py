@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.utils.module_loading import import_string
+
+# Marks a key the shared tier does not have, so repeated misses stay local too.
+_ABSENT = object()
+_MISSING = object()
+
+# One local tier per cache alias and process: Django builds a backend instance
+# per thread, but they should all share the same memory.
+_tiers: dict[str, _LocalTier] = {}
+_tiers_lock = threading.Lock()
+
+
+class _LocalTier:
+    FILL_LOCK_STRIPES = 64
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._fill_locks = [threading.Lock() for _ in range(self.FILL_LOCK_STRIPES)]
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return _MISSING
+            self._data.move_to_end(key)
+            self.hits += 1
+            stored = entry[1]
+        return stored if stored is _ABSENT else pickle.loads(stored)
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        if ttl <= 0:
+            self.delete(key)
+            return
+        stored = value if value is _ABSENT else pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        expires_at = time.monotonic() + ttl
+        with self._lock:
+            self._data[key] = (expires_at, stored)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def fill_lock(self, key: str) -> threading.Lock:
+        return self._fill_locks[hash(key) % self.FILL_LOCK_STRIPES]
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._data),
+            }
+
+
+class TwoTierCache(BaseCache):
+    """Per-process LRU in front of any other Django cache backend.
+
+    ``OPTIONS``:
+
+    * ``BACKEND`` – dotted path of the shared backend (``LOCATION`` and the
+      key settings are passed through), ``BACKEND_OPTIONS`` its ``OPTIONS``;
+    * ``LOCAL_TIMEOUT`` – seconds a value (or a miss) may be served from
+      memory; this bounds how stale another process's write can look here;
+    * ``LOCAL_MAX_ENTRIES`` – size of the in-process tier.
+
+    Writes go to the shared backend first and then replace the local copy, so
+    a process always sees its own writes. ``get_or_set`` only lets one thread
+    per process compute a missing value.
+    """
+
+    def __init__(self, location: str, params: dict) -> None:
+        options = dict(params.get('OPTIONS') or {})
+        backend_path = options.pop('BACKEND', 'django.core.cache.backends.locmem.LocMemCache')
+        backend_options = options.pop('BACKEND_OPTIONS', {})
+        self.local_timeout = float(options.pop('LOCAL_TIMEOUT', 2))
+        local_max_entries = int(options.pop('LOCAL_MAX_ENTRIES', 1000))
+        super().__init__({**params, 'OPTIONS': options})
+
+        inner_params = {
+            key: value
+            for key, value in params.items()
+            if key in ('TIMEOUT', 'KEY_PREFIX', 'VERSION', 'KEY_FUNCTION')
+        }
+        inner_params['OPTIONS'] = backend_options
+        self.shared = import_string(backend_path)(location, inner_params)
+
+        tier_name = f'{backend_path}:{location}:{self.key_prefix}'
+        with _tiers_lock:
+            self._tier = _tiers.setdefault(tier_name, _LocalTier(max(1, local_max_entries)))
+
+    # -- reads ---------------------------------------------------------------
+
+    def get(self, key, default=None, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+        value = self._tier.get(local_key)
+        if value is _MISSING:
+            value = self.shared.get(key, _ABSENT, version=version)
+            self._tier.set(local_key, value, self.local_timeout)
+        return default if value is _ABSENT else value
+
+    def get_many(self, keys, version=None):
+        found: dict[str, Any] = {}
+        pending: dict[str, str] = {}
+        for key in keys:
+            local_key = self.make_and_validate_key(key, version=version)
+            value = self._tier.get(local_key)
+            if value is _MISSING:
+                pending[key] = local_key
+            elif value is not _ABSENT:
+                found[key] = value
+        if pending:
+            fetched = self.shared.get_many(list(pending), version=version)
+            for key, local_key in pending.items():
+                value = fetched.get(key, _ABSENT)
+                self._tier.set(local_key, value, self.local_timeout)
+                if value is not _ABSENT:
+                    found[key] = value
+        return found
+
+    def has_key(self, key, version=None):
+        return self.get(key, _MISSING, version=version) is not _MISSING
+
+    def get_or_set(self, key, default, timeout=DEFAULT_TIMEOUT, version=None):
+        value = self.get(key, _MISSING, version=version)
+        if value is not _MISSING:
+            return value
+        local_key = self.make_and_validate_key(key, version=version)
+        with self._tier.fill_lock(local_key):
+            # Another thread may have filled it while we were waiting.
+            value = self.get(key, _MISSING, version=version)
+            if value is not _MISSING:
+                return value
+            if callable(default):
+                default = default()
+            self.add(key, default, timeout=timeout, version=version)
+            return self.get(key, default, version=version)
+
+    # -- writes --------------------------------------------------------------
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.shared.set(key, value, timeout=timeout, version=version)
+        self._remember(key, value, timeout, version)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self.shared.add(key, value, timeout=timeout, version=version)
+        if added:
+            self._remember(key, value, timeout, version)
+        else:
+            self._forget(key, version)
+        return added
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = self.shared.set_many(data, timeout=timeout, version=version)
+        for key, value in data.items():
+            if key in failed:
+                self._forget(key, version)
+            else:
+                self._remember(key, value, timeout, version)
+        return failed
+
+    def incr(self, key, delta=1, version=None):
+        self._forget(key, version)
+        value = self.shared.incr(key, delta, version=version)
+        self._tier.set(self.make_and_validate_key(key, version=version), value, self.local_timeout)
+        return value
+
+    def decr(self, key, delta=1, version=None):
+        return self.incr(key, -delta, version=version)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        # The local copy may now outlive the shared one; let it be refetched.
+        self._forget(key, version)
+        return self.shared.touch(key, timeout=timeout, version=version)
+
+    def delete(self, key, version=None):
+        self._forget(key, version)
+        return self.shared.delete(key, version=version)
+
+    def delete_many(self, keys, version=None):
+        keys = list(keys)
+        for key in keys:
+            self._forget(key, version)
+        self.shared.delete_many(keys, version=version)
+
+    def clear(self):
+        self._tier.clear()
+        self.shared.clear()
+
+    def close(self, **kwargs):
+        self.shared.close(**kwargs)
+
+    def stats(self) -> dict[str, int]:
+        """Hit/miss/eviction counters of this process's local tier."""
+
+        return self._tier.stats()
+
+    # -- helpers -------------------------------------------------------------
+
+    def _remember(self, key, value, timeout, version) -> None:
+        expires_at = self.get_backend_timeout(timeout)
+        ttl = self.local_timeout
+        if expires_at is not None:
+            ttl = min(ttl, expires_at - time.time())
+        self._tier.set(self.make_and_validate_key(key, version=version), value, ttl)
+
+    def _forget(self, key, version) -> None:
+        self._tier.delete(self.make_and_validate_key(key, version=version))
@@ -0,0 +1,179 @@
+"""Per-language label tables, built once at import and shared read-only.
+
+Views, forms and the PDF export used to rebuild these dicts on every call;
+everything here is immutable (tuples and ``MappingProxyType``) so a caller
+cannot accidentally change the table seen by the next request.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping
+
+from .models import AdminActivityLog, ContactMessage
+
+DEFAULT_BADGE = 'badge--info'
+
+COMPANY_CHOICES = (
+    ("firma1", "Firma 1"),
+    ("firma2", "Firma 2"),
+    ("firma3", "Firma 3"),
+    ("inna", "Inna"),
+)
+COMPANY_ALL = "all"
+
+_STATUS_BADGES = {
+    ContactMessage.STATUS_NEW: 'badge--success',
+    ContactMessage.STATUS_IN_PROGRESS: 'badge--warning',
+    ContactMessage.STATUS_READY: 'badge--info',
+}
+
+_LABELS = {
+    'pl': {
+        'status': {
+            ContactMessage.STATUS_NEW: 'Nowe',
+            ContactMessage.STATUS_IN_PROGRESS: 'W trakcie',
+            ContactMessage.STATUS_READY: 'Gotowe',
+        },
+        'company': dict(COMPANY_CHOICES),
+        'company_all': 'Wszystkie departamenty',
+        'sort': {
+            'newest': 'Najnowsze',
+            'oldest': 'Najstarsze',
+            'status': 'Status',
+            'company': 'Firma',
+        },
+        'action': {
+            'mark_new': 'Oznacz jako nowe',
+            'mark_in_progress': 'Oznacz jako w trakcie',
+            'mark_ready': 'Oznacz jako gotowe',
+            'delete': 'Usuń',
+        },
+        'field': {
+            'created_at': 'Data zgłoszenia',
+            'customer': 'Klient',
+            'phone': 'Telefon',
+            'email': 'E-mail',
+            'company': 'Firma',
+            'company_name': 'Nazwa firmy',
+            'message': 'Wiadomość',
+            'status': 'Status',
+        },
+        'activity': {
+            AdminActivityLog.ACTION_STATUS_CHANGE: 'Zmiana statusu',
+            AdminActivityLog.ACTION_DELETE: 'Przeniesienie do kosza',
+            AdminActivityLog.ACTION_RESTORE: 'Przywrócenie',
+            AdminActivityLog.ACTION_PURGE: 'Trwałe usunięcie',
+            AdminActivityLog.ACTION_EMAIL: 'E-mail',
+            AdminActivityLog.ACTION_ROLLBACK: 'Cofnięcie zmiany klienta',
+        },
+        'activity_all': 'Wszystkie akcje',
+    },
+    'en': {
+        'status': {
+            ContactMessage.STATUS_NEW: 'New',
+            ContactMessage.STATUS_IN_PROGRESS: 'In progress',
+            ContactMessage.STATUS_READY: 'Ready',
+        },
+        'company': {
+            'firma1': 'Company 1',
+            'firma2': 'Company 2',
+            'firma3': 'Company 3',
+            'inna': 'Other',
+        },
+        'company_all': 'All departments',
+        'sort': {
+            'newest': 'Newest first',
+            'oldest': 'Oldest first',
+            'status': 'Status',
+            'company': 'Company',
+        },
+        'action': {
+            'mark_new': 'Mark as new',
+            'mark_in_progress': 'Mark as in progress',
+            'mark_ready': 'Mark as ready',
+            'delete': 'Delete',
+        },
+        'field': {
+            'created_at': 'Submitted at',
+            'customer': 'Customer',
+            'phone': 'Phone',
+            'email': 'Email',
+            'company': 'Company',
+            'company_name': 'Company name',
+            'message': 'Message',
+            'status': 'Status',
+        },
+        'activity': {
+            AdminActivityLog.ACTION_STATUS_CHANGE: 'Status change',
+            AdminActivityLog.ACTION_DELETE: 'Moved to trash',
+            AdminActivityLog.ACTION_RESTORE: 'Restored',
+            AdminActivityLog.ACTION_PURGE: 'Permanently deleted',
+            AdminActivityLog.ACTION_EMAIL: 'Email',
+            AdminActivityLog.ACTION_ROLLBACK: 'Client change rolled back',
+        },
+        'activity_all': 'All actions',
+    },
+}
+
+
+@dataclass(frozen=True)
+class Catalogue:
+    language: str
+    status_labels: Mapping[str, str]
+    status_options: tuple[Mapping[str, str], ...]
+    status_lookup: Mapping[str, Mapping[str, str]]
+    status_meta_json: str
+    company_labels: Mapping[str, str]
+    company_options: tuple[Mapping[str, str], ...]
+    company_filter_choices: tuple[tuple[str, str], ...]
+    sort_choices: tuple[tuple[str, str], ...]
+    action_choices: tuple[tuple[str, str], ...]
+    field_labels: Mapping[str, str]
+    field_choices: tuple[tuple[str, str], ...]
+    activity_labels: Mapping[str, str]
+    activity_filter_choices: tuple[tuple[str, str], ...]
+
+    def status_info(self, status: str) -> Mapping[str, str]:
+        return self.status_lookup.get(status) or {'value': status, 'label': status, 'badge': DEFAULT_BADGE}
+
+
+def _build(language: str) -> Catalogue:
+    labels = _LABELS[language]
+    status_options = tuple(
+        MappingProxyType({'value': value, 'label': labels['status'][value], 'badge': _STATUS_BADGES[value]})
+        for value, _ in ContactMessage.STATUS_CHOICES
+    )
+    status_meta = {item['value']: {'label': item['label'], 'badge': item['badge']} for item in status_options}
+    company_labels = MappingProxyType(dict(labels['company']))
+    return Catalogue(
+        language=language,
+        status_labels=MappingProxyType(dict(labels['status'])),
+        status_options=status_options,
+        status_lookup=MappingProxyType({item['value']: item for item in status_options}),
+        status_meta_json=json.dumps(status_meta),
+        company_labels=company_labels,
+        company_options=tuple(
+            MappingProxyType({'value': value, 'label': company_labels.get(value, label)})
+            for value, label in COMPANY_CHOICES
+        ),
+        company_filter_choices=((COMPANY_ALL, labels['company_all']),)
+        + tuple((value, company_labels.get(value, label)) for value, label in COMPANY_CHOICES),
+        sort_choices=tuple(labels['sort'].items()),
+        action_choices=tuple(labels['action'].items()),
+        field_labels=MappingProxyType(dict(labels['field'])),
+        field_choices=tuple(labels['field'].items()),
+        activity_labels=MappingProxyType(dict(labels['activity'])),
+        activity_filter_choices=(('', labels['activity_all']),) + tuple(labels['activity'].items()),
+    )
+
+
+_CATALOGUES = MappingProxyType({language: _build(language) for language in _LABELS})
+
+
+def for_language(language: str | None) -> Catalogue:
+    """Polish for ``'pl'``, English for anything else (as the templates do)."""
+
+    return _CATALOGUES['pl' if language == 'pl' else 'en']
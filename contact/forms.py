@@ -7,6 +7,7 @@ from pathlib import Path
 from django import forms
 from django.conf import settings
 
+from . import catalogue
 from .models import ContactMessage
 
 
@@ -107,12 +108,7 @@ def _validate_attachments(files: list, language: str | None = None) -> list:
 
 
 class ContactForm(forms.ModelForm):
-    COMPANY_CHOICES = [
-        ("firma1", "Firma 1"),
-        ("firma2", "Firma 2"),
-        ("firma3", "Firma 3"),
-        ("inna",   "Inna"),
-    ]
+    COMPANY_CHOICES = catalogue.COMPANY_CHOICES
 
     bot_check = forms.BooleanField(
         required=False,
@@ -286,7 +282,7 @@ class MessageFilterForm(forms.Form):
     SORT_STATUS = "status"
     SORT_COMPANY = "company"
 
-    COMPANY_ALL = "all"
+    COMPANY_ALL = catalogue.COMPANY_ALL
 
     SORT_CHOICES = (
         (SORT_NEWEST, "Newest first"),
@@ -300,42 +296,9 @@ class MessageFilterForm(forms.Form):
 
     def __init__(self, *args, language: str | None = None, **kwargs):
         super().__init__(*args, **kwargs)
-        company_choices = [(self.COMPANY_ALL, "All departments")] + list(ContactForm.COMPANY_CHOICES)
-        if language == "pl":
-            sort_labels = {
-                self.SORT_NEWEST: "Najnowsze",
-                self.SORT_OLDEST: "Najstarsze",
-                self.SORT_STATUS: "Status",
-                self.SORT_COMPANY: "Firma",
-            }
-            company_labels = {
-                self.COMPANY_ALL: "Wszystkie departamenty",
-                "firma1": "Firma 1",
-                "firma2": "Firma 2",
-                "firma3": "Firma 3",
-                "inna": "Inna",
-            }
-        else:
-            sort_labels = {
-                self.SORT_NEWEST: "Newest first",
-                self.SORT_OLDEST: "Oldest first",
-                self.SORT_STATUS: "Status",
-                self.SORT_COMPANY: "Company",
-            }
-            company_labels = {
-                self.COMPANY_ALL: "All departments",
-                "firma1": "Company 1",
-                "firma2": "Company 2",
-                "firma3": "Company 3",
-                "inna": "Other",
-            }
-
-        self.fields["sort_by"].choices = [
-            (value, sort_labels.get(value, label)) for value, label in self.SORT_CHOICES
-        ]
-        self.fields["company"].choices = [
-            (value, company_labels.get(value, label)) for value, label in company_choices
-        ]
+        labels = catalogue.for_language(language)
+        self.fields["sort_by"].choices = labels.sort_choices
+        self.fields["company"].choices = labels.company_filter_choices
         self.fields["sort_by"].widget.attrs["class"] = "form-input"
         self.fields["company"].widget.attrs["class"] = "form-input"
         self.fields["sort_by"].initial = self.SORT_NEWEST
@@ -377,7 +340,16 @@ class DownloadMessagesForm(forms.Form):
         (FIELD_STATUS, "Status"),
     )
 
+    EXPORT_PDF = "pdf"
+    EXPORT_ATTACHMENTS = "attachments"
+
+    EXPORT_CHOICES = (
+        (EXPORT_PDF, "PDF"),
+        (EXPORT_ATTACHMENTS, "Attachments"),
+    )
+
     form_name = forms.CharField(widget=forms.HiddenInput(), initial="download")
+    export = forms.ChoiceField(choices=EXPORT_CHOICES, required=False, widget=forms.HiddenInput())
     messages = forms.MultipleChoiceField(
         choices=(),
         widget=forms.MultipleHiddenInput(),
@@ -386,7 +358,7 @@ class DownloadMessagesForm(forms.Form):
     fields = forms.MultipleChoiceField(
         choices=FIELD_CHOICES,
         widget=forms.CheckboxSelectMultiple(),   # стандартный виджет
-        required=True,
+        required=False,
     )
 
     def __init__(
@@ -400,35 +372,13 @@ class DownloadMessagesForm(forms.Form):
         self.fields["messages"].choices = message_choices or []
 
         if language == "pl":
-            field_labels = {
-                self.FIELD_CREATED_AT: "Data zgłoszenia",
-                self.FIELD_CUSTOMER: "Klient",
-                self.FIELD_PHONE: "Telefon",
-                self.FIELD_EMAIL: "E-mail",
-                self.FIELD_COMPANY: "Firma",
-                self.FIELD_COMPANY_NAME: "Nazwa firmy",
-                self.FIELD_MESSAGE: "Wiadomość",
-                self.FIELD_STATUS: "Status",
-            }
             self._messages_error = "Wybierz co najmniej jedno zgłoszenie."
             self._fields_error = "Wybierz co najmniej jedno pole."
         else:
-            field_labels = {
-                self.FIELD_CREATED_AT: "Submitted at",
-                self.FIELD_CUSTOMER: "Customer",
-                self.FIELD_PHONE: "Phone",
-                self.FIELD_EMAIL: "Email",
-                self.FIELD_COMPANY: "Company",
-                self.FIELD_COMPANY_NAME: "Company name",
-                self.FIELD_MESSAGE: "Message",
-                self.FIELD_STATUS: "Status",
-            }
             self._messages_error = "Select at least one request."
             self._fields_error = "Select at least one field."
 
-        self.fields["fields"].choices = [
-            (value, field_labels.get(value, label)) for value, label in self.FIELD_CHOICES
-        ]
+        self.fields["fields"].choices = catalogue.for_language(language).field_choices
 
         # data-* атрибуты для JS (не обяз.)
         self.fields["fields"].widget.attrs.update({"data-download-field": "true"})
@@ -443,9 +393,13 @@ class DownloadMessagesForm(forms.Form):
             raise forms.ValidationError(self._messages_error)
         return data
 
+    def clean_export(self) -> str:
+        return self.cleaned_data.get("export") or self.EXPORT_PDF
+
     def clean_fields(self) -> list[str]:
         data = self.cleaned_data.get("fields") or []
-        if not data:
+        # Поля нужны только для PDF; архив вложений их не использует.
+        if not data and self.cleaned_data.get("export") != self.EXPORT_ATTACHMENTS:
             raise forms.ValidationError(self._fields_error)
         return data
 
@@ -573,3 +527,40 @@ class RequestAccessForm(forms.Form):
             )
             raise forms.ValidationError(error)
         return value
+
+
+class ActivityLogFilterForm(forms.Form):
+    action = forms.ChoiceField(choices=(), required=False)
+    message = forms.IntegerField(min_value=1, required=False)
+    date_from = forms.DateField(required=False, widget=forms.DateInput(attrs={"type": "date"}))
+    date_to = forms.DateField(required=False, widget=forms.DateInput(attrs={"type": "date"}))
+
+    def __init__(self, *args, language: str | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["action"].choices = catalogue.for_language(language).activity_filter_choices
+        for field in self.fields.values():
+            field.widget.attrs["class"] = "form-input"
+
+        if language == "pl":
+            self._range_error = "Data początkowa nie może być późniejsza niż końcowa."
+        else:
+            self._range_error = "The start date cannot be after the end date."
+
+    def clean(self):
+        cleaned_data = super().clean()
+        date_from = cleaned_data.get("date_from")
+        date_to = cleaned_data.get("date_to")
+        if date_from and date_to and date_from > date_to:
+            raise forms.ValidationError(self._range_error)
+        return cleaned_data
+
+
+class ArchiveSearchForm(forms.Form):
+    q = forms.CharField(required=False, max_length=200)
+    company = forms.ChoiceField(choices=(), required=False)
+
+    def __init__(self, *args, language: str | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["company"].choices = catalogue.for_language(language).company_filter_choices
+        for field in self.fields.values():
+            field.widget.attrs["class"] = "form-input"
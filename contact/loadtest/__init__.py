@@ -0,0 +1,6 @@
+"""HTTP load generator for the public form, the client portal and the admin panel.
+
+Everything here is standard library: virtual users are threads with their own
+cookie-keeping connection, e-mail goes to an in-process SMTP sink. The
+``load_test`` management command wires the pieces together.
+"""
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import http.client
+import json
+import time
+import uuid
+from dataclasses import dataclass
+from http.cookies import SimpleCookie
+from urllib.parse import urlencode, urlsplit
+
+from .stats import Recorder
+
+
+@dataclass(frozen=True)
+class Response:
+    status: int
+    headers: dict[str, str]
+    body: bytes
+
+    def json(self):
+        return json.loads(self.body.decode('utf-8'))
+
+
+class Session:
+    """One virtual user: a keep-alive connection plus its cookies.
+
+    Cookies are kept by hand because the site marks its session cookie
+    ``Secure`` even in development, which ``http.cookiejar`` would refuse to
+    send over plain HTTP. Redirects are not followed; every call is timed
+    and recorded under ``label``.
+    """
+
+    def __init__(self, base_url: str, recorder: Recorder, *, timeout: float = 60) -> None:
+        parts = urlsplit(base_url)
+        self.host = parts.hostname or '127.0.0.1'
+        self.port = parts.port or 80
+        self.prefix = parts.path.rstrip('/')
+        self.recorder = recorder
+        self.timeout = timeout
+        self.cookies: dict[str, str] = {}
+        self._connection: http.client.HTTPConnection | None = None
+
+    @property
+    def csrf_token(self) -> str:
+        return self.cookies.get('csrftoken', '')
+
+    def get(self, label: str, path: str, *, expect: tuple[int, ...] = (200,), **kwargs) -> Response | None:
+        return self.request(label, 'GET', path, expect=expect, **kwargs)
+
+    def post(self, label: str, path: str, *, expect: tuple[int, ...] = (200,), **kwargs) -> Response | None:
+        return self.request(label, 'POST', path, expect=expect, **kwargs)
+
+    def request(
+        self,
+        label: str,
+        method: str,
+        path: str,
+        *,
+        data: dict | None = None,
+        files: dict[str, tuple[str, str, bytes]] | None = None,
+        json_body: dict | None = None,
+        headers: dict[str, str] | None = None,
+        expect: tuple[int, ...] = (200,),
+    ) -> Response | None:
+        """Send one request; returns ``None`` when it failed or had an unexpected status."""
+
+        body, request_headers = _encode_body(data, files, json_body)
+        request_headers.update(headers or {})
+        if method != 'GET':
+            request_headers.setdefault('X-CSRFToken', self.csrf_token)
+        if self.cookies:
+            request_headers['Cookie'] = '; '.join(f'{name}={value}' for name, value in self.cookies.items())
+
+        started = time.perf_counter()
+        try:
+            response = self._send(method, self.prefix + path, body, request_headers)
+        except (OSError, http.client.HTTPException) as exc:
+            self.recorder.record(label, time.perf_counter() - started, error=type(exc).__name__)
+            self.close()
+            return None
+        elapsed = time.perf_counter() - started
+
+        for header in response.headers.get_all('Set-Cookie') or []:
+            for name, morsel in SimpleCookie(header).items():
+                if morsel.value:
+                    self.cookies[name] = morsel.value
+                else:
+                    self.cookies.pop(name, None)
+        result = Response(response.status, dict(response.headers.items()), response.body)
+        if response.status not in expect:
+            self.recorder.record(label, elapsed, error=f'HTTP {response.status}')
+            return None
+        self.recorder.record(label, elapsed)
+        return result
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _send(self, method: str, path: str, body: bytes | None, headers: dict[str, str]):
+        reused = self._connection is not None
+        if self._connection is None:
+            self._connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        try:
+            self._connection.request(method, path, body=body, headers=headers)
+            response = self._connection.getresponse()
+        except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+            if not reused:
+                raise
+            # The server dropped an idle keep-alive connection; that is not a
+            # failed request, so retry once on a fresh one.
+            self.close()
+            return self._send(method, path, body, headers)
+        response.body = response.read()
+        if response.getheader('Connection', '').lower() == 'close':
+            self.close()
+        return response
+
+
+def _encode_body(
+    data: dict | None,
+    files: dict[str, tuple[str, str, bytes]] | None,
+    json_body: dict | None,
+) -> tuple[bytes | None, dict[str, str]]:
+    if json_body is not None:
+        return json.dumps(json_body).encode('utf-8'), {'Content-Type': 'application/json'}
+    if files:
+        return _multipart(data or {}, files)
+    if data is not None:
+        return urlencode(data, doseq=True).encode('utf-8'), {'Content-Type': 'application/x-www-form-urlencoded'}
+    return None, {}
+
+
+def _multipart(data: dict, files: dict[str, tuple[str, str, bytes]]) -> tuple[bytes, dict[str, str]]:
+    boundary = uuid.uuid4().hex
+    chunks: list[bytes] = []
+    for name, value in data.items():
+        for item in value if isinstance(value, (list, tuple)) else [value]:
+            chunks.append(
+                f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{item}\r\n'.encode('utf-8')
+            )
+    for name, (filename, content_type, content) in files.items():
+        chunks.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+            f'Content-Type: {content_type}\r\n\r\n'.encode('utf-8')
+            + content
+            + b'\r\n'
+        )
+    chunks.append(f'--{boundary}--\r\n'.encode('ascii'))
+    return b''.join(chunks), {'Content-Type': f'multipart/form-data; boundary={boundary}'}
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import importlib.util
+import itertools
+import os
+import secrets
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from contextlib import contextmanager
+from typing import Iterator, Sequence
+
+from django.conf import settings
+
+from ..forms import ContactForm
+from ..models import ContactMessage
+from ..services import messages as message_service
+from .client import Session
+from .scenarios import LOADTEST_EMAIL_DOMAIN, SCENARIOS, Context, Fixture
+from .stats import Recorder
+
+
+def run(
+    base_url: str,
+    ctx: Context,
+    *,
+    scenarios: Sequence[str],
+    users: int,
+    duration: float,
+) -> tuple[Recorder, float]:
+    """Drive ``users`` threads through ``scenarios`` in turn until ``duration`` runs out.
+
+    Returns the recorder and the measured wall-clock time.
+    """
+
+    recorder = Recorder()
+    deadline = time.monotonic() + duration
+
+    def virtual_user(offset: int) -> None:
+        # A visitor, a client and an admin are different people: one cookie
+        # jar per scenario, or the portal and the panel would share a session.
+        sessions = {name: Session(base_url, recorder) for name in set(scenarios)}
+        # Stagger the rotation so every scenario is busy from the first second.
+        names = itertools.islice(itertools.cycle(scenarios), offset % len(scenarios), None)
+        try:
+            for name in names:
+                if time.monotonic() >= deadline:
+                    return
+                SCENARIOS[name](sessions[name], ctx)
+        finally:
+            for session in sessions.values():
+                session.close()
+
+    threads = [
+        threading.Thread(target=virtual_user, args=(index,), name=f'vu-{index}', daemon=True)
+        for index in range(max(1, users))
+    ]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return recorder, time.monotonic() - started
+
+
+def companies() -> list[str]:
+    return [value for value, _ in ContactForm.COMPANY_CHOICES]
+
+
+def create_fixtures(count: int) -> list[Fixture]:
+    """Requests the portal and admin scenarios work on; their raw tokens are known."""
+
+    fixtures = []
+    values = companies()
+    for number in range(count):
+        message, token = message_service.add_message(
+            full_name=f'Load Fixture {number}',
+            phone='+48123456789',
+            email=f'fixture{number}@{LOADTEST_EMAIL_DOMAIN}',
+            company=values[number % len(values)],
+            company_name='Load Test Sp. z o.o.',
+            message='Fixture created by the load test harness.',
+        )
+        fixtures.append(Fixture(message.id, token))
+    return fixtures
+
+
+def remove_loadtest_data() -> int:
+    """Purge fixtures and every request submitted during the run, files included."""
+
+    queryset = ContactMessage.objects.filter(email__endswith=f'@{LOADTEST_EMAIL_DOMAIN}')
+    ids = list(queryset.values_list('id', flat=True))
+    queryset.update(is_deleted=True)
+    return message_service.purge_messages(ids)
+
+
+def server_environment(smtp_port: int, admin_password: str) -> dict[str, str]:
+    env = dict(os.environ)
+    env.update(
+        SMTP_SERVER='127.0.0.1',
+        SMTP_PORT=str(smtp_port),
+        SMTP_USER=f'loadtest@{LOADTEST_EMAIL_DOMAIN}',
+        SMTP_PASS='loadtest',
+        SMTP_USE_TLS='false',
+        ADMIN_PASSWORD=admin_password,
+        SECURE_SSL_REDIRECT='false',
+        # A fresh throttle namespace, so no state is carried over between runs.
+        CONTACT_FORM_RATE_LIMIT_PREFIX=f'loadtest:{secrets.token_hex(4)}',
+        # The harness stands in for the reverse proxy: the X-Forwarded-For it
+        # sends gives every simulated visitor its own address.
+        TRUSTED_PROXY_COUNT='1',
+    )
+    return env
+
+
+@contextmanager
+def local_server(env: dict[str, str], *, workers: int = 2, timeout: float = 30) -> Iterator[tuple[str, str]]:
+    """Start the project on a free port; yields ``(base_url, description)``.
+
+    gunicorn is used when installed, as in production; otherwise the
+    development server.
+    """
+
+    port = _free_port()
+    if importlib.util.find_spec('gunicorn'):
+        command = [
+            sys.executable, '-m', 'gunicorn', 'zetom_project.wsgi:application',
+            '--bind', f'127.0.0.1:{port}', '--workers', str(max(1, workers)), '--threads', '4',
+            '--log-level', 'warning',
+        ]
+        description = f'gunicorn ({max(1, workers)} workers x 4 threads)'
+    else:
+        command = [sys.executable, 'manage.py', 'runserver', '--noreload', f'127.0.0.1:{port}']
+        description = 'runserver'
+
+    process = subprocess.Popen(command, cwd=settings.BASE_DIR, env=env)
+    base_url = f'http://127.0.0.1:{port}'
+    try:
+        _wait_until_live(base_url, process, timeout)
+        yield base_url, description
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def _wait_until_live(base_url: str, process: subprocess.Popen, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'Server exited with code {process.returncode} before it was ready.')
+        try:
+            with urllib.request.urlopen(f'{base_url}/health/live/', timeout=1):
+                return
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.2)
+    raise RuntimeError(f'Server did not answer {base_url}/health/live/ within {timeout:.0f}s.')
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
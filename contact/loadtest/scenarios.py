@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import itertools
+import random
+import threading
+from dataclasses import dataclass, field
+from typing import Callable
+
+from .client import Session
+
+LOADTEST_EMAIL_DOMAIN = 'loadtest.invalid'
+
+# Smallest well-formed PDF: enough for the upload checks and the preview job.
+SAMPLE_PDF = (
+    b'%PDF-1.1\n1 0 obj<</Type/Catalog/Pages 2 0 R>>endobj\n'
+    b'2 0 obj<</Type/Pages/Kids[3 0 R]/Count 1>>endobj\n'
+    b'3 0 obj<</Type/Page/Parent 2 0 R/MediaBox[0 0 200 200]>>endobj\n'
+    b'trailer<</Root 1 0 R>>\n%%EOF\n'
+)
+
+
+@dataclass
+class Fixture:
+    message_id: int
+    token: str
+
+
+@dataclass
+class Context:
+    """What the scenarios share: pre-created requests and the admin password."""
+
+    fixtures: list[Fixture]
+    admin_password: str
+    companies: list[str]
+    # Start somewhere random so that identities from an earlier run, still
+    # remembered by the form throttle, are not reused.
+    _counter: itertools.count = field(default_factory=lambda: itertools.count(random.randrange(1 << 24)))
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def next_number(self) -> int:
+        with self._lock:
+            return next(self._counter)
+
+    def fixture(self) -> Fixture:
+        return random.choice(self.fixtures)
+
+
+def public_submit(session: Session, ctx: Context) -> None:
+    """Open the landing page and send the contact form with one PDF attached."""
+
+    if not session.get('GET /', '/?lang=en'):
+        return
+    number = ctx.next_number()
+    # Every submission comes from its own address and e-mail, as real visitors
+    # do; otherwise the form throttle would turn the run into a 429 test. The
+    # address only counts on the local server, which trusts one proxy hop.
+    session.post(
+        'POST / (submit)',
+        '/?lang=en',
+        data={
+            'full_name': f'Load Test {number}',
+            'phone': '+48123456789',
+            'email': f'visitor{number}@{LOADTEST_EMAIL_DOMAIN}',
+            'company': random.choice(ctx.companies),
+            'company_name': 'Load Test Sp. z o.o.',
+            'message': 'Generated by the load test harness.',
+            'bot_check': 'on',
+            'csrfmiddlewaretoken': session.csrf_token,
+        },
+        files={'attachments': (f'load-{number}.pdf', 'application/pdf', SAMPLE_PDF)},
+        headers={'X-Forwarded-For': f'10.{number >> 16 & 255}.{number >> 8 & 255}.{number & 255}'},
+        expect=(302,),
+    )
+
+
+def portal(session: Session, ctx: Context) -> None:
+    """Restore access with a token, list own requests, open one and edit it."""
+
+    fixture = ctx.fixture()
+    if not session.csrf_token and not session.get('GET /', '/?lang=en'):
+        return
+    restored = session.post(
+        'POST /requests/restore/',
+        '/requests/restore/?lang=en',
+        json_body={'request_id': fixture.message_id, 'access_token': fixture.token},
+    )
+    if not restored:
+        return
+    session.get('GET /requests/', '/requests/?lang=en')
+    detail = session.get('GET /requests/<id>/detail/', f'/requests/{fixture.message_id}/detail/?lang=en')
+    if not detail:
+        return
+    current = detail.json()
+    session.post(
+        'POST /requests/<id>/update/',
+        f'/requests/{fixture.message_id}/update/?lang=en',
+        data={
+            'full_name': current.get('full_name', 'Load Test'),
+            'phone': current.get('phone', '+48123456789'),
+            'email': current.get('email', f'portal@{LOADTEST_EMAIL_DOMAIN}'),
+            'company': current.get('company', ctx.companies[0]),
+            'company_name': current.get('company_name', ''),
+            'message': f'Edited by the load test harness ({ctx.next_number()}).',
+        },
+    )
+
+
+def admin(session: Session, ctx: Context) -> None:
+    """Log in, page through and filter the panel, open a request and export."""
+
+    if 'sessionid' not in session.cookies:
+        session.get('GET /login/', '/login/')
+        if not session.post('POST /login/', '/login/', data={'password': ctx.admin_password}, expect=(302,)):
+            return
+    session.get('GET /panel/', '/panel/?lang=en')
+    session.get(
+        'GET /panel/ (filter)',
+        f'/panel/?lang=en&company={random.choice(ctx.companies)}&sort_by=oldest&page=2',
+    )
+    fixture = ctx.fixture()
+    session.get('GET /panel/messages/<id>/detail/', f'/panel/messages/{fixture.message_id}/detail/?lang=en')
+    session.post(
+        'POST /panel/ (PDF export)',
+        '/panel/?lang=en',
+        data={
+            'form_name': 'download',
+            'export': 'pdf',
+            'messages': [str(item.message_id) for item in random.sample(ctx.fixtures, min(5, len(ctx.fixtures)))],
+            'fields': ['created_at', 'customer', 'email', 'company', 'message', 'status'],
+            'csrfmiddlewaretoken': session.csrf_token,
+        },
+    )
+    session.get('GET /panel/activity/export/', f'/panel/activity/export/?message={fixture.message_id}')
+
+
+SCENARIOS: dict[str, Callable[[Session, Context], None]] = {
+    'submit': public_submit,
+    'portal': portal,
+    'admin': admin,
+}
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+
+class SmtpSink:
+    """Accepts any mail on ``127.0.0.1`` and throws it away, counting messages.
+
+    Speaks just enough SMTP for ``smtplib``: EHLO/HELO, AUTH PLAIN/LOGIN,
+    MAIL, RCPT, DATA, RSET, NOOP and QUIT. No STARTTLS, so the server under
+    test must run with ``SMTP_USE_TLS=false``.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0) -> None:
+        self.host = host
+        self.port = port
+        self.messages = 0
+        self.bytes = 0
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._ready = threading.Event()
+
+    def start(self) -> SmtpSink:
+        self._thread = threading.Thread(target=self._serve, name='smtp-sink', daemon=True)
+        self._thread.start()
+        self._ready.wait(timeout=10)
+        return self
+
+    def stop(self) -> None:
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> SmtpSink:
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _serve(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        server = self._loop.run_until_complete(asyncio.start_server(self._handle, self.host, self.port))
+        self.port = server.sockets[0].getsockname()[1]
+        self._ready.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            server.close()
+            self._loop.run_until_complete(server.wait_closed())
+            self._loop.close()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        async def reply(line: str) -> None:
+            writer.write(line.encode('ascii') + b'\r\n')
+            await writer.drain()
+
+        await reply('220 loadtest ESMTP sink')
+        try:
+            while True:
+                raw = await reader.readline()
+                if not raw:
+                    break
+                command = raw.decode('utf-8', 'replace').strip()
+                verb = command.split(' ', 1)[0].upper()
+                if verb == 'EHLO':
+                    await reply('250-loadtest')
+                    await reply('250 AUTH PLAIN LOGIN')
+                elif verb == 'AUTH':
+                    parts = command.split()
+                    if len(parts) == 2 and parts[1].upper() == 'LOGIN':
+                        # Username and password prompts; any answer is accepted.
+                        for prompt in ('VXNlcm5hbWU6', 'UGFzc3dvcmQ6'):
+                            await reply(f'334 {prompt}')
+                            await reader.readline()
+                    elif len(parts) == 2:
+                        await reply('334 ')
+                        await reader.readline()
+                    await reply('235 Authentication successful')
+                elif verb == 'DATA':
+                    await reply('354 End data with <CR><LF>.<CR><LF>')
+                    size = 0
+                    while True:
+                        line = await reader.readline()
+                        if not line or line == b'.\r\n':
+                            break
+                        size += len(line)
+                    with self._lock:
+                        self.messages += 1
+                        self.bytes += size
+                    await reply('250 OK queued')
+                elif verb == 'QUIT':
+                    await reply('221 Bye')
+                    break
+                elif verb in ('HELO', 'MAIL', 'RCPT', 'RSET', 'NOOP'):
+                    await reply('250 OK')
+                else:
+                    await reply('502 Command not implemented')
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
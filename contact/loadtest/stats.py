@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import statistics
+import threading
+from collections import Counter, defaultdict
+
+
+class Recorder:
+    """Thread-safe latency samples and error counts, keyed by endpoint label."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._latencies: dict[str, list[float]] = defaultdict(list)
+        self._errors: dict[str, Counter] = defaultdict(Counter)
+
+    def record(self, label: str, seconds: float, *, error: str | None = None) -> None:
+        with self._lock:
+            self._latencies[label].append(seconds)
+            if error:
+                self._errors[label][error] += 1
+
+    def summary(self, wall_seconds: float) -> dict[str, dict]:
+        """Per-label count, errors, throughput and latency percentiles in milliseconds."""
+
+        with self._lock:
+            labels = sorted(self._latencies)
+            report = {}
+            for label in labels:
+                samples = sorted(self._latencies[label])
+                errors = self._errors.get(label, Counter())
+                report[label] = {
+                    'requests': len(samples),
+                    'errors': sum(errors.values()),
+                    'error_kinds': dict(errors),
+                    'throughput_rps': round(len(samples) / wall_seconds, 2) if wall_seconds > 0 else 0.0,
+                    'latency_ms': latency_summary(samples),
+                }
+            return report
+
+
+def latency_summary(samples: list[float]) -> dict[str, float]:
+    if not samples:
+        return {}
+    if len(samples) == 1:
+        cuts = samples * 99
+    else:
+        cuts = statistics.quantiles(samples, n=100, method='inclusive')
+    return {
+        'mean': round(statistics.fmean(samples) * 1000, 2),
+        'p50': round(cuts[49] * 1000, 2),
+        'p95': round(cuts[94] * 1000, 2),
+        'p99': round(cuts[98] * 1000, 2),
+        'max': round(max(samples) * 1000, 2),
+    }
@@ -0,0 +1,61 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from contact.services import anonymisation
+
+
+class Command(BaseCommand):
+    help = "Scrub personal data (name, phone, email, message, change-log values, attachments) from old requests."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than-days",
+            type=int,
+            default=None,
+            help="Anonymise requests created more than this many days ago (default: ANONYMISE_AFTER_DAYS)",
+        )
+        parser.add_argument("--batch-size", type=int, default=500, help="Requests scrubbed per transaction")
+        parser.add_argument(
+            "--table",
+            choices=sorted(anonymisation.TABLES),
+            action="append",
+            help="Limit to live requests or the archive (default: both)",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Only count requests that would be anonymised")
+
+    def handle(self, *args, **opt):
+        days = opt["older_than_days"]
+        if days is None:
+            days = settings.ANONYMISE_AFTER_DAYS
+        if days < 1:
+            raise CommandError("--older-than-days must be at least 1.")
+        cutoff = timezone.now() - timedelta(days=days)
+
+        for name in opt["table"] or sorted(anonymisation.TABLES, reverse=True):
+            table = anonymisation.TABLES[name]
+            if opt["dry_run"]:
+                count = anonymisation.pending(table, cutoff).count()
+                self.stdout.write(f"Dry run: {count} {name} request(s) created before {cutoff:%Y-%m-%d} would be anonymised.")
+                continue
+
+            total = 0
+            started = time.monotonic()
+            for ids in anonymisation.anonymise_requests(table, cutoff, batch_size=opt["batch_size"]):
+                total += len(ids)
+                if opt["verbosity"] >= 2:
+                    self.stdout.write(
+                        f"{name}: #{ids[0]}–#{ids[-1]} ({len(ids)}), {self._rate(total, started)}"
+                    )
+            self.stdout.write(self.style.SUCCESS(
+                f"Anonymised {total} {name} request(s) in {time.monotonic() - started:.1f}s "
+                f"({self._rate(total, started)})."
+            ))
+
+    @staticmethod
+    def _rate(total, started):
+        elapsed = time.monotonic() - started
+        return f"{total / elapsed:.0f} req/s" if elapsed > 0 else "n/a"
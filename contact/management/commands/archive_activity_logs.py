@@ -0,0 +1,59 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from contact.services import log_archive
+
+
+class Command(BaseCommand):
+    help = "Move old admin/client log rows into gzipped JSONL archives, keeping daily counts per action."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than-days",
+            type=int,
+            default=None,
+            help="Archive rows older than this many days (default: LOG_RETENTION_DAYS)",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000, help="Rows written and deleted per transaction")
+        parser.add_argument(
+            "--table",
+            choices=sorted(log_archive.TABLES),
+            action="append",
+            help="Only archive this log (may be repeated; default: all)",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Only count rows that would be archived")
+        parser.add_argument(
+            "--redact-existing",
+            action="store_true",
+            help="Also blank personal data in archive files written before it was redacted",
+        )
+
+    def handle(self, *args, **opt):
+        days = opt["older_than_days"]
+        if days is None:
+            days = settings.LOG_RETENTION_DAYS
+        if days < 1:
+            raise CommandError("--older-than-days must be at least 1.")
+        cutoff = timezone.now() - timedelta(days=days)
+        names = opt["table"] or sorted(log_archive.TABLES)
+
+        for name in names:
+            table = log_archive.TABLES[name]
+            if opt["dry_run"]:
+                count = log_archive.count_archivable(table, cutoff=cutoff)
+                self.stdout.write(f"{name}: {count} row(s) older than {cutoff:%Y-%m-%d} would be archived.")
+                continue
+            total = 0
+            files = 0
+            for path, count in log_archive.archive_table(table, cutoff=cutoff, batch_size=max(1, opt["batch_size"])):
+                total += count
+                files += 1
+                if opt["verbosity"] >= 2:
+                    self.stdout.write(f"{name}: {count} row(s) -> {path}")
+            self.stdout.write(self.style.SUCCESS(f"{name}: archived {total} row(s) into {files} file(s)."))
+            if opt["redact_existing"]:
+                rewritten = log_archive.redact_archives(table)
+                self.stdout.write(f"{name}: redacted {rewritten} older file(s).")
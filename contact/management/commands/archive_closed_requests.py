@@ -0,0 +1,41 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from contact.services import message_archive
+
+
+class Command(BaseCommand):
+    help = "Move ready requests older than N days, with attachment metadata and logs, into the archive tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than-days",
+            type=int,
+            default=None,
+            help="Archive ready requests created more than this many days ago (default: ARCHIVE_READY_AFTER_DAYS)",
+        )
+        parser.add_argument("--batch-size", type=int, default=200, help="Requests moved per transaction")
+        parser.add_argument("--dry-run", action="store_true", help="Only count requests that would be archived")
+
+    def handle(self, *args, **opt):
+        days = opt["older_than_days"]
+        if days is None:
+            days = settings.ARCHIVE_READY_AFTER_DAYS
+        if days < 1:
+            raise CommandError("--older-than-days must be at least 1.")
+        cutoff = timezone.now() - timedelta(days=days)
+
+        if opt["dry_run"]:
+            count = message_archive.archivable(cutoff).count()
+            self.stdout.write(f"Dry run: {count} ready request(s) created before {cutoff:%Y-%m-%d} would be archived.")
+            return
+
+        total = 0
+        for ids in message_archive.archive_requests(cutoff, batch_size=max(1, opt["batch_size"])):
+            total += len(ids)
+            if opt["verbosity"] >= 2:
+                self.stdout.write(f"archived #{ids[0]}–#{ids[-1]} ({len(ids)})")
+        self.stdout.write(self.style.SUCCESS(f"Archived {total} request(s)."))
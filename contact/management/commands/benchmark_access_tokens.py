@@ -0,0 +1,39 @@
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+
+from contact import tokens
+from contact.models import _generate_access_token
+
+
+class Command(BaseCommand):
+    help = "Measure hashing and verification cost of client access tokens (HMAC vs legacy make_password)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=2000, help="Operations timed for the HMAC scheme")
+        parser.add_argument("--legacy-iterations", type=int, default=10, help="Operations timed for make_password")
+
+    def handle(self, *args, **opt):
+        token = _generate_access_token()
+        hmac_hash = tokens.hash_token(token)
+        legacy_hash = make_password(token)
+
+        rows = [
+            ("hmac hash", max(1, opt["iterations"]), lambda: tokens.hash_token(token)),
+            ("hmac verify", max(1, opt["iterations"]), lambda: tokens.verify_token(token, hmac_hash)),
+            ("legacy hash", max(1, opt["legacy_iterations"]), lambda: make_password(token)),
+            ("legacy verify", max(1, opt["legacy_iterations"]), lambda: tokens.verify_token(token, legacy_hash)),
+        ]
+        results = {}
+        for label, iterations, func in rows:
+            func()  # warm-up
+            started = time.perf_counter()
+            for _ in range(iterations):
+                func()
+            per_op = (time.perf_counter() - started) / iterations
+            results[label] = per_op
+            self.stdout.write(f"{label:<14} {per_op * 1e6:12.1f} µs/op  ({iterations} runs)")
+
+        speedup = results["legacy verify"] / results["hmac verify"] if results["hmac verify"] else 0
+        self.stdout.write(self.style.SUCCESS(f"HMAC verification is {speedup:,.0f}x faster than the legacy hash."))
@@ -0,0 +1,53 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from contact.services import storage_gc
+
+
+class Command(BaseCommand):
+    help = "Remove files under MEDIA_ROOT/attachments/ that no ContactAttachment row references."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Only list orphaned files, delete nothing")
+        parser.add_argument(
+            "--min-age-hours",
+            type=float,
+            default=24,
+            help="Skip files modified more recently than this (protects in-flight uploads)",
+        )
+        parser.add_argument("--batch-size", type=int, default=500, help="Names checked against the DB per query")
+
+    def handle(self, *args, **opt):
+        dry_run = opt["dry_run"]
+        storage = storage_gc.attachment_storage()
+        found = 0
+        deleted = 0
+        reclaimed = 0
+
+        orphans = storage_gc.iter_orphaned_files(
+            batch_size=max(1, opt["batch_size"]),
+            min_age=timedelta(hours=max(0.0, opt["min_age_hours"])),
+        )
+        for name in orphans:
+            found += 1
+            try:
+                size = storage.size(name)
+            except OSError:
+                size = 0
+            if dry_run:
+                self.stdout.write(f"orphan: {name} ({size} B)")
+                reclaimed += size
+                continue
+            if storage_gc.delete_files([name]):
+                deleted += 1
+                reclaimed += size
+            if opt["verbosity"] >= 2:
+                self.stdout.write(f"deleted: {name}")
+
+        if dry_run:
+            self.stdout.write(f"Dry run: {found} orphaned file(s), {reclaimed} B would be reclaimed.")
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"Removed {deleted}/{found} orphaned file(s), reclaimed {reclaimed} B."
+            ))
@@ -0,0 +1,37 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from contact.services import client_log
+
+
+class Command(BaseCommand):
+    help = "Merge consecutive client edits of the same field into one ClientChangeLog row."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--window-seconds",
+            type=int,
+            default=None,
+            help="Largest gap between edits that are merged (default: CLIENT_LOG_COALESCE_SECONDS)",
+        )
+        parser.add_argument("--message", type=int, action="append", help="Only compact this request (may be repeated)")
+        parser.add_argument("--dry-run", action="store_true", help="Only report how many rows would be removed")
+
+    def handle(self, *args, **opt):
+        window = None
+        if opt["window_seconds"] is not None:
+            window = timedelta(seconds=max(0, opt["window_seconds"]))
+
+        messages = 0
+        removed = 0
+        for message_id, count in client_log.compact(message_ids=opt["message"], window=window, dry_run=opt["dry_run"]):
+            messages += 1
+            removed += count
+            if opt["verbosity"] >= 2:
+                self.stdout.write(f"#{message_id}: {count} row(s)")
+
+        if opt["dry_run"]:
+            self.stdout.write(f"Dry run: {removed} row(s) in {messages} request(s) would be merged away.")
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Merged away {removed} row(s) in {messages} request(s)."))
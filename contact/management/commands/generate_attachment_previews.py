@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from contact.models import ContactAttachment
+from contact.services.previews import generate_preview
+
+
+class Command(BaseCommand):
+    help = "Generate thumbnails for image attachments and first-page previews for PDFs."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=200, help="Max attachments per pass")
+        parser.add_argument("--retry-failed", action="store_true", help="Also retry previews that failed before")
+        parser.add_argument(
+            "--watch",
+            type=int,
+            default=0,
+            metavar="SECONDS",
+            help="Keep running and poll for new uploads every N seconds",
+        )
+
+    def handle(self, *args, **opt):
+        statuses = [ContactAttachment.PREVIEW_PENDING]
+        if opt["retry_failed"]:
+            statuses.append(ContactAttachment.PREVIEW_FAILED)
+
+        limit = max(1, opt["limit"])
+        while True:
+            processed = self._run_pass(statuses, limit)
+            if not opt["watch"]:
+                break
+            # Failed previews are retried once per invocation, not on every poll.
+            statuses = [ContactAttachment.PREVIEW_PENDING]
+            if processed < limit:
+                time.sleep(opt["watch"])
+
+    def _run_pass(self, statuses: list[str], limit: int) -> int:
+        attachments = list(
+            ContactAttachment.objects.filter(preview_status__in=statuses).order_by("id")[:limit]
+        )
+        counts: dict[str, int] = {}
+        for attachment in attachments:
+            status = generate_preview(attachment)
+            counts[status] = counts.get(status, 0) + 1
+        summary = ", ".join(f"{status}: {count}" for status, count in sorted(counts.items())) or "nothing to do"
+        self.stdout.write(f"Processed {len(attachments)} attachment(s) ({summary})")
+        return len(attachments)
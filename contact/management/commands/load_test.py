@@ -0,0 +1,110 @@
+import json
+import secrets
+from contextlib import nullcontext
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from contact.loadtest import runner
+from contact.loadtest.scenarios import SCENARIOS, Context
+from contact.loadtest.smtp_sink import SmtpSink
+from contact.models import ContactMessage
+from contact.utils import get_git_commit
+
+
+class Command(BaseCommand):
+    help = (
+        "Run scripted HTTP scenarios (public submit, client portal, admin panel) against a local server "
+        "with a stub SMTP sink and report latency percentiles and throughput per endpoint as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scenario",
+            choices=sorted(SCENARIOS),
+            action="append",
+            help="Scenario to include; repeat to mix or weight them (default: all)",
+        )
+        parser.add_argument("--users", type=int, default=8, help="Concurrent virtual users (threads)")
+        parser.add_argument("--duration", type=float, default=30, help="Seconds to keep the load on")
+        parser.add_argument("--fixtures", type=int, default=50, help="Requests created up front for portal/admin")
+        parser.add_argument(
+            "--url",
+            default="",
+            help="Target an already running server (same database); it must use the SMTP sink or no SMTP_USER",
+        )
+        parser.add_argument("--server-workers", type=int, default=2, help="gunicorn workers for the local server")
+        parser.add_argument("--smtp-port", type=int, default=0, help="Port of the SMTP sink (default: any free port)")
+        parser.add_argument(
+            "--admin-password",
+            default="",
+            help="Admin password for --url (a local server gets a random one)",
+        )
+        parser.add_argument("--output", default="", help="Write the JSON report to this file instead of stdout")
+        parser.add_argument("--keep-data", action="store_true", help="Leave fixtures and submitted requests in place")
+
+    def handle(self, *args, **opt):
+        scenarios = opt["scenario"] or sorted(SCENARIOS)
+        if opt["duration"] <= 0:
+            raise CommandError("--duration must be positive.")
+        if opt["url"]:
+            admin_password = opt["admin_password"] or settings.ADMIN_PASSWORD
+        else:
+            admin_password = secrets.token_urlsafe(16)
+
+        fixtures = runner.create_fixtures(max(1, opt["fixtures"]))
+        ctx = Context(fixtures=fixtures, admin_password=admin_password, companies=runner.companies())
+        try:
+            with SmtpSink(port=opt["smtp_port"]) as sink:
+                if opt["url"]:
+                    server = nullcontext((opt["url"].rstrip("/"), "external"))
+                else:
+                    env = runner.server_environment(sink.port, admin_password)
+                    server = runner.local_server(env, workers=opt["server_workers"])
+                with server as (base_url, description):
+                    started_at = timezone.now()
+                    recorder, wall = runner.run(
+                        base_url,
+                        ctx,
+                        scenarios=scenarios,
+                        users=opt["users"],
+                        duration=opt["duration"],
+                    )
+                emails = sink.messages
+        finally:
+            if not opt["keep_data"]:
+                runner.remove_loadtest_data()
+
+        endpoints = recorder.summary(wall)
+        total = sum(row["requests"] for row in endpoints.values())
+        report = {
+            "started_at": started_at.isoformat(),
+            "commit": get_git_commit(),
+            "server": description,
+            "base_url": base_url,
+            "scenarios": scenarios,
+            "users": opt["users"],
+            "duration_s": round(wall, 2),
+            "dataset_requests": ContactMessage.objects.count(),
+            "emails_sent": emails,
+            "requests": total,
+            "errors": sum(row["errors"] for row in endpoints.values()),
+            "throughput_rps": round(total / wall, 2) if wall > 0 else 0.0,
+            "endpoints": endpoints,
+        }
+        payload = json.dumps(report, indent=2, ensure_ascii=False)
+        if not opt["output"]:
+            self.stdout.write(payload)
+            return
+        with open(opt["output"], "w", encoding="utf-8") as handle:
+            handle.write(payload + "\n")
+        for label, row in endpoints.items():
+            latency = row["latency_ms"]
+            self.stdout.write(
+                f"{label:<36} {row['requests']:>7} req {row['errors']:>5} err {row['throughput_rps']:>8.1f} rps  "
+                f"p50 {latency.get('p50', 0):>8.1f}  p95 {latency.get('p95', 0):>8.1f}  p99 {latency.get('p99', 0):>8.1f} ms"
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"{total} requests in {wall:.1f}s ({report['throughput_rps']} rps), report written to {opt['output']}."
+        ))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from contact.services import login_lockout
+
+
+class Command(BaseCommand):
+    help = "Drop expired admin login lockouts and trim the table to ADMIN_LOGIN_LOCKOUT_MAX_ENTRIES (run periodically)."
+
+    def handle(self, *args, **opt):
+        removed = login_lockout.prune()
+        self.stdout.write(self.style.SUCCESS(f"Removed {removed} login lockout entr{'y' if removed == 1 else 'ies'}."))
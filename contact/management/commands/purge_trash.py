@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from contact.models import PendingPurge
+from contact.services import messages as message_service
+
+
+class Command(BaseCommand):
+    help = (
+        "Finish background purges that were interrupted or never ran (BACKGROUND_TASKS_MODE=off); "
+        "only the requests the admin selected are deleted. --all empties the whole trash."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None, help="Requests deleted per transaction (default: PURGE_BATCH_SIZE)")
+        parser.add_argument("--all", action="store_true", help="Delete every trashed request, not only pending purges")
+        parser.add_argument("--dry-run", action="store_true", help="Only count the requests that would be deleted")
+
+    def handle(self, *args, **opt):
+        pending = list(PendingPurge.objects.order_by("requested_at"))
+        if opt["dry_run"]:
+            if opt["all"]:
+                count = message_service.trashed_messages().count()
+            else:
+                count = sum(
+                    message_service.trashed_messages(item.message_ids, up_to_id=item.up_to_id).count()
+                    for item in pending
+                )
+            self.stdout.write(f"Dry run: {count} trashed request(s) would be deleted.")
+            return
+
+        deleted = sum(message_service.run_pending_purge(item.id, batch_size=opt["batch_size"]) for item in pending)
+        if opt["all"]:
+            deleted += message_service.purge_messages(batch_size=opt["batch_size"])
+        elif not pending:
+            self.stdout.write("No pending purges; use --all to empty the whole trash.")
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} trashed request(s)."))
@@ -0,0 +1,130 @@
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from contact import benchmarks
+from contact.services import seed_data
+from contact.utils import get_git_commit
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the microbenchmark suite on a throwaway seeded database, compare it with the baseline stored "
+        "for this machine and fail when a benchmark is slower than the regression threshold allows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--only",
+            action="append",
+            help="Run benchmarks whose name matches this glob (repeatable), e.g. 'get_messages*'",
+        )
+        parser.add_argument("--rounds", type=int, default=5, help="Timed rounds per benchmark; the median counts")
+        parser.add_argument("--dataset", type=int, default=2000, help="Requests seeded into the throwaway database")
+        parser.add_argument(
+            "--current-db",
+            action="store_true",
+            help="Benchmark the configured database as it is (no throwaway copy, no seeding)",
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=None,
+            help="Allowed slowdown as a fraction, 0.25 = 25%% (default: BENCHMARK_REGRESSION_THRESHOLD)",
+        )
+        parser.add_argument("--machine", default="", help="Baseline tag (default: host, architecture and Python)")
+        parser.add_argument("--baseline-file", default="", help="Baselines JSON (default: BENCHMARK_BASELINE_FILE)")
+        parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline")
+        parser.add_argument("--list", action="store_true", help="List benchmark names and exit")
+        parser.add_argument("--json", default="", help="Also write results and comparisons to this file")
+
+    def handle(self, *args, **opt):
+        selected = benchmarks.select(opt["only"])
+        if opt["list"]:
+            for benchmark in selected:
+                self.stdout.write(benchmark.name)
+            return
+        if not selected:
+            raise CommandError("No benchmark matches --only.")
+
+        threshold = opt["threshold"]
+        if threshold is None:
+            threshold = settings.BENCHMARK_REGRESSION_THRESHOLD
+        machine = opt["machine"] or benchmarks.machine_tag()
+        path = Path(opt["baseline_file"]) if opt["baseline_file"] else benchmarks.baseline_file()
+
+        if opt["current_db"]:
+            results = self._run(selected, opt["rounds"], opt["verbosity"])
+        else:
+            results = self._run_isolated(selected, opt["rounds"], opt["dataset"], opt["verbosity"])
+
+        if opt["save_baseline"]:
+            benchmarks.save_baseline(path, machine, results, commit=get_git_commit())
+            for result in results:
+                self.stdout.write(f"{result.name:<32} {_format(result.median):>12}")
+            self.stdout.write(self.style.SUCCESS(f"Baseline for {machine} saved to {path}."))
+            return
+
+        baseline = benchmarks.load_baselines(path).get(machine, {})
+        comparisons = benchmarks.compare(results, baseline, threshold=threshold)
+        for comparison in comparisons:
+            if comparison.change is None:
+                verdict = "no baseline"
+            else:
+                verdict = f"{comparison.change:+.1%}" + ("  REGRESSED" if comparison.regressed else "")
+            baseline_text = _format(comparison.baseline) if comparison.baseline else "—"
+            self.stdout.write(
+                f"{comparison.name:<32} {_format(comparison.current):>12} {baseline_text:>12}  {verdict}"
+            )
+
+        if opt["json"]:
+            report = {
+                "machine": machine,
+                "commit": get_git_commit(),
+                "threshold": threshold,
+                "results": {result.name: result.as_dict() for result in results},
+                "baseline": baseline,
+                "regressions": [comparison.name for comparison in comparisons if comparison.regressed],
+            }
+            Path(opt["json"]).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+        regressed = [comparison.name for comparison in comparisons if comparison.regressed]
+        if regressed:
+            raise CommandError(
+                f"{len(regressed)} benchmark(s) regressed by more than {threshold:.0%}: {', '.join(regressed)}"
+            )
+        if not baseline:
+            self.stdout.write(f"No baseline for {machine} in {path}; record one with --save-baseline.")
+        self.stdout.write(self.style.SUCCESS(f"{len(results)} benchmark(s) within {threshold:.0%} of the baseline."))
+
+    def _run(self, selected, rounds, verbosity):
+        results = []
+        for benchmark in selected:
+            result = benchmarks.measure(benchmark, rounds=rounds)
+            if verbosity >= 2:
+                self.stdout.write(f"{result.name}: {_format(result.median)} ({result.loops} loops)")
+            results.append(result)
+        return results
+
+    def _run_isolated(self, selected, rounds, dataset, verbosity):
+        # The same machinery the test runner uses: a fresh database with every
+        # migration applied, filled with the same seeded rows on every run.
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            for _ in seed_data.seed(max(1, dataset), random_seed=0, workers=1):
+                pass
+            return self._run(selected, rounds, verbosity)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def _format(seconds):
+    if seconds >= 1:
+        return f"{seconds:.2f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.1f} µs"
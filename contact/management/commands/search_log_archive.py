@@ -0,0 +1,36 @@
+import json
+
+from django.core.management.base import BaseCommand
+from django.utils.dateparse import parse_date
+
+from contact.services import log_archive
+
+
+class Command(BaseCommand):
+    help = "Search archived admin/client log rows and print matches as JSON lines."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--table", choices=sorted(log_archive.TABLES), default="admin")
+        parser.add_argument("--message-id", type=int, help="Only rows for this request")
+        parser.add_argument("--action", help="Admin action or changed client field")
+        parser.add_argument("--text", help="Case-insensitive substring anywhere in the row")
+        parser.add_argument("--since", type=parse_date, help="First day to include (YYYY-MM-DD)")
+        parser.add_argument("--until", type=parse_date, help="Last day to include (YYYY-MM-DD)")
+        parser.add_argument("--limit", type=int, default=0, help="Stop after this many matches (0 = no limit)")
+
+    def handle(self, *args, **opt):
+        rows = log_archive.iter_archived(
+            log_archive.TABLES[opt["table"]],
+            message_id=opt["message_id"],
+            group=opt["action"],
+            text=opt["text"],
+            since=opt["since"],
+            until=opt["until"],
+        )
+        found = 0
+        for row in rows:
+            self.stdout.write(json.dumps(row, ensure_ascii=False))
+            found += 1
+            if opt["limit"] and found >= opt["limit"]:
+                break
+        self.stderr.write(f"{found} archived row(s) matched.")
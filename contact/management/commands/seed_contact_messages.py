@@ -1,112 +1,90 @@
 # contact/management/commands/seed_contact_messages.py
-from django.core.management.base import BaseCommand
-from django.db import transaction
-from django.utils import timezone
-from datetime import timedelta
+import os
+import time
 
-from contact.models import ContactMessage
-
-try:
-    from faker import Faker
-except Exception:
-    Faker = None
-
-
-def has_field(model, name):
-    try:
-        model._meta.get_field(name)
-        return True
-    except Exception:
-        return False
+from django.core.management.base import BaseCommand, CommandError
 
-
-def get_status_choices(model):
-    """
-    Возвращает список допустимых значений статуса, если поле и choices существуют.
-    Иначе — разумный дефолт или None.
-    """
-    if not has_field(model, "status"):
-        return None
-    try:
-        field = model._meta.get_field("status")
-        if getattr(field, "choices", None):
-            return [c[0] for c in field.choices]
-    except Exception:
-        pass
-    # если choices нет — подставим базовый набор
-    return ["new", "in_progress", "done"]
+from contact.models import ContactMessage
+from contact.services import seed_data
 
 
 class Command(BaseCommand):
-    help = "Seed ContactMessage with fake data."
+    help = (
+        "Seed ContactMessage with fake data: departments from ContactForm.COMPANY_CHOICES, "
+        "statuses, trash, token expiries, attachments, client edits and admin activity."
+    )
 
     def add_arguments(self, parser):
-        parser.add_argument("--count", type=int, default=1000, help="Сколько записей создать")
-        parser.add_argument("--chunk", type=int, default=1000, help="Размер пачки в bulk_create")
+        parser.add_argument("--count", type=int, default=1000, help="Сколько заявок создать")
+        parser.add_argument("--chunk", type=int, default=5000, help="Заявок в одной пачке (одна транзакция)")
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Сколько процессов генерируют пачки (по умолчанию число CPU; для SQLite всегда 1)",
+        )
         parser.add_argument("--locale", type=str, default="pl_PL", help="Локаль Faker (pl_PL, en_US...)")
-        parser.add_argument("--status", type=str, default="", help="Принудительный статус (если поле есть)")
-        parser.add_argument("--clean", action="store_true", help="Сначала очистить таблицу")
+        parser.add_argument("--status", type=str, default="", help="Принудительный статус для всех заявок")
+        parser.add_argument("--days", type=int, default=365, help="За сколько последних дней раскидать даты")
+        parser.add_argument("--deleted-ratio", type=float, default=0.05, help="Доля заявок в корзине")
+        parser.add_argument("--attachment-ratio", type=float, default=0.15, help="Доля заявок с вложениями")
+        parser.add_argument("--edit-ratio", type=float, default=0.2, help="Доля заявок с правками клиента")
+        parser.add_argument("--seed", type=int, default=None, help="Зерно генератора для воспроизводимых данных")
+        parser.add_argument("--no-copy", action="store_true", help="На PostgreSQL писать INSERT вместо COPY")
+        parser.add_argument("--clean", action="store_true", help="Сначала очистить заявки, вложения и журналы")
 
     def handle(self, *args, **opt):
-        if Faker is None:
+        if seed_data.Faker is None:
             self.stderr.write("Faker не установлен. Установи: pip install Faker")
             return
 
-        count = opt["count"]
-        chunk_size = opt["chunk"]
-        fake = Faker(opt["locale"])
-        forced_status = (opt["status"] or "").strip() or None
-        statuses = get_status_choices(ContactMessage)
+        status = (opt["status"] or "").strip() or None
+        if status and status not in dict(ContactMessage.STATUS_CHOICES):
+            raise CommandError(f"Неизвестный статус: {status}")
+        workers = opt["workers"] or os.cpu_count() or 1
+        if workers > 1 and not seed_data.can_fork():
+            if opt["workers"]:
+                self.stdout.write("Параллельная запись недоступна для этой базы — работаю в одном процессе.")
+            workers = 1
+        copy = seed_data.uses_copy() and not opt["no_copy"]
 
         if opt["clean"]:
-            self.stdout.write("Очищаю таблицу ContactMessage…")
-            ContactMessage.objects.all().delete()
-
-        objs = []
-        now = timezone.now()
-
-        # какие поля реально есть
-        has_status = has_field(ContactMessage, "status")
-        has_is_deleted = has_field(ContactMessage, "is_deleted")
-        has_created_at = has_field(ContactMessage, "created_at")
-        has_full_name = has_field(ContactMessage, "full_name")
-        has_phone = has_field(ContactMessage, "phone")
-        has_company = has_field(ContactMessage, "company")
-        has_company_name = has_field(ContactMessage, "company_name")
-
-        for _ in range(count):
-            data = {
-                "email": fake.email(),
-                "message": fake.paragraph(nb_sentences=5),
-            }
-            if has_full_name:
-                data["full_name"] = fake.name()
-            if has_phone:
-                # msisdn иногда длинный — ограничим
-                data["phone"] = (fake.msisdn() or "")[:15]
-            if has_company:
-                data["company"] = fake.company()
-            if has_company_name:
-                data["company_name"] = fake.company()
-            if has_status:
-                if forced_status:
-                    data["status"] = forced_status
-                elif statuses:
-                    data["status"] = fake.random_element(statuses)
-            if has_is_deleted:
-                data["is_deleted"] = False
-            if has_created_at:
-                data["created_at"] = now - timedelta(days=fake.random_int(min=0, max=90))
-
-            objs.append(ContactMessage(**data))
-
-            if len(objs) >= chunk_size:
-                with transaction.atomic():
-                    ContactMessage.objects.bulk_create(objs, batch_size=chunk_size)
-                objs = []  # вместо clear()
-
-        if objs:
-            with transaction.atomic():
-                ContactMessage.objects.bulk_create(objs, batch_size=chunk_size)
-
-        self.stdout.write(self.style.SUCCESS("Готово: добавлено {} записей".format(count)))
+            self.stdout.write("Очищаю заявки, вложения и журналы…")
+            seed_data.clear()
+
+        profile = seed_data.SeedProfile(
+            days=opt["days"],
+            deleted_ratio=opt["deleted_ratio"],
+            attachment_ratio=opt["attachment_ratio"],
+            client_edit_ratio=opt["edit_ratio"],
+            locale=opt["locale"],
+            status=status,
+        )
+        started = time.monotonic()
+        messages = attachments = client_logs = activity_logs = 0
+        chunks = seed_data.seed(
+            opt["count"],
+            profile=profile,
+            chunk_size=opt["chunk"],
+            workers=workers,
+            random_seed=opt["seed"],
+            copy=copy,
+        )
+        for result in chunks:
+            messages += result.messages
+            attachments += result.attachments
+            client_logs += result.client_logs
+            activity_logs += result.activity_logs
+            if opt["verbosity"] >= 2:
+                self.stdout.write(f"{messages}/{opt['count']} заявок, {self._rate(messages, started)}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Готово: добавлено {messages} заявок, {attachments} вложений, {client_logs} правок клиента, "
+            f"{activity_logs} записей журнала за {time.monotonic() - started:.1f} с "
+            f"({self._rate(messages, started)}, {'COPY' if copy else 'INSERT'}, процессов: {workers})"
+        ))
+
+    @staticmethod
+    def _rate(total, started):
+        elapsed = time.monotonic() - started
+        return f"{total / elapsed:.0f} заявок/с" if elapsed > 0 else "n/a"
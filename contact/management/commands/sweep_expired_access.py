@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from contact.services import access_grants
+
+
+class Command(BaseCommand):
+    help = "Disable client access for requests whose access token has expired (run periodically, e.g. every few minutes)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Requests updated per query")
+
+    def handle(self, *args, **opt):
+        disabled = sum(access_grants.disable_expired(batch_size=max(1, opt["batch_size"])))
+        self.stdout.write(self.style.SUCCESS(f"Disabled access for {disabled} request(s) with expired tokens."))
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import logging
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Callable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, connection
+from django.http import HttpRequest, HttpResponse, JsonResponse
+
+from .models import ContactAttachment
+from .services import activity_log
+
+logger = logging.getLogger(__name__)
+
+LIVENESS_PATH = '/health/live/'
+READINESS_PATH = '/health/ready/'
+CACHE_PROBE_KEY = 'contact:health:probe'
+
+_executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix='health')
+
+
+class HealthCheckMiddleware:
+    """Answer platform probes before sessions, CSRF, host checks or any view run.
+
+    Must be first in ``MIDDLEWARE``: probes arrive over plain HTTP with an
+    internal Host header, and should not create sessions or render pages.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if request.method in ('GET', 'HEAD'):
+            if request.path == LIVENESS_PATH:
+                return _no_store(JsonResponse({'status': 'ok'}))
+            if request.path == READINESS_PATH:
+                return _no_store(readiness_response())
+        return self.get_response(request)
+
+
+class ActivityLogMiddleware:
+    """Write the admin activity logged while handling a request in one batch."""
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        with activity_log.buffered():
+            return self.get_response(request)
+
+
+def readiness_response() -> JsonResponse:
+    timeout = getattr(settings, 'HEALTH_CHECK_TIMEOUT', 2.0)
+    futures = {name: _executor.submit(check) for name, check in READINESS_CHECKS.items()}
+    results: dict[str, str] = {}
+    for name, future in futures.items():
+        try:
+            future.result(timeout=timeout)
+        except FutureTimeout:
+            results[name] = 'timeout'
+        except Exception:
+            logger.warning('Readiness check %s failed', name, exc_info=True)
+            results[name] = 'error'
+        else:
+            results[name] = 'ok'
+    healthy = all(result == 'ok' for result in results.values())
+    return JsonResponse(
+        {'status': 'ok' if healthy else 'unavailable', 'checks': results},
+        status=200 if healthy else 503,
+    )
+
+
+def _check_database() -> None:
+    close_old_connections()
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT 1')
+        cursor.fetchone()
+
+
+def _check_cache() -> None:
+    cache.set(CACHE_PROBE_KEY, 1, 10)
+    if cache.get(CACHE_PROBE_KEY) != 1:
+        raise RuntimeError('cache did not return the probe value')
+
+
+def _check_storage() -> None:
+    ContactAttachment._meta.get_field('file').storage.exists('attachments')
+
+
+READINESS_CHECKS: dict[str, Callable[[], None]] = {
+    'database': _check_database,
+    'cache': _check_cache,
+    'storage': _check_storage,
+}
+
+
+def _no_store(response: HttpResponse) -> HttpResponse:
+    response['Cache-Control'] = 'no-store'
+    return response
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contact', '0007_rename_name_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contactattachment',
+            name='preview_status',
+            field=models.CharField(choices=[('pending', 'pending'), ('ready', 'ready'), ('failed', 'failed'), ('unsupported', 'unsupported')], db_index=True, default='pending', max_length=16),
+        ),
+        migrations.AddField(
+            model_name='contactattachment',
+            name='thumbnail',
+            field=models.FileField(blank=True, max_length=255, upload_to='attachments/%Y/%m/%d'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contact', '0009_loginattempt'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityLogRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('source', models.CharField(choices=[('admin', 'admin'), ('client', 'client')], max_length=16)),
+                ('action', models.CharField(max_length=32)),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-day', 'source', 'action'],
+                'constraints': [models.UniqueConstraint(fields=('day', 'source', 'action'), name='activity_rollup_unique_day')],
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contact', '0010_activitylogrollup'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='adminactivitylog',
+            index=models.Index(fields=['action', 'created_at'], name='activity_action_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='adminactivitylog',
+            index=models.Index(fields=['message', 'created_at'], name='activity_message_created_idx'),
+        ),
+    ]
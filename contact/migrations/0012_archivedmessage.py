@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:27
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contact', '0011_adminactivitylog_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedMessage',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('full_name', models.CharField(max_length=200)),
+                ('phone', models.CharField(max_length=20)),
+                ('email', models.EmailField(db_index=True, max_length=254)),
+                ('company', models.CharField(db_index=True, max_length=50)),
+                ('company_name', models.CharField(blank=True, max_length=150)),
+                ('message', models.TextField()),
+                ('final_changes', models.TextField(blank=True)),
+                ('final_response', models.TextField(blank=True)),
+                ('status', models.CharField(choices=[('new', 'new'), ('in_progress', 'in_progress'), ('ready', 'ready')], max_length=32)),
+                ('created_at', models.DateTimeField(db_index=True)),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('admin_logs', models.JSONField(blank=True, default=list)),
+                ('client_logs', models.JSONField(blank=True, default=list)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedAttachment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file', models.CharField(db_index=True, max_length=100)),
+                ('thumbnail', models.CharField(blank=True, db_index=True, max_length=255)),
+                ('original_name', models.CharField(max_length=255)),
+                ('content_type', models.CharField(blank=True, max_length=255)),
+                ('size', models.PositiveIntegerField()),
+                ('uploaded_at', models.DateTimeField()),
+                ('message', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attachments', to='contact.archivedmessage')),
+            ],
+            options={
+                'ordering': ['-uploaded_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contact', '0012_archivedmessage'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(condition=models.Q(('access_enabled', True)), fields=['access_token_expires_at'], name='active_token_expiry_idx'),
+        ),
+    ]
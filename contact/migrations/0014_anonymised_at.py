@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contact', '0013_active_token_expiry_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedmessage',
+            name='anonymised_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='contactmessage',
+            name='anonymised_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:57
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contact', '0014_anonymised_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingPurge',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('message_ids', models.JSONField(blank=True, null=True)),
+                ('up_to_id', models.BigIntegerField()),
+                ('requested_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['requested_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contact', '0015_pendingpurge'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='contactattachment',
+            name='file',
+            field=models.FileField(db_index=True, upload_to='attachments/%Y/%m/%d'),
+        ),
+        migrations.AlterField(
+            model_name='contactattachment',
+            name='thumbnail',
+            field=models.FileField(blank=True, db_index=True, max_length=255, upload_to='attachments/%Y/%m/%d'),
+        ),
+    ]
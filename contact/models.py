@@ -5,10 +5,11 @@ import secrets
 from datetime import timedelta
 
 from django.conf import settings
-from django.contrib.auth.hashers import check_password, make_password
 from django.db import models
 from django.utils import timezone
 
+from . import tokens
+
 
 def _generate_access_token() -> str:
     """Return a URL-safe access token between 32 and 48 characters."""
@@ -49,9 +50,18 @@ class ContactMessage(models.Model):
     access_token_hash = models.CharField(max_length=128, blank=True)
     access_enabled = models.BooleanField(default=True)
     access_token_expires_at = models.DateTimeField(null=True, blank=True)
+    anonymised_at = models.DateTimeField(null=True, blank=True, db_index=True)
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Only rows the expiry sweeper still has to visit.
+            models.Index(
+                fields=["access_token_expires_at"],
+                condition=models.Q(access_enabled=True),
+                name="active_token_expiry_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.full_name} ({self.email})"
@@ -60,7 +70,7 @@ class ContactMessage(models.Model):
         """Create and store a hashed access token, returning the raw token."""
 
         token = _generate_access_token()
-        self.access_token_hash = make_password(token)
+        self.access_token_hash = tokens.hash_token(token)
         ttl_hours = max(1, getattr(settings, 'CONTACT_ACCESS_TOKEN_TTL_HOURS', 72))
         self.access_token_expires_at = timezone.now() + timedelta(hours=ttl_hours)
         return token
@@ -70,7 +80,12 @@ class ContactMessage(models.Model):
             return False
         if self.is_access_token_expired:
             return False
-        return check_password(token, self.access_token_hash)
+        valid, needs_rehash = tokens.verify_token(token, self.access_token_hash)
+        if valid and needs_rehash:
+            self.access_token_hash = tokens.hash_token(token)
+            if self.pk:
+                type(self).objects.filter(pk=self.pk).update(access_token_hash=self.access_token_hash)
+        return valid
 
     @property
     def is_access_token_expired(self) -> bool:
@@ -81,16 +96,36 @@ class ContactMessage(models.Model):
 
 
 class ContactAttachment(models.Model):
+    PREVIEW_PENDING = "pending"
+    PREVIEW_READY = "ready"
+    PREVIEW_FAILED = "failed"
+    PREVIEW_UNSUPPORTED = "unsupported"
+
+    PREVIEW_CHOICES = [
+        (PREVIEW_PENDING, "pending"),
+        (PREVIEW_READY, "ready"),
+        (PREVIEW_FAILED, "failed"),
+        (PREVIEW_UNSUPPORTED, "unsupported"),
+    ]
+
     message = models.ForeignKey(
         ContactMessage,
         related_name="attachments",
         on_delete=models.CASCADE,
     )
-    file = models.FileField(upload_to="attachments/%Y/%m/%d")
+    # Indexed for the orphaned-file sweep, which looks files up by name.
+    file = models.FileField(upload_to="attachments/%Y/%m/%d", db_index=True)
     original_name = models.CharField(max_length=255)
     content_type = models.CharField(max_length=255, blank=True)
     size = models.PositiveIntegerField()
     uploaded_at = models.DateTimeField(auto_now_add=True)
+    thumbnail = models.FileField(upload_to="attachments/%Y/%m/%d", blank=True, max_length=255, db_index=True)
+    preview_status = models.CharField(
+        max_length=16,
+        choices=PREVIEW_CHOICES,
+        default=PREVIEW_PENDING,
+        db_index=True,
+    )
 
     class Meta:
         ordering = ["-uploaded_at"]
@@ -129,6 +164,10 @@ class AdminActivityLog(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["action", "created_at"], name="activity_action_created_idx"),
+            models.Index(fields=["message", "created_at"], name="activity_message_created_idx"),
+        ]
 
 
 class ClientChangeLog(models.Model):
@@ -161,3 +200,98 @@ class ClientChangeLog(models.Model):
 
     class Meta:
         ordering = ["-changed_at", "-id"]
+
+
+class LoginAttempt(models.Model):
+    """Failed admin logins per client, shared by every worker process."""
+
+    key = models.CharField(max_length=64, unique=True)
+    failures = models.PositiveIntegerField(default=0)
+    blocked_until = models.DateTimeField(null=True, blank=True)
+    last_attempt_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self) -> str:  # pragma: no cover - representation helper
+        return f"LoginAttempt({self.key[:8]}, {self.failures})"
+
+
+class PendingPurge(models.Model):
+    """A purge handed to the background; kept until it finishes so it can be resumed."""
+
+    # ``None`` stands for "empty the trash": everything trashed up to ``up_to_id``.
+    message_ids = models.JSONField(null=True, blank=True)
+    up_to_id = models.BigIntegerField()
+    requested_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["requested_at"]
+
+    def __str__(self) -> str:  # pragma: no cover - representation helper
+        return f"PendingPurge(#{self.id}, up to #{self.up_to_id})"
+
+
+class ActivityLogRollup(models.Model):
+    """Daily counts kept for log rows that were moved to the archive."""
+
+    SOURCE_ADMIN = "admin"
+    SOURCE_CLIENT = "client"
+
+    SOURCE_CHOICES = [
+        (SOURCE_ADMIN, "admin"),
+        (SOURCE_CLIENT, "client"),
+    ]
+
+    day = models.DateField()
+    source = models.CharField(max_length=16, choices=SOURCE_CHOICES)
+    action = models.CharField(max_length=32)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["-day", "source", "action"]
+        constraints = [
+            models.UniqueConstraint(fields=["day", "source", "action"], name="activity_rollup_unique_day"),
+        ]
+
+
+class ArchivedMessage(models.Model):
+    """A closed request moved out of ``ContactMessage``; keeps its original id."""
+
+    id = models.BigIntegerField(primary_key=True)
+    full_name = models.CharField(max_length=200)
+    phone = models.CharField(max_length=20)
+    email = models.EmailField(db_index=True)
+    company = models.CharField(max_length=50, db_index=True)
+    company_name = models.CharField(max_length=150, blank=True)
+    message = models.TextField()
+    final_changes = models.TextField(blank=True)
+    final_response = models.TextField(blank=True)
+    status = models.CharField(max_length=32, choices=ContactMessage.STATUS_CHOICES)
+    created_at = models.DateTimeField(db_index=True)
+    archived_at = models.DateTimeField(default=timezone.now)
+    anonymised_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    admin_logs = models.JSONField(default=list, blank=True)
+    client_logs = models.JSONField(default=list, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self) -> str:  # pragma: no cover - representation helper
+        return f"ArchivedMessage(#{self.id}, {self.email})"
+
+
+class ArchivedAttachment(models.Model):
+    """Metadata of an archived request's file; the blob stays where it was stored."""
+
+    message = models.ForeignKey(
+        ArchivedMessage,
+        related_name="attachments",
+        on_delete=models.CASCADE,
+    )
+    file = models.CharField(max_length=100, db_index=True)
+    thumbnail = models.CharField(max_length=255, blank=True, db_index=True)
+    original_name = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=255, blank=True)
+    size = models.PositiveIntegerField()
+    uploaded_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ["-uploaded_at"]
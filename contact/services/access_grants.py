@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import time
+from datetime import datetime
+from typing import Iterable, Iterator
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from ..models import ContactMessage
+
+REVOKED_KEY_PREFIX = 'contact:access_revoked'
+
+
+def revoke(message_ids: Iterable[int]) -> None:
+    """Invalidate every session grant issued for ``message_ids`` until now.
+
+    Sessions are not enumerable, so the revocation is a cache marker that
+    grants are compared against; it only has to outlive the sessions.
+    """
+
+    now = time.time()
+    markers = {_revoked_key(message_id): now for message_id in message_ids}
+    if markers:
+        cache.set_many(markers, timeout=getattr(settings, 'SESSION_COOKIE_AGE', 1209600))
+
+
+def revoked_at(message_id: int) -> float | None:
+    value = cache.get(_revoked_key(message_id))
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def disable_expired(*, now: datetime | None = None, batch_size: int = 1000) -> Iterator[int]:
+    """Turn off client access for requests whose token has expired, one batch at a time.
+
+    Portal queries only filter on ``access_enabled``; this keeps that flag in
+    step with ``access_token_expires_at``. Yields the size of each batch.
+    """
+
+    now = now or timezone.now()
+    expired = ContactMessage.objects.filter(access_enabled=True, access_token_expires_at__lte=now)
+    while True:
+        ids = list(expired.order_by('access_token_expires_at').values_list('id', flat=True)[:batch_size])
+        if not ids:
+            return
+        ContactMessage.objects.filter(id__in=ids).update(access_enabled=False)
+        yield len(ids)
+
+
+def _revoked_key(message_id: int) -> str:
+    return f'{REVOKED_KEY_PREFIX}:{int(message_id)}'
@@ -1,33 +1,88 @@
 from __future__ import annotations
 
-from typing import Iterable
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterable, Iterator
 
-from django.db import transaction
+from django.conf import settings
+from django.db import DatabaseError, transaction
 
 from ..models import AdminActivityLog
+from . import background
+
+logger = logging.getLogger(__name__)
+
+# Entries collected during the current request (or ``buffered()`` block).
+_buffer: ContextVar[list[AdminActivityLog] | None] = ContextVar('activity_log_buffer', default=None)
 
 
-@transaction.atomic
 def log_bulk_action(action: str, message_ids: Iterable[int], *, description: str | None = None) -> None:
-    """Persist a log entry for each affected message."""
+    """Record a log entry for each affected message."""
 
     ids = [int(mid) for mid in message_ids if mid is not None]
     if not ids:
         return
-    entries = [
+    _record([
         AdminActivityLog(
             message_id=mid,
             action=action,
             description=description or "",
         )
         for mid in ids
-    ]
-    AdminActivityLog.objects.bulk_create(entries, ignore_conflicts=True)
+    ])
 
 
 def log_action(action: str, *, message_id: int | None = None, description: str | None = None) -> None:
-    AdminActivityLog.objects.create(
-        message_id=message_id,
-        action=action,
-        description=description or "",
-    )
+    _record([
+        AdminActivityLog(
+            message_id=message_id,
+            action=action,
+            description=description or "",
+        )
+    ])
+
+
+@contextmanager
+def buffered() -> Iterator[None]:
+    """Collect entries logged inside the block and write them in one batch at the end.
+
+    Entries only join the batch once the transaction they were logged in
+    commits, so work that is rolled back leaves no audit trail behind.
+    """
+
+    if _buffer.get() is not None:
+        yield
+        return
+    entries: list[AdminActivityLog] = []
+    token = _buffer.set(entries)
+    try:
+        yield
+    finally:
+        _buffer.reset(token)
+        # Queued behind the callbacks that fill ``entries``, which run first.
+        transaction.on_commit(lambda: _flush(entries))
+
+
+def _record(entries: list[AdminActivityLog]) -> None:
+    pending = _buffer.get()
+    if pending is None:
+        transaction.on_commit(lambda: _flush(entries))
+    else:
+        transaction.on_commit(lambda: pending.extend(entries))
+
+
+def _flush(entries: list[AdminActivityLog]) -> None:
+    if not entries:
+        return
+    if getattr(settings, 'ACTIVITY_LOG_ASYNC', False) and getattr(settings, 'BACKGROUND_TASKS_MODE', 'thread') != 'off':
+        background.submit(_write, entries)
+    else:
+        _write(entries)
+
+
+def _write(entries: list[AdminActivityLog]) -> None:
+    try:
+        AdminActivityLog.objects.bulk_create(entries, ignore_conflicts=True)
+    except DatabaseError:
+        logger.exception('Could not write %d activity log entries', len(entries))
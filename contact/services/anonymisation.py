@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterator
+
+from django.db import models, transaction
+from django.utils import timezone
+
+from ..models import ArchivedAttachment, ArchivedMessage, ClientChangeLog, ContactAttachment, ContactMessage
+from . import access_grants, background, storage_gc
+
+ANONYMISED_NAME = '[anonymised]'
+ANONYMISED_EMAIL = 'anonymised@example.invalid'
+
+# What every anonymised request looks like; applied with one UPDATE per batch.
+SCRUBBED_VALUES = {
+    'full_name': ANONYMISED_NAME,
+    'phone': '',
+    'email': ANONYMISED_EMAIL,
+    'message': '',
+}
+
+
+@dataclass(frozen=True)
+class RequestTable:
+    name: str
+    model: type[models.Model]
+    attachment_model: type[models.Model]
+
+
+TABLES = {
+    'live': RequestTable(name='live', model=ContactMessage, attachment_model=ContactAttachment),
+    'archive': RequestTable(name='archive', model=ArchivedMessage, attachment_model=ArchivedAttachment),
+}
+
+
+def pending(table: RequestTable, cutoff: datetime) -> models.QuerySet:
+    """Requests created before ``cutoff`` that still hold personal data."""
+
+    return table.model.objects.filter(created_at__lt=cutoff, anonymised_at__isnull=True)
+
+
+def anonymise_requests(
+    table: RequestTable,
+    cutoff: datetime,
+    *,
+    batch_size: int = 500,
+) -> Iterator[list[int]]:
+    """Scrub personal data from requests created before ``cutoff``, batch by batch.
+
+    Every batch is a handful of set-based statements in one transaction: the
+    request fields, the client change-log values, the attachment rows (files
+    go after commit) and ``anonymised_at``, which doubles as the checkpoint —
+    an interrupted run resumes with the requests it has not stamped yet.
+    Yields the ids scrubbed by each batch.
+    """
+
+    batch_size = max(1, batch_size)
+    while True:
+        ids = _anonymise_batch(table, cutoff, batch_size)
+        if not ids:
+            return
+        yield ids
+
+
+def _anonymise_batch(table: RequestTable, cutoff: datetime, batch_size: int) -> list[int]:
+    with transaction.atomic():
+        ids = list(
+            pending(table, cutoff).select_for_update().order_by('id').values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            return []
+        attachments = table.attachment_model.objects.filter(message_id__in=ids)
+        file_names = storage_gc.referenced_file_names(attachments)
+        attachments.delete()
+
+        values = dict(SCRUBBED_VALUES, anonymised_at=timezone.now())
+        if table.model is ContactMessage:
+            values.update(access_token_hash='', access_enabled=False)
+            # Rows already moved to LOG_ARCHIVE_DIR were written without their values.
+            ClientChangeLog.objects.filter(message_id__in=ids).update(previous_value='', new_value='')
+            transaction.on_commit(lambda: access_grants.revoke(ids))
+        else:
+            # The archive keeps the client history as JSON; editing it row by
+            # row would defeat the point, so the whole history goes.
+            values.update(client_logs=[])
+        table.model.objects.filter(id__in=ids).update(**values)
+
+        if file_names:
+            background.submit_on_commit(storage_gc.delete_files, file_names)
+    return ids
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import hashlib
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.files.storage import Storage, default_storage
+from django.http import FileResponse, HttpRequest, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import content_disposition_header, quote_etag
+
+from ..models import ContactAttachment
+
+_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class _FileRange:
+    """Read-only view over ``length`` bytes of an already positioned file.
+
+    ``fileno`` is exposed so that WSGI servers implementing ``wsgi.file_wrapper``
+    (gunicorn) can hand the transfer to ``os.sendfile``: they start at the
+    current offset of the descriptor and stop after ``Content-Length`` bytes.
+    """
+
+    def __init__(self, file, length: int) -> None:
+        self._file = file
+        self._remaining = length
+
+    def read(self, size: int = -1) -> bytes:
+        if self._remaining <= 0:
+            return b''
+        if size is None or size < 0 or size > self._remaining:
+            size = self._remaining
+        chunk = self._file.read(size)
+        self._remaining -= len(chunk)
+        return chunk
+
+    def fileno(self) -> int:
+        return self._file.fileno()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def serve_attachment(request: HttpRequest, attachment: ContactAttachment) -> HttpResponse:
+    response = serve_stored_file(
+        request,
+        attachment.file.name,
+        size=attachment.size,
+        filename=attachment.original_name or attachment.file.name,
+        content_type=attachment.content_type or 'application/octet-stream',
+        storage=attachment.file.storage,
+    )
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def serve_stored_file(
+    request: HttpRequest,
+    name: str,
+    *,
+    size: int | None,
+    filename: str,
+    content_type: str,
+    as_attachment: bool = False,
+    storage: Storage | None = None,
+) -> HttpResponse:
+    """Return a response for a stored file after access checks have passed.
+
+    When ``ATTACH_SENDFILE_BACKEND`` is configured the bytes are transferred
+    by the front proxy; otherwise Django streams the file itself with support
+    for ``If-None-Match`` and single byte ranges.
+    """
+
+    storage = storage or default_storage
+    etag = _build_etag(name, size)
+
+    conditional = get_conditional_response(request, etag=etag)
+    if conditional is not None:
+        return conditional
+
+    backend = getattr(settings, 'ATTACH_SENDFILE_BACKEND', '')
+    if backend:
+        response = _proxy_response(name, backend, storage)
+    else:
+        response = _django_response(request, name, size, etag, storage)
+
+    if response.status_code in (200, 206):
+        response['Content-Type'] = content_type
+        if disposition := content_disposition_header(as_attachment, filename):
+            response['Content-Disposition'] = disposition
+    response['ETag'] = etag
+    return response
+
+
+def _build_etag(name: str, size: int | None) -> str:
+    # Stored names are unique and never overwritten, so name + size identifies
+    # the content without touching the file.
+    digest = hashlib.sha256(f'{name}:{size or 0}'.encode('utf-8')).hexdigest()[:32]
+    return quote_etag(digest)
+
+
+def _proxy_response(name: str, backend: str, storage: Storage) -> HttpResponse:
+    response = HttpResponse()
+    if backend == 'nginx':
+        prefix = getattr(settings, 'ATTACH_SENDFILE_URL_PREFIX', '/protected-media/')
+        response['X-Accel-Redirect'] = prefix.rstrip('/') + '/' + quote(name)
+    else:
+        response['X-Sendfile'] = storage.path(name)
+    return response
+
+
+def _django_response(
+    request: HttpRequest,
+    name: str,
+    size: int | None,
+    etag: str,
+    storage: Storage,
+) -> HttpResponse:
+    if size is None:
+        size = storage.size(name)
+
+    byte_range = None
+    match = _RANGE_RE.match(request.headers.get('Range', '').strip())
+    if_range = request.headers.get('If-Range')
+    if match and any(match.groups()) and size > 0 and (if_range is None or if_range == etag):
+        byte_range = _resolve_range(*match.groups(), size)
+        if byte_range is None:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+    file = storage.open(name, 'rb')
+    if byte_range is None:
+        response = FileResponse(file)
+    else:
+        start, end = byte_range
+        length = end - start + 1
+        file.seek(start)
+        response = FileResponse(_FileRange(file, length), status=206)
+        response['Content-Length'] = str(length)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    response['Accept-Ranges'] = 'bytes'
+    return response
+
+
+def _resolve_range(raw_start: str, raw_end: str, size: int) -> tuple[int, int] | None:
+    """Return inclusive ``(start, end)`` offsets or ``None`` if unsatisfiable."""
+
+    if not raw_start:
+        if int(raw_end) == 0:
+            return None
+        return (max(0, size - int(raw_end)), size - 1)
+    start = int(raw_start)
+    end = int(raw_end) if raw_end else size - 1
+    if start >= size or end < start:
+        return None
+    return (start, min(end, size - 1))
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import csv
+from datetime import date, datetime, time, timedelta
+from typing import Iterator
+
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+
+from .. import catalogue
+from ..models import AdminActivityLog
+
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+EXPORT_BATCH_SIZE = 1000
+CSV_HEADER = ('id', 'created_at', 'action', 'action_label', 'message_id', 'description')
+
+
+class InvalidCursor(ValueError):
+    """The ``cursor`` parameter was not produced by :func:`encode_cursor`."""
+
+
+def filtered_logs(
+    *,
+    action: str | None = None,
+    message_id: int | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+) -> QuerySet[AdminActivityLog]:
+    """Newest-first log entries; each filter maps onto an ``(x, created_at)`` index."""
+
+    queryset = AdminActivityLog.objects.all()
+    if action:
+        queryset = queryset.filter(action=action)
+    if message_id:
+        queryset = queryset.filter(message_id=message_id)
+    if date_from:
+        queryset = queryset.filter(created_at__gte=_start_of_day(date_from))
+    if date_to:
+        queryset = queryset.filter(created_at__lt=_start_of_day(date_to + timedelta(days=1)))
+    return queryset.order_by('-created_at', '-id')
+
+
+def encode_cursor(entry: AdminActivityLog) -> str:
+    raw = f'{entry.created_at.isoformat()}|{entry.pk}'
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        created_at, pk = raw.rsplit('|', 1)
+        return datetime.fromisoformat(created_at), int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidCursor(cursor) from exc
+
+
+def page(
+    queryset: QuerySet[AdminActivityLog],
+    *,
+    cursor: str | None = None,
+    limit: int = PAGE_SIZE,
+) -> tuple[list[AdminActivityLog], str | None]:
+    """Return up to ``limit`` entries after ``cursor`` and the cursor for the next page.
+
+    Seeks past the last ``(created_at, id)`` seen instead of using OFFSET, so
+    deep pages cost the same as the first one.
+    """
+
+    if cursor:
+        created_at, pk = decode_cursor(cursor)
+        queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk))
+    entries = list(queryset[:limit + 1])
+    next_cursor = encode_cursor(entries[limit - 1]) if len(entries) > limit else None
+    return entries[:limit], next_cursor
+
+
+def iter_logs(queryset: QuerySet[AdminActivityLog], *, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[AdminActivityLog]:
+    cursor = None
+    while True:
+        entries, cursor = page(queryset, cursor=cursor, limit=batch_size)
+        yield from entries
+        if cursor is None:
+            return
+
+
+def serialise_entry(entry: AdminActivityLog, language: str) -> dict:
+    return {
+        'id': entry.id,
+        'created_at': timezone.localtime(entry.created_at).isoformat(),
+        'action': entry.action,
+        'action_label': catalogue.for_language(language).activity_labels.get(entry.action, entry.action),
+        'message_id': entry.message_id,
+        'description': entry.description,
+    }
+
+
+def stream_csv(queryset: QuerySet[AdminActivityLog], language: str) -> Iterator[str]:
+    writer = csv.writer(_Echo())
+    yield writer.writerow(CSV_HEADER)
+    for entry in iter_logs(queryset):
+        row = serialise_entry(entry, language)
+        yield writer.writerow([row[column] for column in CSV_HEADER])
+
+
+class _Echo:
+    """File-like object whose ``write`` hands the formatted row straight back."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def _start_of_day(day: date) -> datetime:
+    return timezone.make_aware(datetime.combine(day, time.min))
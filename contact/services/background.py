@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+logger = logging.getLogger(__name__)
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def submit(func: Callable[..., object], *args, **kwargs) -> None:
+    """Run ``func`` off the request path.
+
+    ``BACKGROUND_TASKS_MODE`` selects the strategy: ``thread`` (default) uses a
+    small per-process pool, ``sync`` runs the task inline (management commands,
+    tests) and ``off`` drops it, leaving the work to the periodic commands.
+    """
+
+    mode = getattr(settings, 'BACKGROUND_TASKS_MODE', 'thread')
+    if mode == 'off':
+        return
+    if mode == 'sync':
+        func(*args, **kwargs)
+        return
+    _get_executor().submit(_run_in_thread, func, *args, **kwargs)
+
+
+def submit_on_commit(func: Callable[..., object], *args, **kwargs) -> None:
+    transaction.on_commit(lambda: submit(func, *args, **kwargs))
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            workers = max(1, getattr(settings, 'BACKGROUND_TASKS_WORKERS', 2))
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='contact-bg')
+        return _executor
+
+
+def _run_in_thread(func: Callable[..., object], *args, **kwargs) -> None:
+    close_old_connections()
+    try:
+        func(*args, **kwargs)
+    except Exception:  # pragma: no cover - logged for operators
+        logger.exception('Background task %s failed', getattr(func, '__name__', func))
+    finally:
+        close_old_connections()
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator, Sequence
+
+from django.conf import settings
+from django.core.paginator import Page, Paginator
+from django.db import transaction
+from django.utils import timezone
+
+from ..models import ClientChangeLog, ContactMessage
+
+PAGE_SIZE = 20
+
+
+def coalesce_window() -> timedelta:
+    return timedelta(seconds=max(0, getattr(settings, 'CLIENT_LOG_COALESCE_SECONDS', 600)))
+
+
+def record_changes(
+    message: ContactMessage,
+    changes: Sequence[tuple[str, str, str]],
+    *,
+    now: datetime | None = None,
+) -> None:
+    """Log client edits given as ``(field, previous, new)``.
+
+    An edit to a field whose latest entry is unreverted and younger than the
+    coalescing window extends that entry instead of adding a row; the entry
+    keeps its original ``previous_value`` and takes the new ``new_value``.
+    Edits that end up back at the original value drop the entry entirely.
+    """
+
+    if not changes:
+        return
+    now = now or timezone.now()
+    window = coalesce_window()
+    with transaction.atomic():
+        latest: dict[str, ClientChangeLog] = {}
+        if window:
+            recent = (
+                ClientChangeLog.objects.select_for_update()
+                .filter(message=message, field__in=[field for field, _, _ in changes], changed_at__gte=now - window)
+                .order_by('field', '-changed_at', '-id')
+            )
+            for entry in recent:
+                latest.setdefault(entry.field, entry)
+
+        new_entries: list[ClientChangeLog] = []
+        for field, previous, new in changes:
+            entry = latest.get(field)
+            if entry is None or entry.is_reverted:
+                new_entries.append(
+                    ClientChangeLog(message=message, field=field, previous_value=previous, new_value=new)
+                )
+            elif entry.previous_value == new:
+                entry.delete()
+            else:
+                ClientChangeLog.objects.filter(pk=entry.pk).update(new_value=new, changed_at=now)
+        if new_entries:
+            ClientChangeLog.objects.bulk_create(new_entries)
+
+
+def compact(
+    *,
+    message_ids: Iterable[int] | None = None,
+    window: timedelta | None = None,
+    dry_run: bool = False,
+) -> Iterator[tuple[int, int]]:
+    """Merge runs of unreverted edits to the same field, message by message.
+
+    Two edits belong to one run when nothing else was logged for that field in
+    between and the later one came within ``window`` of the earlier. Yields
+    ``(message_id, rows_removed)`` for every message that had something to merge.
+    """
+
+    window = coalesce_window() if window is None else window
+    ids = ClientChangeLog.objects.filter(is_reverted=False).values_list('message_id', flat=True).distinct()
+    if message_ids is not None:
+        ids = ids.filter(message_id__in=list(message_ids))
+    for message_id in ids.order_by('message_id').iterator():
+        removed = _compact_message(message_id, window, dry_run=dry_run)
+        if removed:
+            yield message_id, removed
+
+
+def history_page(message: ContactMessage, page_number: int | str | None = 1) -> Page:
+    logs = ClientChangeLog.objects.filter(message=message).order_by('-changed_at', '-id')
+    return Paginator(logs, PAGE_SIZE).get_page(page_number)
+
+
+def _compact_message(message_id: int, window: timedelta, *, dry_run: bool) -> int:
+    with transaction.atomic():
+        entries = list(
+            ClientChangeLog.objects.select_for_update()
+            .filter(message_id=message_id)
+            .order_by('field', 'changed_at', 'id')
+        )
+        runs: list[list[ClientChangeLog]] = []
+        for entry in entries:
+            run = runs[-1] if runs else None
+            if (
+                run
+                and not entry.is_reverted
+                and not run[-1].is_reverted
+                and run[-1].field == entry.field
+                and entry.changed_at - run[-1].changed_at <= window
+            ):
+                run.append(entry)
+            else:
+                runs.append([entry])
+
+        removed = 0
+        for run in runs:
+            if len(run) < 2:
+                continue
+            first, last = run[0], run[-1]
+            if first.previous_value == last.new_value:
+                doomed = run
+            else:
+                doomed = run[1:]
+                if not dry_run:
+                    ClientChangeLog.objects.filter(pk=first.pk).update(
+                        new_value=last.new_value,
+                        changed_at=last.changed_at,
+                    )
+            removed += len(doomed)
+            if not dry_run:
+                ClientChangeLog.objects.filter(pk__in=[entry.pk for entry in doomed]).delete()
+        return removed
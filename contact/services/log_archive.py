@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import gzip
+import json
+import os
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Iterator
+
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from ..models import ActivityLogRollup, AdminActivityLog, ClientChangeLog
+
+
+@dataclass(frozen=True)
+class LogTable:
+    name: str
+    model: type[models.Model]
+    timestamp_field: str
+    group_field: str
+    source: str
+    fields: tuple[str, ...]
+    # Personal data: blanked in the files, since anonymisation never sees them.
+    redacted: tuple[str, ...] = ()
+
+
+TABLES = {
+    'admin': LogTable(
+        name='admin',
+        model=AdminActivityLog,
+        timestamp_field='created_at',
+        group_field='action',
+        source=ActivityLogRollup.SOURCE_ADMIN,
+        fields=('id', 'message_id', 'action', 'description', 'created_at'),
+    ),
+    'client': LogTable(
+        name='client',
+        model=ClientChangeLog,
+        timestamp_field='changed_at',
+        group_field='field',
+        source=ActivityLogRollup.SOURCE_CLIENT,
+        fields=('id', 'message_id', 'field', 'previous_value', 'new_value', 'changed_at', 'is_reverted'),
+        redacted=('previous_value', 'new_value'),
+    ),
+}
+
+
+def archive_dir() -> Path:
+    return Path(getattr(settings, 'LOG_ARCHIVE_DIR', Path(settings.BASE_DIR) / 'log_archive'))
+
+
+def archive_table(table: LogTable, *, cutoff: datetime, batch_size: int = 1000) -> Iterator[tuple[Path, int]]:
+    """Move rows older than ``cutoff`` into gzipped JSONL files, one file per batch.
+
+    Each batch is written to disk first; its daily rollup and the delete then
+    share one short transaction. A crash in between leaves the rows in place,
+    and the next run rewrites the same file name for them. The ``redacted``
+    fields are written empty: archived rows outlive the point at which
+    ``anonymise_old_requests`` would have scrubbed them.
+    """
+
+    queryset = table.model.objects.filter(**{f'{table.timestamp_field}__lt': cutoff}).order_by('pk')
+    while True:
+        rows = list(queryset.values(*table.fields)[:batch_size])
+        if not rows:
+            return
+        path = _write_batch(table, rows)
+        with transaction.atomic():
+            _add_to_rollup(table, rows)
+            table.model.objects.filter(pk__in=[row['id'] for row in rows]).delete()
+        yield path, len(rows)
+
+
+def count_archivable(table: LogTable, *, cutoff: datetime) -> int:
+    return table.model.objects.filter(**{f'{table.timestamp_field}__lt': cutoff}).count()
+
+
+def iter_archived(
+    table: LogTable,
+    *,
+    message_id: int | None = None,
+    group: str | None = None,
+    text: str | None = None,
+    since: date | None = None,
+    until: date | None = None,
+) -> Iterator[dict]:
+    """Yield archived rows of ``table`` that match every given filter, oldest file first."""
+
+    needle = text.lower() if text else None
+    for path in sorted(archive_dir().glob(f'{table.name}-*.jsonl.gz')):
+        with gzip.open(path, 'rt', encoding='utf-8') as handle:
+            for line in handle:
+                row = json.loads(line)
+                if message_id is not None and row.get('message_id') != message_id:
+                    continue
+                if group and row.get(table.group_field) != group:
+                    continue
+                if since or until:
+                    day = _local_day(parse_datetime(row[table.timestamp_field]))
+                    if (since and day < since) or (until and day > until):
+                        continue
+                if needle and needle not in line.lower():
+                    continue
+                yield row
+
+
+def redact_archives(table: LogTable) -> int:
+    """Blank the ``redacted`` fields in files written before they were redacted.
+
+    Returns the number of files rewritten.
+    """
+
+    if not table.redacted:
+        return 0
+    rewritten = 0
+    for path in sorted(archive_dir().glob(f'{table.name}-*.jsonl.gz')):
+        with gzip.open(path, 'rt', encoding='utf-8') as handle:
+            rows = [json.loads(line) for line in handle]
+        if any(row.get(field) for row in rows for field in table.redacted):
+            _write_rows(table, path, rows)
+            rewritten += 1
+    return rewritten
+
+
+def _write_batch(table: LogTable, rows: list[dict]) -> Path:
+    directory = archive_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    first_day = _local_day(rows[0][table.timestamp_field]).strftime('%Y%m%d')
+    path = directory / f"{table.name}-{first_day}-{rows[0]['id']}-{rows[-1]['id']}.jsonl.gz"
+    _write_rows(table, path, rows)
+    return path
+
+
+def _write_rows(table: LogTable, path: Path, rows: list[dict]) -> None:
+    blank = dict.fromkeys(table.redacted, '')
+    tmp_path = path.with_name(path.name + '.tmp')
+    with gzip.open(tmp_path, 'wt', encoding='utf-8') as handle:
+        for row in rows:
+            handle.write(json.dumps({**row, **blank}, default=_json_default, ensure_ascii=False))
+            handle.write('\n')
+    os.replace(tmp_path, path)
+
+
+def _add_to_rollup(table: LogTable, rows: list[dict]) -> None:
+    counts = Counter(
+        (_local_day(row[table.timestamp_field]), row[table.group_field]) for row in rows
+    )
+    for (day, group), count in counts.items():
+        updated = ActivityLogRollup.objects.filter(day=day, source=table.source, action=group).update(
+            count=F('count') + count
+        )
+        if not updated:
+            ActivityLogRollup.objects.create(day=day, source=table.source, action=group, count=count)
+
+
+def _local_day(value: datetime) -> date:
+    if timezone.is_aware(value):
+        value = timezone.localtime(value)
+    return value.date()
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f'Cannot serialise {type(value).__name__}')
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import hashlib
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from ..models import LoginAttempt
+
+
+@dataclass(frozen=True)
+class LockoutState:
+    failures: int = 0
+    blocked_until: datetime | None = None
+
+    def remaining(self, now: datetime | None = None) -> timedelta | None:
+        if self.blocked_until is None:
+            return None
+        now = now or timezone.now()
+        if self.blocked_until <= now:
+            return None
+        return self.blocked_until - now
+
+    @property
+    def attempts_left(self) -> int:
+        return max(0, max_attempts() - self.failures)
+
+
+def max_attempts() -> int:
+    return max(1, getattr(settings, 'ADMIN_LOGIN_MAX_ATTEMPTS', 5))
+
+
+def get_state(client: str, *, now: datetime | None = None) -> LockoutState:
+    now = now or timezone.now()
+    row = LoginAttempt.objects.filter(key=_client_key(client)).first()
+    if row is None or _is_stale(row, now):
+        return LockoutState()
+    return LockoutState(row.failures, row.blocked_until)
+
+
+def register_failure(client: str, *, now: datetime | None = None) -> LockoutState:
+    """Count one failed login for ``client`` and block it once the limit is hit."""
+
+    now = now or timezone.now()
+    with transaction.atomic():
+        row, created = LoginAttempt.objects.select_for_update().get_or_create(
+            key=_client_key(client),
+            defaults={'last_attempt_at': now},
+        )
+        if not created and _is_stale(row, now):
+            row.failures = 0
+            row.blocked_until = None
+        row.failures += 1
+        if row.failures >= max_attempts():
+            row.blocked_until = now + timedelta(seconds=getattr(settings, 'ADMIN_LOGIN_LOCKOUT_SECONDS', 300))
+        row.last_attempt_at = now
+        row.save(update_fields=['failures', 'blocked_until', 'last_attempt_at'])
+
+    if created and _should_prune():
+        prune(now=now)
+    return LockoutState(row.failures, row.blocked_until)
+
+
+def reset(client: str) -> None:
+    LoginAttempt.objects.filter(key=_client_key(client)).delete()
+
+
+def prune(*, now: datetime | None = None) -> int:
+    """Drop expired entries, then evict the least recently seen ones over the cap.
+
+    This walks the table, so requests only run it for about one new client in
+    ``ADMIN_LOGIN_PRUNE_EVERY``; ``prune_login_attempts`` runs it on schedule.
+    """
+
+    now = now or timezone.now()
+    removed, _ = LoginAttempt.objects.filter(_stale_filter(now)).delete()
+
+    max_entries = getattr(settings, 'ADMIN_LOGIN_LOCKOUT_MAX_ENTRIES', 10000)
+    if max_entries > 0:
+        overflow = list(
+            LoginAttempt.objects.order_by('-last_attempt_at', '-pk').values_list('pk', flat=True)[max_entries:]
+        )
+        if overflow:
+            evicted, _ = LoginAttempt.objects.filter(pk__in=overflow).delete()
+            removed += evicted
+    return removed
+
+
+def _should_prune() -> bool:
+    every = getattr(settings, 'ADMIN_LOGIN_PRUNE_EVERY', 100)
+    return every > 0 and random.randrange(every) == 0
+
+
+def _client_key(client: str) -> str:
+    return hashlib.sha256((client or 'unknown').encode('utf-8')).hexdigest()
+
+
+def _ttl() -> timedelta:
+    return timedelta(seconds=getattr(settings, 'ADMIN_LOGIN_ATTEMPT_TTL_SECONDS', 900))
+
+
+def _is_stale(row: LoginAttempt, now: datetime) -> bool:
+    # An elapsed block starts the count afresh, as does a long quiet period.
+    if row.blocked_until is not None:
+        return row.blocked_until <= now
+    return row.last_attempt_at <= now - _ttl()
+
+
+def _stale_filter(now: datetime) -> Q:
+    return Q(blocked_until__lte=now) | Q(blocked_until__isnull=True, last_attempt_at__lte=now - _ttl())
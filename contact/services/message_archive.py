@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Iterator
+
+from django.db import transaction
+from django.db.models import Q, QuerySet, prefetch_related_objects
+from django.utils import timezone
+
+from ..models import ArchivedAttachment, ArchivedMessage, ContactMessage
+from . import access_grants
+
+_COPIED_FIELDS = (
+    'full_name',
+    'phone',
+    'email',
+    'company',
+    'company_name',
+    'message',
+    'final_changes',
+    'final_response',
+    'status',
+    'created_at',
+    'anonymised_at',
+)
+
+
+def archivable(cutoff: datetime) -> QuerySet[ContactMessage]:
+    return ContactMessage.objects.filter(
+        status=ContactMessage.STATUS_READY,
+        is_deleted=False,
+        created_at__lt=cutoff,
+    )
+
+
+def archive_requests(cutoff: datetime, *, batch_size: int = 200) -> Iterator[list[int]]:
+    """Move ready requests created before ``cutoff`` into the archive tables.
+
+    Each batch is copied and deleted from the hot tables in its own short
+    transaction; yields the ids moved by each batch. Attachment blobs are
+    left in storage and only their metadata changes table.
+    """
+
+    while True:
+        moved = _archive_batch(cutoff, batch_size)
+        if not moved:
+            return
+        yield moved
+
+
+def search(
+    *,
+    query: str | None = None,
+    company: str | None = None,
+) -> QuerySet[ArchivedMessage]:
+    queryset = ArchivedMessage.objects.all()
+    query = (query or '').strip()
+    if query.isdigit():
+        queryset = queryset.filter(pk=int(query))
+    elif query:
+        queryset = queryset.filter(
+            Q(email__icontains=query) | Q(full_name__icontains=query) | Q(company_name__icontains=query)
+        )
+    if company and company != 'all':
+        queryset = queryset.filter(company=company)
+    return queryset.order_by('-created_at', '-id').prefetch_related('attachments')
+
+
+def _archive_batch(cutoff: datetime, batch_size: int) -> list[int]:
+    with transaction.atomic():
+        messages = list(archivable(cutoff).select_for_update().order_by('id')[:batch_size])
+        if not messages:
+            return []
+        prefetch_related_objects(messages, 'attachments', 'admin_logs', 'client_logs')
+
+        now = timezone.now()
+        archived = []
+        attachments = []
+        for message in messages:
+            archived.append(ArchivedMessage(
+                id=message.id,
+                archived_at=now,
+                admin_logs=[_admin_log(entry) for entry in message.admin_logs.all()],
+                client_logs=[_client_log(entry) for entry in message.client_logs.all()],
+                **{field: getattr(message, field) for field in _COPIED_FIELDS},
+            ))
+            attachments.extend(
+                ArchivedAttachment(
+                    message_id=message.id,
+                    file=attachment.file.name,
+                    thumbnail=attachment.thumbnail.name or '',
+                    original_name=attachment.original_name,
+                    content_type=attachment.content_type,
+                    size=attachment.size,
+                    uploaded_at=attachment.uploaded_at,
+                )
+                for attachment in message.attachments.all()
+            )
+        ArchivedMessage.objects.bulk_create(archived)
+        ArchivedAttachment.objects.bulk_create(attachments)
+
+        ids = [message.id for message in messages]
+        # Cascades to ContactAttachment, AdminActivityLog and ClientChangeLog rows.
+        ContactMessage.objects.filter(pk__in=ids).delete()
+        transaction.on_commit(lambda: access_grants.revoke(ids))
+    return ids
+
+
+def _admin_log(entry) -> dict:
+    return {
+        'action': entry.action,
+        'description': entry.description,
+        'created_at': entry.created_at.isoformat(),
+    }
+
+
+def _client_log(entry) -> dict:
+    return {
+        'field': entry.field,
+        'previous_value': entry.previous_value,
+        'new_value': entry.new_value,
+        'changed_at': entry.changed_at.isoformat(),
+        'is_reverted': entry.is_reverted,
+    }
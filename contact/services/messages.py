@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from typing import Iterable, Sequence
 
+from django.conf import settings
 from django.core.files.uploadedfile import UploadedFile
 from django.db import transaction
 from django.db.models import QuerySet
 
-from ..models import ContactAttachment, ContactMessage
+from ..models import ClientChangeLog, ContactAttachment, ContactMessage, PendingPurge
+from . import access_grants, background, previews, storage_gc
 
 
 def add_message(
@@ -20,19 +24,26 @@ def add_message(
     attachments: Sequence | None = None,
 ) -> tuple[ContactMessage, str]:
     files: list[UploadedFile] = list(attachments or [])
-    with transaction.atomic():
-        contact_message = ContactMessage.objects.create(
-            full_name=full_name,
-            phone=phone,
-            email=email,
-            company=company,
-            company_name=company_name,
-            message=message,
-        )
-        token = contact_message.initialise_access_token()
-        contact_message.save(update_fields=["access_token_hash", "access_token_expires_at"])
-        if files:
-            _create_attachments(contact_message, files)
+    # Blobs are written before the transaction opens so that slow storage I/O
+    # never runs while the INSERTs hold their locks.
+    stored = _store_files(files)
+    try:
+        with transaction.atomic():
+            contact_message = ContactMessage.objects.create(
+                full_name=full_name,
+                phone=phone,
+                email=email,
+                company=company,
+                company_name=company_name,
+                message=message,
+            )
+            token = contact_message.initialise_access_token()
+            contact_message.save(update_fields=["access_token_hash", "access_token_expires_at"])
+            if stored:
+                _create_attachment_rows(contact_message, stored)
+    except Exception:
+        _discard_files([name for name, _ in stored])
+        raise
     return contact_message, token
 
 
@@ -43,7 +54,9 @@ def update_messages_status(message_ids: Iterable[int], *, status: str) -> None:
 
 
 def delete_messages(message_ids: Iterable[int]) -> None:
+    message_ids = list(message_ids)
     ContactMessage.objects.filter(id__in=message_ids).update(is_deleted=True)
+    access_grants.revoke(message_ids)
 
 
 def get_messages(*, sort_by: str | None = None, company: str | None = None) -> QuerySet[ContactMessage]:
@@ -67,17 +80,139 @@ def restore_messages(message_ids: Iterable[int]) -> None:
     ContactMessage.objects.filter(id__in=message_ids).update(is_deleted=False)
 
 
-def purge_messages(message_ids: Iterable[int] | None = None) -> None:
+def purge_messages(
+    message_ids: Iterable[int] | None = None,
+    *,
+    up_to_id: int | None = None,
+    batch_size: int | None = None,
+) -> int:
+    """Permanently delete trashed messages, ``batch_size`` ids per transaction.
+
+    Child rows are removed with one bulk DELETE per table before their
+    parents, so neither the rows nor their cascades are loaded into memory,
+    and locks are held for one chunk at a time. Every chunk commits on its
+    own: an interrupted run can simply be started again. ``up_to_id`` limits
+    "empty trash" to the messages that were in the bin when it was requested.
+    Returns the number of messages deleted.
+    """
+
+    batch_size = max(1, batch_size or getattr(settings, "PURGE_BATCH_SIZE", 500))
+    queryset = trashed_messages(message_ids, up_to_id=up_to_id)
+
+    deleted = 0
+    while True:
+        with transaction.atomic():
+            ids = list(queryset.select_for_update().order_by("id").values_list("id", flat=True)[:batch_size])
+            if not ids:
+                return deleted
+            attachments = ContactAttachment.objects.filter(message_id__in=ids)
+            file_names = storage_gc.referenced_file_names(attachments)
+            # The child tables have no signals or dependants, so the collector
+            # removes them with one DELETE each before the parents go.
+            ContactMessage.objects.filter(id__in=ids).delete()
+            _delete_files_on_commit(file_names)
+        deleted += len(ids)
+
+
+def trashed_messages(
+    message_ids: Iterable[int] | None = None,
+    *,
+    up_to_id: int | None = None,
+) -> QuerySet[ContactMessage]:
     queryset = ContactMessage.objects.filter(is_deleted=True)
     if message_ids is not None:
-        queryset = queryset.filter(id__in=message_ids)
-    queryset.delete()
+        queryset = queryset.filter(id__in=list(message_ids))
+    if up_to_id is not None:
+        queryset = queryset.filter(id__lte=up_to_id)
+    return queryset
+
+
+def schedule_purge(message_ids: Iterable[int] | None = None) -> bool:
+    """Purge now, or hand the work to a background task when the trash is large.
+
+    A deferred purge is recorded as a ``PendingPurge`` first, so that the
+    ``purge_trash`` command can finish exactly that selection if the task
+    never runs to the end. Returns ``True`` when the purge was deferred.
+    """
+
+    if message_ids is not None:
+        message_ids = list(message_ids)
+    queryset = trashed_messages(message_ids)
+    limit = getattr(settings, "PURGE_SYNC_LIMIT", 200)
+    if queryset[:limit + 1].count() <= limit:
+        purge_messages(message_ids)
+        return False
+    up_to_id = queryset.order_by("-id").values_list("id", flat=True).first()
+    pending = PendingPurge.objects.create(message_ids=message_ids, up_to_id=up_to_id)
+    background.submit_on_commit(run_pending_purge, pending.id)
+    return True
+
+
+def run_pending_purge(pending_id: int, *, batch_size: int | None = None) -> int:
+    """Carry out a recorded purge and forget it once it has finished."""
+
+    pending = PendingPurge.objects.filter(pk=pending_id).first()
+    if pending is None:
+        return 0
+    deleted = purge_messages(pending.message_ids, up_to_id=pending.up_to_id, batch_size=batch_size)
+    pending.delete()
+    return deleted
+
+
+def discard_message(message: ContactMessage) -> None:
+    """Remove a message that was never delivered, together with its stored files."""
+
+    with transaction.atomic():
+        file_names = storage_gc.referenced_file_names(message.attachments.all())
+        message.delete()
+        _delete_files_on_commit(file_names)
+
+
+def rollback_client_changes(
+    message: ContactMessage,
+    *,
+    log_ids: Iterable[int] | None = None,
+    since: datetime | None = None,
+) -> list[str]:
+    """Revert the selected client edits of ``message`` in one locked transaction.
+
+    ``log_ids`` and ``since`` narrow the set of unreverted entries; with both
+    omitted every outstanding edit is undone. When several entries touch the
+    same field, the value from before the oldest of them is restored. Returns
+    the restored field names (empty if nothing matched).
+    """
+
+    with transaction.atomic():
+        logs = ClientChangeLog.objects.select_for_update().filter(message=message, is_reverted=False)
+        if log_ids is not None:
+            logs = logs.filter(pk__in=list(log_ids))
+        if since is not None:
+            logs = logs.filter(changed_at__gte=since)
+        entries = list(logs.order_by("changed_at", "id").only("id", "field", "previous_value"))
+        if not entries:
+            return []
+
+        values: dict[str, str] = {}
+        for entry in entries:
+            values.setdefault(entry.field, entry.previous_value)
+        ContactMessage.objects.filter(pk=message.pk).update(**values)
+        ClientChangeLog.objects.filter(pk__in=[entry.id for entry in entries]).update(is_reverted=True)
+
+    for field_name, value in values.items():
+        setattr(message, field_name, value)
+    return list(values)
 
 
 def add_attachments(message: ContactMessage, files: Sequence[UploadedFile]) -> None:
     if not files:
         return
-    _create_attachments(message, files)
+    stored = _store_files(files)
+    try:
+        with transaction.atomic():
+            _create_attachment_rows(message, stored)
+    except Exception:
+        _discard_files([name for name, _ in stored])
+        raise
 
 
 def _resolve_ordering(sort_by: str | None) -> list[str]:
@@ -90,12 +225,79 @@ def _resolve_ordering(sort_by: str | None) -> list[str]:
     return ["-created_at"]
 
 
-def _create_attachments(message: ContactMessage, files: Sequence[UploadedFile]) -> None:
-    for uploaded in files:
-        ContactAttachment.objects.create(
+def _store_files(files: Sequence[UploadedFile]) -> list[tuple[str, UploadedFile]]:
+    """Write uploads to storage concurrently and return ``(stored_name, upload)`` pairs.
+
+    If any write fails the files stored so far are removed before re-raising.
+    """
+
+    if not files:
+        return []
+
+    field = ContactAttachment._meta.get_field("file")
+    storage = field.storage
+
+    def save(uploaded: UploadedFile) -> str:
+        name = field.generate_filename(None, getattr(uploaded, "name", "") or "attachment")
+        return storage.save(name, uploaded, max_length=field.max_length)
+
+    workers = min(len(files), max(1, getattr(settings, "ATTACH_STORAGE_WRITE_WORKERS", 4)))
+    if workers == 1:
+        results: list[str | BaseException] = []
+        for uploaded in files:
+            try:
+                results.append(save(uploaded))
+            except Exception as exc:
+                results.append(exc)
+                break
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(save, uploaded) for uploaded in files]
+        results = [future.exception() or future.result() for future in futures]
+
+    errors = [result for result in results if isinstance(result, BaseException)]
+    names = [result for result in results if isinstance(result, str)]
+    if errors:
+        _discard_files(names)
+        raise errors[0]
+    return list(zip(names, files))
+
+
+def _create_attachment_rows(message: ContactMessage, stored: Sequence[tuple[str, UploadedFile]]) -> None:
+    rows = [
+        ContactAttachment(
             message=message,
-            file=uploaded,
+            file=name,
             original_name=getattr(uploaded, "name", ""),
             content_type=getattr(uploaded, "content_type", ""),
             size=getattr(uploaded, "size", 0) or 0,
         )
+        for name, uploaded in stored
+    ]
+    created = ContactAttachment.objects.bulk_create(rows)
+    attachment_ids = [row.pk for row in created if row.pk is not None]
+    if len(attachment_ids) != len(rows):
+        # Backends without RETURNING support leave primary keys unset.
+        attachment_ids = list(
+            ContactAttachment.objects.filter(
+                message=message,
+                file__in=[name for name, _ in stored],
+            ).values_list("id", flat=True)
+        )
+    _schedule_previews(attachment_ids)
+
+
+def _discard_files(names: Sequence[str]) -> None:
+    storage_gc.delete_files(names)
+
+
+def _delete_files_on_commit(names: Sequence[str]) -> None:
+    # Storage deletes are slow and not transactional: run them off the request
+    # path and only once the rows are really gone.
+    if names:
+        background.submit_on_commit(storage_gc.delete_files, list(names))
+
+
+def _schedule_previews(attachment_ids: list[int]) -> None:
+    if attachment_ids and getattr(settings, "ATTACH_PREVIEWS_ON_UPLOAD", True):
+        background.submit_on_commit(previews.generate_previews, attachment_ids)
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from io import BytesIO
-from typing import Iterable
+from typing import Iterable, Mapping
 from html import escape  # ← используем стандартный экранировщик
 
 from django.utils import timezone
@@ -12,6 +12,7 @@ from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
 from reportlab.lib.units import mm
 from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
 
+from .. import catalogue
 from ..models import ContactMessage
 
 
@@ -109,8 +110,9 @@ def build_messages_pdf(
     story.append(Paragraph(escape(title), title_style))
     story.append(Paragraph(escape(subtitle), subtitle_style))
 
-    status_labels = _status_labels(language)
-    field_labels = _field_labels(language)
+    labels = catalogue.for_language(language)
+    status_labels = labels.status_labels
+    field_labels = labels.field_labels
 
     messages = list(messages)
     selected_field_labels = [field_labels.get(field, field) for field in fields]
@@ -226,46 +228,10 @@ def build_messages_pdf(
     return buffer.getvalue()
 
 
-def _field_labels(language: str) -> dict[str, str]:
-    if language == "pl":
-        return {
-            "created_at": "Data zgłoszenia",
-            "customer": "Klient",
-            "phone": "Telefon",
-            "email": "E-mail",
-            "company": "Firma",
-            "message": "Wiadomość",
-            "status": "Status",
-        }
-    return {
-        "created_at": "Submitted at",
-        "customer": "Customer",
-        "phone": "Phone",
-        "email": "Email",
-        "company": "Company",
-        "message": "Message",
-        "status": "Status",
-    }
-
-
-def _status_labels(language: str) -> dict[str, str]:
-    if language == "pl":
-        return {
-            ContactMessage.STATUS_NEW: "Nowe",
-            ContactMessage.STATUS_IN_PROGRESS: "W trakcie",
-            ContactMessage.STATUS_READY: "Gotowe",
-        }
-    return {
-        ContactMessage.STATUS_NEW: "New",
-        ContactMessage.STATUS_IN_PROGRESS: "In progress",
-        ContactMessage.STATUS_READY: "Ready",
-    }
-
-
 def _field_value(
     field: str,
     message: ContactMessage,
-    status_labels: dict[str, str],
+    status_labels: Mapping[str, str],
 ) -> str:
     if field == "created_at":
         timestamp = timezone.localtime(message.created_at)
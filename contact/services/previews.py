@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import logging
+import shlex
+import subprocess
+from io import BytesIO
+from pathlib import Path
+from typing import Iterable
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps, features
+
+from ..models import ContactAttachment
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.webp', '.gif'}
+
+
+def generate_previews(attachment_ids: Iterable[int]) -> None:
+    attachments = ContactAttachment.objects.filter(
+        id__in=list(attachment_ids),
+        preview_status=ContactAttachment.PREVIEW_PENDING,
+    )
+    for attachment in attachments:
+        generate_preview(attachment)
+
+
+def generate_preview(attachment: ContactAttachment) -> str:
+    """Render and store a thumbnail next to the attachment, returning the new status."""
+
+    kind = _preview_kind(attachment)
+    if kind is None:
+        return _set_status(attachment, ContactAttachment.PREVIEW_UNSUPPORTED)
+
+    try:
+        with attachment.file.open('rb') as source:
+            if kind == 'pdf':
+                image = _render_pdf_first_page(source)
+            else:
+                image = Image.open(source)
+                image = _load_thumbnail(image)
+            if image is None:
+                return _set_status(attachment, ContactAttachment.PREVIEW_FAILED)
+            payload, extension = _encode(image)
+    except (OSError, ValueError, Image.DecompressionBombError, subprocess.SubprocessError):
+        logger.warning('Preview generation failed for attachment %s', attachment.pk, exc_info=True)
+        return _set_status(attachment, ContactAttachment.PREVIEW_FAILED)
+
+    storage = attachment.file.storage
+    thumbnail_name = storage.save(f'{attachment.file.name}.thumb{extension}', ContentFile(payload))
+    return _set_status(attachment, ContactAttachment.PREVIEW_READY, thumbnail=thumbnail_name)
+
+
+def thumbnail_content_type(name: str) -> str:
+    return 'image/webp' if name.endswith('.webp') else 'image/png'
+
+
+def _preview_kind(attachment: ContactAttachment) -> str | None:
+    content_type = (attachment.content_type or '').lower()
+    extension = Path(attachment.original_name or attachment.file.name).suffix.lower()
+    if content_type == 'application/pdf' or extension == '.pdf':
+        return 'pdf'
+    if content_type.startswith('image/') or extension in IMAGE_EXTENSIONS:
+        return 'image'
+    return None
+
+
+def _load_thumbnail(image: Image.Image) -> Image.Image:
+    size = _preview_size()
+    # For JPEGs draft() lets the decoder downscale by 1/2..1/8 while decoding,
+    # which is most of the cost for large scans.
+    image.draft('RGB', (size, size))
+    image = ImageOps.exif_transpose(image)
+    image.thumbnail((size, size))
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+    return image
+
+
+def _render_pdf_first_page(source) -> Image.Image | None:
+    command = getattr(settings, 'ATTACH_PDF_PREVIEW_COMMAND', '')
+    args = shlex.split(command) if command else []
+    if not args:
+        return None
+
+    process = subprocess.run(
+        args,
+        input=source.read(),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        timeout=getattr(settings, 'ATTACH_PREVIEW_TIMEOUT', 30),
+        check=False,
+    )
+    if process.returncode != 0 or not process.stdout:
+        logger.warning(
+            'PDF preview command exited with %s: %s',
+            process.returncode,
+            process.stderr.decode(errors='replace').strip(),
+        )
+        return None
+    return _load_thumbnail(Image.open(BytesIO(process.stdout)))
+
+
+def _encode(image: Image.Image) -> tuple[bytes, str]:
+    buffer = BytesIO()
+    if features.check('webp'):
+        image.save(buffer, format='WEBP', quality=80, method=4)
+        return buffer.getvalue(), '.webp'
+    image.save(buffer, format='PNG', optimize=True)
+    return buffer.getvalue(), '.png'
+
+
+def _preview_size() -> int:
+    return max(32, getattr(settings, 'ATTACH_PREVIEW_SIZE', 320))
+
+
+def _set_status(attachment: ContactAttachment, status: str, *, thumbnail: str = '') -> str:
+    ContactAttachment.objects.filter(pk=attachment.pk).update(
+        preview_status=status,
+        thumbnail=thumbnail,
+    )
+    attachment.preview_status = status
+    attachment.thumbnail = thumbnail
+    return status
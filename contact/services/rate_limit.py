@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import math
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Mapping, Sequence
+
+from django.conf import settings
+from django.core.cache import BaseCache, cache as default_cache
+
+from ..utils import build_rate_limit_key
+
+TOKEN_BUCKET = "token_bucket"
+SLIDING_WINDOW = "sliding_window"
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    """``limit`` requests per ``window`` seconds for one identifier scope.
+
+    ``scope`` names the identifier the policy applies to (``ip``, ``email``…);
+    ``name`` must be unique within a limiter because it is part of the key.
+    """
+
+    name: str
+    scope: str
+    limit: int
+    window: int
+    algorithm: str = TOKEN_BUCKET
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    allowed: bool
+    retry_after: float = 0.0
+    # What an allowed acquire() took, so that refund() can give it back.
+    consumed: tuple[tuple[RateLimitPolicy, str], ...] = ()
+
+
+class RateLimiter:
+    """Take one request from several policies, deciding on the updated values.
+
+    Sliding-window counters keep one integer per fixed window, are bumped
+    with atomic ``add``/``incr`` and weight the previous window by its
+    remaining overlap; the count the cache returns decides. Token buckets
+    keep ``(tokens, updated_at)`` in a single key and smooth bursts. A
+    bucket of one token is taken with a single ``add`` that expires when it
+    would have refilled; larger buckets are read and written under a short
+    ``add`` lock. Everything else the decision needs is read with one
+    ``get_many``.
+
+    State lives in the shared tier of a ``TwoTierCache``: the per-process
+    copy may be stale, which would let other workers' hits go unseen.
+    """
+
+    lock_timeout = 2
+    lock_attempts = 5
+
+    def __init__(
+        self,
+        prefix: str,
+        policies: Sequence[RateLimitPolicy],
+        *,
+        cache: BaseCache | None = None,
+    ) -> None:
+        self.prefix = prefix
+        self.policies = tuple(policy for policy in policies if policy.limit > 0 and policy.window > 0)
+        cache = cache or default_cache
+        self.cache = getattr(cache, 'shared', cache)
+
+    def acquire(self, identifiers: Mapping[str, str], *, now: float | None = None) -> RateLimitResult:
+        """Consume one request from every policy, or from none if any policy is exhausted."""
+
+        now = time.time() if now is None else now
+        plan = self._plan(identifiers, now)
+        single = [(policy, keys[0]) for policy, keys in plan if _is_single_token(policy)]
+        buckets = [(policy, keys[0]) for policy, keys in plan if _is_bucket(policy) and not _is_single_token(policy)]
+        windows = [(policy, keys) for policy, keys in plan if policy.algorithm == SLIDING_WINDOW]
+        if not plan:
+            return RateLimitResult(True)
+
+        with self._locked([key for _policy, key in buckets]) as locked:
+            if not locked:
+                # Another request from the same sender is being decided.
+                return RateLimitResult(False, max(policy.window / policy.limit for policy, _key in buckets))
+
+            taken = {key: self.cache.add(key, (0.0, now), timeout=policy.window) for policy, key in single}
+            counts = {keys[0]: self._increment(keys[0], timeout=policy.window * 2) for policy, keys in windows}
+            reads = [key for key, added in taken.items() if not added]
+            reads += [key for _policy, key in buckets]
+            reads += [keys[1] for _policy, keys in windows]
+            values = self.cache.get_many(reads) if reads else {}
+
+            retry_after = 0.0
+            for policy, key in single:
+                if taken[key]:
+                    continue
+                wait = _token_bucket_wait(policy, now, values.get(key))
+                if wait <= 0:
+                    # Refilled, but the key has not expired yet (or just did).
+                    wait = self._retake(policy, key, now)
+                    taken[key] = wait <= 0
+                retry_after = max(retry_after, wait)
+            updates: dict[str, tuple[float, float]] = {}
+            for policy, key in buckets:
+                wait = _token_bucket_wait(policy, now, values.get(key))
+                retry_after = max(retry_after, wait)
+                updates[key] = (_available_tokens(policy, now, values.get(key)) - 1, now)
+            for policy, keys in windows:
+                previous = _as_count(values.get(keys[1]))
+                overlap = 1 - (now % policy.window) / policy.window
+                if previous * overlap + counts[keys[0]] > policy.limit:
+                    wait = _sliding_window_wait(policy, now, counts[keys[0]] - 1, previous)
+                    retry_after = max(retry_after, wait)
+
+            if retry_after > 0:
+                self._give_back(
+                    [(policy, key) for policy, key in single if taken[key]]
+                    + [(policy, keys[0]) for policy, keys in windows],
+                    now,
+                )
+                return RateLimitResult(False, retry_after)
+            if updates:
+                self.cache.set_many(updates, timeout=max(policy.window for policy, _key in buckets))
+        return RateLimitResult(True, consumed=tuple((policy, keys[0]) for policy, keys in plan))
+
+    def refund(self, result: RateLimitResult, *, now: float | None = None) -> None:
+        """Return what ``acquire`` took, for a submission that did not go through."""
+
+        self._give_back(result.consumed, time.time() if now is None else now)
+
+    def _give_back(self, consumed: Iterable[tuple[RateLimitPolicy, str]], now: float) -> None:
+        consumed = list(consumed)
+        single = [key for policy, key in consumed if _is_single_token(policy)]
+        buckets = [(policy, key) for policy, key in consumed if _is_bucket(policy) and not _is_single_token(policy)]
+        if single:
+            # A one-token bucket that got its token back is simply full.
+            self.cache.delete_many(single)
+        for policy, key in consumed:
+            if policy.algorithm == SLIDING_WINDOW:
+                self._decrement(key)
+        if not buckets:
+            return
+        with self._locked([key for _policy, key in buckets]) as locked:
+            if not locked:
+                return
+            states = self.cache.get_many([key for _policy, key in buckets])
+            self.cache.set_many(
+                {
+                    key: (min(float(policy.limit), _available_tokens(policy, now, states.get(key)) + 1), now)
+                    for policy, key in buckets
+                },
+                timeout=max(policy.window for policy, _key in buckets),
+            )
+
+    def _retake(self, policy: RateLimitPolicy, key: str, now: float) -> float:
+        with self._locked([key]) as locked:
+            if not locked:
+                return policy.window / policy.limit
+            state = self.cache.get(key)
+            wait = _token_bucket_wait(policy, now, state)
+            if wait <= 0:
+                self.cache.set(key, (_available_tokens(policy, now, state) - 1, now), timeout=policy.window)
+            return wait
+
+    def _increment(self, key: str, *, timeout: int) -> int:
+        # Current window plus the next one, during which it is "previous".
+        if self.cache.add(key, 1, timeout=timeout):
+            return 1
+        try:
+            count = self.cache.incr(key)
+        except ValueError:  # expired between add() and incr()
+            self.cache.add(key, 1, timeout=timeout)
+            return 1
+        # Backends emulating incr() with get()+set() reset the TTL.
+        self.cache.touch(key, timeout)
+        return count
+
+    def _decrement(self, key: str) -> None:
+        try:
+            self.cache.decr(key)
+        except ValueError:  # the window has already expired
+            pass
+
+    @contextmanager
+    def _locked(self, keys: Sequence[str]) -> Iterator[bool]:
+        """Hold ``add`` locks on all ``keys`` (none needed for an empty list)."""
+
+        lock_keys = sorted(f"{key}:lock" for key in keys)
+        for attempt in range(self.lock_attempts if lock_keys else 1):
+            held = []
+            for lock_key in lock_keys:
+                if not self.cache.add(lock_key, 1, timeout=self.lock_timeout):
+                    break
+                held.append(lock_key)
+            if len(held) == len(lock_keys):
+                try:
+                    yield True
+                finally:
+                    if held:
+                        self.cache.delete_many(held)
+                return
+            self.cache.delete_many(held)
+            time.sleep(0.01 * (attempt + 1))
+        yield False
+
+    def _plan(self, identifiers: Mapping[str, str], now: float) -> list[tuple[RateLimitPolicy, list[str]]]:
+        plan: list[tuple[RateLimitPolicy, list[str]]] = []
+        for policy in self.policies:
+            identifier = identifiers.get(policy.scope)
+            if not identifier:
+                continue
+            base = build_rate_limit_key(f"{self.prefix}:{policy.name}", identifier)
+            if policy.algorithm == SLIDING_WINDOW:
+                window_index = int(now // policy.window)
+                plan.append((policy, [f"{base}:{window_index}", f"{base}:{window_index - 1}"]))
+            else:
+                plan.append((policy, [base]))
+        return plan
+
+
+def contact_form_limiter() -> RateLimiter:
+    """Limiter used by the public contact form, configured from settings."""
+
+    throttle_seconds = getattr(settings, 'CONTACT_FORM_THROTTLE_SECONDS', 30)
+    prefix = getattr(settings, 'CONTACT_FORM_RATE_LIMIT_PREFIX', 'contact_form')
+    hourly_limit = getattr(settings, 'CONTACT_FORM_HOURLY_LIMIT', 20)
+    policies = [
+        # One submission per throttle period per sender, as before.
+        RateLimitPolicy('ip', 'ip', 1, throttle_seconds),
+        RateLimitPolicy('email', 'email', 1, throttle_seconds),
+        RateLimitPolicy('ip_hourly', 'ip', hourly_limit, 3600, SLIDING_WINDOW),
+    ]
+    return RateLimiter(prefix, policies)
+
+
+def _is_bucket(policy: RateLimitPolicy) -> bool:
+    return policy.algorithm != SLIDING_WINDOW
+
+
+def _is_single_token(policy: RateLimitPolicy) -> bool:
+    return _is_bucket(policy) and policy.limit == 1
+
+
+def _available_tokens(policy: RateLimitPolicy, now: float, state) -> float:
+    try:
+        tokens, updated_at = state
+        tokens = float(tokens)
+        updated_at = float(updated_at)
+    except (TypeError, ValueError):
+        return float(policy.limit)
+    refill_rate = policy.limit / policy.window
+    return min(float(policy.limit), tokens + max(0.0, now - updated_at) * refill_rate)
+
+
+def _token_bucket_wait(policy: RateLimitPolicy, now: float, state) -> float:
+    tokens = _available_tokens(policy, now, state)
+    if tokens >= 1:
+        return 0.0
+    return (1 - tokens) * policy.window / policy.limit
+
+
+def _sliding_window_wait(policy: RateLimitPolicy, now: float, current, previous) -> float:
+    current = _as_count(current)
+    previous = _as_count(previous)
+    elapsed = now % policy.window
+    overlap = 1 - elapsed / policy.window
+    if previous * overlap + current + 1 <= policy.limit:
+        return 0.0
+
+    spare = policy.limit - 1 - current
+    if spare >= 0 and previous:
+        # Wait until the previous window's weight has decayed enough.
+        return max(0.0, (1 - spare / previous) - elapsed / policy.window) * policy.window
+    # The current window alone is full: it becomes "previous" at the next
+    # boundary and has to decay from there.
+    decay = 1 - (policy.limit - 1) / current if current else 0.0
+    return (policy.window - elapsed) + max(0.0, decay) * policy.window
+
+
+def _as_count(value) -> int:
+    try:
+        return max(0, int(value))
+    except (TypeError, ValueError):
+        return 0
+
+
+def retry_after_seconds(result: RateLimitResult) -> int:
+    return max(1, int(math.ceil(result.retry_after)))
@@ -0,0 +1,420 @@
+"""Synthetic request data for development and benchmark databases.
+
+Rows are generated in chunks with explicit, pre-reserved message ids so that
+each chunk can be built and written on its own — in a worker process, if
+there are several — and its attachments and logs can point at their parent
+without reading ids back. On PostgreSQL a chunk goes in through ``COPY``;
+elsewhere through one multi-row ``INSERT`` per table.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import multiprocessing
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator, Sequence
+
+from django.conf import settings
+from django.db import connection, connections, models, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .. import catalogue, tokens
+from ..models import AdminActivityLog, ArchivedMessage, ClientChangeLog, ContactAttachment, ContactMessage
+
+try:
+    from faker import Faker
+except ImportError:  # pragma: no cover - optional dev dependency
+    Faker = None
+
+POOL_SIZE = 500
+
+_MESSAGE_COLUMNS = (
+    'id', 'full_name', 'phone', 'email', 'company', 'company_name', 'message', 'final_changes',
+    'final_response', 'created_at', 'status', 'is_deleted', 'access_token_hash', 'access_enabled',
+    'access_token_expires_at',
+)
+_ATTACHMENT_COLUMNS = (
+    'message_id', 'file', 'original_name', 'content_type', 'size', 'uploaded_at', 'thumbnail', 'preview_status',
+)
+_CLIENT_LOG_COLUMNS = ('message_id', 'field', 'previous_value', 'new_value', 'changed_at', 'is_reverted')
+_ACTIVITY_COLUMNS = ('message_id', 'action', 'description', 'created_at')
+
+_CONTENT_TYPES = {
+    'pdf': 'application/pdf',
+    'jpg': 'image/jpeg',
+    'png': 'image/png',
+    'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+}
+_EDITABLE_FIELDS = (
+    ClientChangeLog.FIELD_PHONE,
+    ClientChangeLog.FIELD_EMAIL,
+    ClientChangeLog.FIELD_MESSAGE,
+    ClientChangeLog.FIELD_COMPANY_NAME,
+    ClientChangeLog.FIELD_FULL_NAME,
+)
+
+
+@dataclass(frozen=True)
+class SeedProfile:
+    """Shape of the generated data; ratios are fractions of all requests."""
+
+    days: int = 365
+    deleted_ratio: float = 0.05
+    attachment_ratio: float = 0.15
+    client_edit_ratio: float = 0.2
+    locale: str = 'pl_PL'
+    status: str | None = None
+
+
+@dataclass(frozen=True)
+class ChunkResult:
+    messages: int
+    attachments: int
+    client_logs: int
+    activity_logs: int
+
+
+def seed_token(message_id: int) -> str:
+    """The raw access token of a seeded request, so load tests can log in as its client."""
+
+    return f'seed{message_id:032d}'
+
+
+def uses_copy() -> bool:
+    return connection.vendor == 'postgresql'
+
+
+def can_fork() -> bool:
+    return connection.vendor != 'sqlite' and 'fork' in multiprocessing.get_all_start_methods()
+
+
+def reserve_ids() -> int:
+    """First message id never handed out; seeding assumes nobody else inserts meanwhile.
+
+    Archived requests keep their ids and purged ones may have held higher
+    ids than any live row, so the sequence counts as well as both tables.
+    """
+
+    return max(
+        ContactMessage.objects.aggregate(top=Max('id'))['top'] or 0,
+        ArchivedMessage.objects.aggregate(top=Max('id'))['top'] or 0,
+        _sequence_value(),
+    ) + 1
+
+
+def plan_chunks(first_id: int, count: int, chunk_size: int) -> list[tuple[int, int]]:
+    chunk_size = max(1, chunk_size)
+    return [
+        (first_id + offset, min(chunk_size, count - offset))
+        for offset in range(0, count, chunk_size)
+    ]
+
+
+def seed(
+    count: int,
+    *,
+    profile: SeedProfile = SeedProfile(),
+    chunk_size: int = 5000,
+    workers: int = 1,
+    random_seed: int | None = None,
+    copy: bool | None = None,
+) -> Iterator[ChunkResult]:
+    """Generate ``count`` requests with their children; yields per finished chunk.
+
+    With ``workers > 1`` (and a database that tolerates concurrent writers)
+    chunks are built and written by forked processes, each in its own
+    transaction and over its own connection.
+    """
+
+    if Faker is None:
+        raise RuntimeError('Faker is required to seed data: pip install Faker')
+    copy = uses_copy() if copy is None else copy
+    base_seed = random.randrange(1 << 30) if random_seed is None else random_seed
+    now = timezone.now()
+    tasks = [
+        (first_id, size, profile, base_seed + first_id, now, copy)
+        for first_id, size in plan_chunks(reserve_ids(), count, chunk_size)
+    ]
+
+    if workers > 1 and can_fork() and len(tasks) > 1:
+        # Children must open their own connections, not share the parent's socket.
+        connections.close_all()
+        context = multiprocessing.get_context('fork')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            yield from pool.map(_seed_chunk_task, tasks)
+    else:
+        for task in tasks:
+            yield _seed_chunk_task(task)
+    reset_sequences()
+
+
+def reset_sequences() -> None:
+    """Move the message id sequence past the seeded ids, never backwards.
+
+    Only PostgreSQL needs it: SQLite and MySQL advance their counters on
+    inserts with explicit ids. Child rows take their ids from the sequence.
+    """
+
+    if connection.vendor != 'postgresql':
+        return
+    top = reserve_ids() - 1
+    if top < 1:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT setval(pg_get_serial_sequence(%s, 'id'), %s)",
+            [ContactMessage._meta.db_table, top],
+        )
+
+
+def _sequence_value() -> int:
+    """Last message id the database has handed out itself, where it can tell."""
+
+    table = ContactMessage._meta.db_table
+    if connection.vendor == 'postgresql':
+        sql = "SELECT pg_sequence_last_value(pg_get_serial_sequence(%s, 'id')::regclass)"
+    elif connection.vendor == 'sqlite':
+        sql = 'SELECT seq FROM sqlite_sequence WHERE name = %s'
+    elif connection.vendor == 'mysql':
+        sql = (
+            'SELECT AUTO_INCREMENT - 1 FROM information_schema.TABLES '
+            'WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s'
+        )
+    else:
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [table])
+        row = cursor.fetchone()
+    return int(row[0]) if row and row[0] is not None else 0
+
+
+def clear(chunk_size: int = 5000) -> None:
+    """Remove every request and its children, one id chunk at a time.
+
+    Chunking keeps the delete collector from loading the whole table; the
+    child rows of each chunk go in one DELETE per table.
+    """
+
+    with transaction.atomic():
+        messages = ContactMessage.objects.order_by('id').values_list('id', flat=True)
+        while ids := list(messages[:chunk_size]):
+            ContactMessage.objects.filter(id__in=ids).delete()
+
+
+def build_chunk(
+    first_id: int,
+    size: int,
+    profile: SeedProfile,
+    random_seed: int,
+    now: datetime,
+) -> dict[type[models.Model], list[tuple]]:
+    """Rows for ``size`` requests starting at ``first_id``, keyed by model."""
+
+    rng = random.Random(random_seed)
+    fake = Faker(profile.locale)
+    fake.seed_instance(random_seed)
+    pool = _Pools(fake, min(POOL_SIZE, max(size, 10)))
+    companies = [value for value, _ in catalogue.COMPANY_CHOICES]
+    # Earlier departments get most of the traffic: weights 1, 1/2, 1/3, …
+    company_weights = [1 / rank for rank in range(1, len(companies) + 1)]
+    ttl = timedelta(hours=max(1, getattr(settings, 'CONTACT_ACCESS_TOKEN_TTL_HOURS', 72)))
+    span = max(1, profile.days) * 86400
+
+    rows: dict[type[models.Model], list[tuple]] = {
+        ContactMessage: [],
+        ContactAttachment: [],
+        ClientChangeLog: [],
+        AdminActivityLog: [],
+    }
+    for message_id in range(first_id, first_id + size):
+        # Squaring skews creation dates towards the recent end of the range.
+        created_at = now - timedelta(seconds=int(span * rng.random() ** 2))
+        status = profile.status or _pick_status(rng, now - created_at)
+        is_deleted = rng.random() < profile.deleted_ratio
+        expires_at = created_at + ttl
+        # Most expired grants have been swept already; a few are still waiting.
+        access_enabled = expires_at > now or rng.random() < 0.05
+        full_name = rng.choice(pool.names)
+        ready = status == ContactMessage.STATUS_READY
+
+        rows[ContactMessage].append((
+            message_id,
+            full_name,
+            rng.choice(pool.phones),
+            f'{rng.choice(pool.user_names)}.{message_id}@{rng.choice(pool.domains)}',
+            rng.choices(companies, company_weights)[0],
+            rng.choice(pool.companies) if rng.random() < 0.6 else '',
+            rng.choice(pool.paragraphs),
+            rng.choice(pool.sentences) if ready and rng.random() < 0.3 else '',
+            rng.choice(pool.paragraphs) if ready and rng.random() < 0.5 else '',
+            created_at,
+            status,
+            is_deleted,
+            tokens.hash_token(seed_token(message_id)),
+            access_enabled,
+            expires_at,
+        ))
+
+        if rng.random() < profile.attachment_ratio:
+            for index in range(rng.randint(1, 3)):
+                extension = rng.choice(tuple(_CONTENT_TYPES))
+                rows[ContactAttachment].append((
+                    message_id,
+                    f'seed/{message_id}-{index}.{extension}',
+                    f'{rng.choice(pool.words)}.{extension}',
+                    _CONTENT_TYPES[extension],
+                    rng.randint(20_000, 5_000_000),
+                    created_at,
+                    '',
+                    # There is no blob behind a seeded attachment to preview.
+                    ContactAttachment.PREVIEW_UNSUPPORTED,
+                ))
+
+        if rng.random() < profile.client_edit_ratio:
+            changed_at = created_at
+            for _ in range(rng.randint(1, 4)):
+                changed_at = min(now, changed_at + timedelta(minutes=rng.randint(1, 4320)))
+                field = rng.choice(_EDITABLE_FIELDS)
+                rows[ClientChangeLog].append((
+                    message_id,
+                    field,
+                    _edit_value(rng, pool, field),
+                    _edit_value(rng, pool, field),
+                    changed_at,
+                    rng.random() < 0.05,
+                ))
+
+        if status != ContactMessage.STATUS_NEW:
+            rows[AdminActivityLog].append((
+                message_id,
+                AdminActivityLog.ACTION_STATUS_CHANGE,
+                f'Status updated to {status}',
+                min(now, created_at + timedelta(hours=rng.randint(1, 96))),
+            ))
+        if is_deleted:
+            rows[AdminActivityLog].append((
+                message_id,
+                AdminActivityLog.ACTION_DELETE,
+                'Moved to trash',
+                min(now, created_at + timedelta(days=rng.randint(1, 30))),
+            ))
+    return rows
+
+
+def write_chunk(rows: dict[type[models.Model], list[tuple]], *, copy: bool) -> ChunkResult:
+    write = _copy_rows if copy else _insert_rows
+    with transaction.atomic(), connection.cursor() as cursor:
+        for model, columns in (
+            (ContactMessage, _MESSAGE_COLUMNS),
+            (ContactAttachment, _ATTACHMENT_COLUMNS),
+            (ClientChangeLog, _CLIENT_LOG_COLUMNS),
+            (AdminActivityLog, _ACTIVITY_COLUMNS),
+        ):
+            if rows[model]:
+                write(cursor, model, columns, rows[model])
+    return ChunkResult(
+        messages=len(rows[ContactMessage]),
+        attachments=len(rows[ContactAttachment]),
+        client_logs=len(rows[ClientChangeLog]),
+        activity_logs=len(rows[AdminActivityLog]),
+    )
+
+
+def _seed_chunk_task(task: tuple) -> ChunkResult:
+    first_id, size, profile, random_seed, now, copy = task
+    return write_chunk(build_chunk(first_id, size, profile, random_seed, now), copy=copy)
+
+
+def _pick_status(rng: random.Random, age: timedelta) -> str:
+    # Fresh requests are mostly untouched; old ones are mostly closed.
+    if age < timedelta(days=3):
+        weights = (70, 25, 5)
+    elif age < timedelta(days=30):
+        weights = (20, 40, 40)
+    else:
+        weights = (5, 15, 80)
+    return rng.choices(
+        (ContactMessage.STATUS_NEW, ContactMessage.STATUS_IN_PROGRESS, ContactMessage.STATUS_READY),
+        weights,
+    )[0]
+
+
+def _edit_value(rng: random.Random, pool: _Pools, field: str) -> str:
+    if field == ClientChangeLog.FIELD_PHONE:
+        return rng.choice(pool.phones)
+    if field == ClientChangeLog.FIELD_EMAIL:
+        return f'{rng.choice(pool.user_names)}@{rng.choice(pool.domains)}'
+    if field == ClientChangeLog.FIELD_MESSAGE:
+        return rng.choice(pool.paragraphs)
+    if field == ClientChangeLog.FIELD_COMPANY_NAME:
+        return rng.choice(pool.companies)
+    return rng.choice(pool.names)
+
+
+class _Pools:
+    """Faker output drawn once per chunk; rows then sample from it, which is far cheaper."""
+
+    def __init__(self, fake, size: int) -> None:
+        self.names = [fake.name()[:200] for _ in range(size)]
+        self.user_names = [fake.user_name() for _ in range(size)]
+        self.domains = list({fake.free_email_domain() for _ in range(20)})
+        self.phones = [fake.phone_number()[:20] for _ in range(size)]
+        self.companies = [fake.company()[:150] for _ in range(size)]
+        self.paragraphs = [fake.paragraph(nb_sentences=5) for _ in range(size)]
+        self.sentences = [fake.sentence() for _ in range(size)]
+        self.words = [fake.word() for _ in range(size)]
+
+
+def _table_and_columns(model: type[models.Model], columns: Sequence[str]) -> tuple[str, str]:
+    quote = connection.ops.quote_name
+    names = ', '.join(quote(model._meta.get_field(column).column) for column in columns)
+    return quote(model._meta.db_table), names
+
+
+def _insert_rows(cursor, model: type[models.Model], columns: Sequence[str], rows: list[tuple]) -> None:
+    table, names = _table_and_columns(model, columns)
+    fields = [model._meta.get_field(column) for column in columns]
+    prepared = [
+        tuple(field.get_db_prep_save(value, connection) for field, value in zip(fields, row))
+        for row in rows
+    ]
+    # Stay under the backend's bound-parameter limit (65535 on PostgreSQL).
+    per_statement = max(1, min(connection.ops.bulk_batch_size(fields, prepared), 65535 // len(columns)))
+    placeholder = '(' + ', '.join(['%s'] * len(columns)) + ')'
+    for start in range(0, len(prepared), per_statement):
+        batch = prepared[start:start + per_statement]
+        cursor.execute(
+            f'INSERT INTO {table} ({names}) VALUES {", ".join([placeholder] * len(batch))}',
+            [value for row in batch for value in row],
+        )
+
+
+def _copy_rows(cursor, model: type[models.Model], columns: Sequence[str], rows: Iterable[tuple]) -> None:
+    table, names = _table_and_columns(model, columns)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([_copy_value(value) for value in row])
+    buffer.seek(0)
+    sql = f"COPY {table} ({names}) FROM STDIN WITH (FORMAT csv, NULL '\\N')"
+    raw = cursor.cursor
+    if hasattr(raw, 'copy_expert'):  # psycopg2
+        raw.copy_expert(sql, buffer)
+    else:  # psycopg 3
+        with raw.copy(sql) as copy:
+            copy.write(buffer.getvalue())
+
+
+def _copy_value(value):
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import logging
+import posixpath
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Iterable, Iterator
+
+from django.core.files.storage import Storage
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from ..models import ArchivedAttachment, ContactAttachment
+
+logger = logging.getLogger(__name__)
+
+ATTACHMENTS_ROOT = 'attachments'
+
+
+def attachment_storage() -> Storage:
+    return ContactAttachment._meta.get_field('file').storage
+
+
+def referenced_file_names(attachments: QuerySet[ContactAttachment]) -> list[str]:
+    """Return every stored name (blob and thumbnail) used by ``attachments``."""
+
+    names: list[str] = []
+    for file_name, thumbnail_name in attachments.values_list('file', 'thumbnail'):
+        names.extend(name for name in (file_name, thumbnail_name) if name)
+    return names
+
+
+def delete_files(names: Iterable[str]) -> int:
+    storage = attachment_storage()
+    deleted = 0
+    for name in names:
+        try:
+            storage.delete(name)
+        except OSError:
+            logger.warning('Could not remove attachment file %s', name, exc_info=True)
+        else:
+            deleted += 1
+    return deleted
+
+
+def iter_stored_files(root: str = ATTACHMENTS_ROOT) -> Iterator[str]:
+    """Walk ``root`` depth-first, yielding file names without materialising the tree."""
+
+    storage = attachment_storage()
+    pending = [root]
+    while pending:
+        directory = pending.pop()
+        try:
+            subdirs, files = storage.listdir(directory)
+        except FileNotFoundError:
+            continue
+        for file_name in files:
+            yield posixpath.join(directory, file_name)
+        pending.extend(posixpath.join(directory, subdir) for subdir in sorted(subdirs, reverse=True))
+
+
+def iter_orphaned_files(
+    *,
+    batch_size: int = 500,
+    min_age: timedelta = timedelta(hours=24),
+) -> Iterator[str]:
+    """Yield stored files that no ``ContactAttachment`` or ``ArchivedAttachment`` row references.
+
+    Names are checked against the database one batch at a time. Files younger
+    than ``min_age`` are skipped: uploads are written to storage before their
+    rows are committed, so a fresh file may simply not be visible yet.
+    """
+
+    storage = attachment_storage()
+    cutoff = timezone.now() - min_age
+    names = iter_stored_files()
+    while True:
+        batch = list(islice(names, batch_size))
+        if not batch:
+            return
+        referenced = set(
+            ContactAttachment.objects.filter(file__in=batch).values_list('file', flat=True)
+        )
+        referenced.update(
+            ContactAttachment.objects.filter(thumbnail__in=batch).values_list('thumbnail', flat=True)
+        )
+        # Archived requests keep their blobs in place; only the metadata moved.
+        referenced.update(
+            ArchivedAttachment.objects.filter(file__in=batch).values_list('file', flat=True)
+        )
+        referenced.update(
+            ArchivedAttachment.objects.filter(thumbnail__in=batch).values_list('thumbnail', flat=True)
+        )
+        for name in batch:
+            if name in referenced:
+                continue
+            if _modified_at(storage, name) > cutoff:
+                continue
+            yield name
+
+
+def _modified_at(storage: Storage, name: str) -> datetime:
+    try:
+        modified = storage.get_modified_time(name)
+    except (NotImplementedError, OSError):
+        # Unknown age: treat as fresh so it is never removed by mistake.
+        return timezone.now()
+    if timezone.is_naive(modified):
+        modified = timezone.make_aware(modified)
+    return modified
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import io
+import logging
+import posixpath
+import zipfile
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from django.utils import timezone
+
+from ..models import ContactAttachment, ContactMessage
+
+logger = logging.getLogger(__name__)
+
+# Formats that are already compressed; deflating them again only burns CPU.
+STORED_EXTENSIONS = {
+    '.pdf', '.png', '.jpg', '.jpeg', '.gif', '.webp', '.avif', '.heic',
+    '.zip', '.gz', '.7z', '.rar', '.docx', '.xlsx', '.pptx', '.odt', '.mp4', '.mp3',
+}
+CHUNK_SIZE = 64 * 1024
+
+
+class _StreamBuffer(io.RawIOBase):
+    """Write-only sink that hands out whatever zipfile wrote since the last drain."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_attachments_zip(messages: Iterable[ContactMessage]) -> Iterator[bytes]:
+    """Yield a ZIP archive of all attachments, one ``request_<id>/`` folder per message.
+
+    The archive is produced incrementally on an unseekable sink (sizes and
+    CRCs go into data descriptors), so memory use is bounded by one chunk
+    regardless of how many or how large the attachments are.
+    """
+
+    sink = _StreamBuffer()
+    with zipfile.ZipFile(sink, mode='w', allowZip64=True) as archive:
+        for message in messages:
+            used_names: set[str] = set()
+            for attachment in message.attachments.all():
+                arcname = _unique_name(
+                    posixpath.join(f'request_{message.id}', _display_name(attachment)),
+                    used_names,
+                )
+                try:
+                    source = attachment.file.open('rb')
+                except OSError:
+                    logger.warning('Attachment %s is missing from storage', attachment.pk)
+                    continue
+                with source, archive.open(_zip_info(attachment, arcname), mode='w') as target:
+                    for chunk in source.chunks(CHUNK_SIZE):
+                        target.write(chunk)
+                        data = sink.drain()
+                        if data:
+                            yield data
+                data = sink.drain()
+                if data:
+                    yield data
+    yield sink.drain()
+
+
+def _zip_info(attachment: ContactAttachment, arcname: str) -> zipfile.ZipInfo:
+    uploaded_at = timezone.localtime(attachment.uploaded_at) if attachment.uploaded_at else timezone.localtime()
+    info = zipfile.ZipInfo(arcname, date_time=uploaded_at.timetuple()[:6])
+    extension = Path(arcname).suffix.lower()
+    info.compress_type = zipfile.ZIP_STORED if extension in STORED_EXTENSIONS else zipfile.ZIP_DEFLATED
+    # A size hint lets zipfile decide on ZIP64 headers up front.
+    info.file_size = attachment.size or 0
+    return info
+
+
+def _display_name(attachment: ContactAttachment) -> str:
+    name = attachment.original_name or posixpath.basename(attachment.file.name)
+    name = name.replace('\\', '/').rsplit('/', 1)[-1].strip()
+    return name or f'attachment_{attachment.pk}'
+
+
+def _unique_name(candidate: str, used: set[str]) -> str:
+    stem, extension = posixpath.splitext(candidate)
+    name = candidate
+    counter = 2
+    while name in used:
+        name = f'{stem} ({counter}){extension}'
+        counter += 1
+    used.add(name)
+    return name
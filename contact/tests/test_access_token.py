@@ -1,12 +1,21 @@
 from __future__ import annotations
 
 from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
 
-from django.test import TestCase
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 
+from contact import tokens
 from contact.models import ContactMessage
+from contact.services import messages as message_service
+from contact.views import helpers
 
 
 class AccessTokenTests(TestCase):
@@ -72,3 +81,131 @@ class AccessTokenTests(TestCase):
         self.assertEqual(response.status_code, 400)
         errors = response.json()['errors']
         self.assertIn('access_token', errors)
+
+    def _restore_access(self) -> None:
+        response = self.client.post(
+            reverse('contact:restore_access'),
+            {'request_id': str(self.message.id), 'access_token': self.token},
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_session_grant_is_revoked_when_message_is_deleted(self) -> None:
+        self._restore_access()
+        grants = self.client.session[helpers.USER_MESSAGE_GRANTS_KEY]
+        self.assertIn(str(self.message.id), grants)
+        detail_url = reverse('contact:user_message_detail', args=[self.message.id])
+        self.assertEqual(self.client.get(detail_url).status_code, 200)
+
+        message_service.delete_messages([self.message.id])
+        self.assertEqual(self.client.get(detail_url).status_code, 404)
+        self.assertNotIn(self.message.id, self.client.session.get('user_message_ids', []))
+
+    def test_expired_grant_is_rechecked_against_database(self) -> None:
+        self._restore_access()
+        session = self.client.session
+        grant = session[helpers.USER_MESSAGE_GRANTS_KEY][str(self.message.id)]
+        grant[0] = (timezone.now() - timedelta(minutes=1)).timestamp()
+        session.save()
+        ContactMessage.objects.filter(pk=self.message.pk).update(
+            access_token_expires_at=timezone.now() - timedelta(minutes=1)
+        )
+
+        detail_url = reverse('contact:user_message_detail', args=[self.message.id])
+        self.assertEqual(self.client.get(detail_url).status_code, 404)
+        self.assertNotIn(str(self.message.id), self.client.session.get(helpers.USER_MESSAGE_GRANTS_KEY, {}))
+
+    def test_detail_loads_the_message_once_without_the_revocation_lookup(self) -> None:
+        self._restore_access()
+        detail_url = reverse('contact:user_message_detail', args=[self.message.id])
+        with patch.object(helpers.access_grants, 'revoked_at') as revoked_at:
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(self.client.get(detail_url).status_code, 200)
+        revoked_at.assert_not_called()
+        message_queries = [
+            query['sql'] for query in queries.captured_queries
+            if query['sql'].lstrip().startswith('SELECT') and 'FROM "contact_contactmessage"' in query['sql']
+        ]
+        self.assertEqual(len(message_queries), 1)
+
+    def test_sweeper_disables_expired_tokens_and_portal_still_explains_why(self) -> None:
+        fresh = ContactMessage.objects.create(
+            full_name='Fresh', phone='+48111111112', email='fresh@example.com', company='firma1', message='Hi'
+        )
+        fresh.initialise_access_token()
+        fresh.save()
+        ContactMessage.objects.filter(pk=self.message.pk).update(
+            access_token_expires_at=timezone.now() - timedelta(minutes=1)
+        )
+
+        call_command('sweep_expired_access', '--batch-size', '1', stdout=StringIO())
+
+        self.assertFalse(ContactMessage.objects.get(pk=self.message.pk).access_enabled)
+        self.assertTrue(ContactMessage.objects.get(pk=fresh.pk).access_enabled)
+        response = self.client.post(
+            reverse('contact:restore_access'),
+            {'request_id': str(self.message.id), 'access_token': self.token},
+        )
+        self.assertIn('access_token', response.json()['errors'])
+
+    def test_request_list_hides_expired_tokens_before_the_sweep(self) -> None:
+        self._restore_access()
+        ContactMessage.objects.filter(pk=self.message.pk).update(
+            access_token_expires_at=timezone.now() - timedelta(minutes=1)
+        )
+        response = self.client.get(reverse('contact:user_requests'))
+        self.assertNotIn(self.message.id, self.client.session.get('user_message_ids', []))
+        self.assertEqual(response.status_code, 200)
+
+
+class AccessTokenHashingTests(TestCase):
+    def setUp(self) -> None:
+        self.message = ContactMessage.objects.create(
+            full_name='Bob Brown',
+            phone='+48222222222',
+            email='bob@example.com',
+            company='firma1',
+            message='Hello',
+        )
+
+    def test_new_tokens_use_hmac(self) -> None:
+        token = self.message.initialise_access_token()
+        self.assertTrue(self.message.access_token_hash.startswith(f'{tokens.ALGORITHM}$'))
+        self.assertTrue(self.message.verify_access_token(token))
+        self.assertFalse(self.message.verify_access_token(token + 'x'))
+
+    def test_legacy_hash_is_accepted_and_upgraded(self) -> None:
+        token = 'legacy-token-' + 'a' * 32
+        ContactMessage.objects.filter(pk=self.message.pk).update(access_token_hash=make_password(token))
+        self.message.refresh_from_db()
+
+        self.assertFalse(self.message.verify_access_token('wrong-token'))
+        self.assertTrue(self.message.verify_access_token(token))
+        self.message.refresh_from_db()
+        self.assertTrue(self.message.access_token_hash.startswith(f'{tokens.ALGORITHM}$'))
+        self.assertTrue(self.message.verify_access_token(token))
+
+    def test_rotated_key_is_accepted_and_upgraded(self) -> None:
+        with override_settings(CONTACT_ACCESS_TOKEN_KEY='old-key'):
+            token = self.message.initialise_access_token()
+            old_hash = self.message.access_token_hash
+        with override_settings(CONTACT_ACCESS_TOKEN_KEY='new-key', CONTACT_ACCESS_TOKEN_KEY_FALLBACKS=['old-key']):
+            self.assertEqual(tokens.verify_token(token, old_hash), (True, True))
+        with override_settings(CONTACT_ACCESS_TOKEN_KEY='new-key', CONTACT_ACCESS_TOKEN_KEY_FALLBACKS=[]):
+            self.assertEqual(tokens.verify_token(token, old_hash), (False, False))
+
+    def test_dedicated_key_ignores_secret_key_fallbacks(self) -> None:
+        with override_settings(CONTACT_ACCESS_TOKEN_KEY='', SECRET_KEY='old-secret'):
+            token = self.message.initialise_access_token()
+            old_hash = self.message.access_token_hash
+        with override_settings(
+            CONTACT_ACCESS_TOKEN_KEY='',
+            SECRET_KEY='new-secret',
+            SECRET_KEY_FALLBACKS=['old-secret'],
+        ):
+            self.assertEqual(tokens.verify_token(token, old_hash), (True, True))
+        with override_settings(
+            CONTACT_ACCESS_TOKEN_KEY='token-key',
+            CONTACT_ACCESS_TOKEN_KEY_FALLBACKS=[],
+            SECRET_KEY_FALLBACKS=['old-secret'],
+        ):
+            self.assertEqual(tokens.verify_token(token, old_hash), (False, False))
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from contact.forms import MessageBulkActionForm
+from contact.models import AdminActivityLog, ContactMessage
+from contact.services import activity_log, audit_log
+
+
+class ActivityLogBufferTests(TestCase):
+    def setUp(self) -> None:
+        self.messages = [
+            ContactMessage.objects.create(
+                full_name=f'Client {index}',
+                phone='+48123123123',
+                email=f'client{index}@example.com',
+                company='firma1',
+                message='Hello',
+            )
+            for index in range(3)
+        ]
+
+    def test_entries_are_written_in_one_batch_when_scope_ends(self) -> None:
+        ids = [message.id for message in self.messages]
+        with self.assertNumQueries(1), self.captureOnCommitCallbacks(execute=True):
+            with activity_log.buffered():
+                activity_log.log_bulk_action(AdminActivityLog.ACTION_DELETE, ids)
+                activity_log.log_action(AdminActivityLog.ACTION_EMAIL, description='Manual email')
+        self.assertEqual(AdminActivityLog.objects.count(), 4)
+
+    def test_rolled_back_work_is_not_logged(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            with activity_log.buffered():
+                try:
+                    with transaction.atomic():
+                        activity_log.log_action(AdminActivityLog.ACTION_ROLLBACK, message_id=self.messages[0].id)
+                        raise RuntimeError
+                except RuntimeError:
+                    pass
+                activity_log.log_action(AdminActivityLog.ACTION_EMAIL)
+        self.assertEqual(
+            list(AdminActivityLog.objects.values_list('action', flat=True)),
+            [AdminActivityLog.ACTION_EMAIL],
+        )
+
+    @override_settings(COMPANY_NOTIFICATION_RECIPIENTS={'default': []}, SMTP_USER='')
+    def test_bulk_admin_action_logs_every_message(self) -> None:
+        session = self.client.session
+        session['logged_in'] = True
+        session.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse('contact:panel'),
+                {
+                    'form_name': 'bulk',
+                    'action': MessageBulkActionForm.ACTION_MARK_READY,
+                    'selected': [str(message.id) for message in self.messages],
+                },
+            )
+        self.assertEqual(
+            AdminActivityLog.objects.filter(action=AdminActivityLog.ACTION_STATUS_CHANGE).count(),
+            3,
+        )
+
+
+class ActivityLogViewerTests(TestCase):
+    def setUp(self) -> None:
+        self.message = ContactMessage.objects.create(
+            full_name='Client',
+            phone='+48123123123',
+            email='client@example.com',
+            company='firma1',
+            message='Hello',
+        )
+        now = timezone.now()
+        self.entries = AdminActivityLog.objects.bulk_create([
+            AdminActivityLog(action=AdminActivityLog.ACTION_DELETE, message=self.message, description='a'),
+            AdminActivityLog(action=AdminActivityLog.ACTION_EMAIL, description='b'),
+            AdminActivityLog(action=AdminActivityLog.ACTION_DELETE, message=self.message, description='c'),
+            AdminActivityLog(action=AdminActivityLog.ACTION_RESTORE, message=self.message, description='d'),
+            AdminActivityLog(action=AdminActivityLog.ACTION_DELETE, description='e'),
+        ])
+        # Two entries share a timestamp so the id tie-breaker is exercised.
+        stamps = [now - timedelta(days=10), now - timedelta(hours=3), now - timedelta(hours=3), now - timedelta(hours=2), now]
+        for entry, stamp in zip(self.entries, stamps):
+            AdminActivityLog.objects.filter(pk=entry.pk).update(created_at=stamp)
+        session = self.client.session
+        session['logged_in'] = True
+        session.save()
+
+    def test_keyset_pages_cover_every_entry_once(self) -> None:
+        seen = []
+        cursor = None
+        while True:
+            entries, cursor = audit_log.page(audit_log.filtered_logs(), cursor=cursor, limit=2)
+            seen.extend(entry.description for entry in entries)
+            if cursor is None:
+                break
+        self.assertEqual(seen, ['e', 'd', 'c', 'b', 'a'])
+
+    def test_api_filters_by_action_message_and_date(self) -> None:
+        url = reverse('contact:activity_log_api')
+        response = self.client.get(url, {'action': AdminActivityLog.ACTION_DELETE, 'message': self.message.id})
+        self.assertEqual([row['description'] for row in response.json()['results']], ['c', 'a'])
+
+        today = timezone.localdate()
+        response = self.client.get(url, {'date_from': (today - timedelta(days=1)).isoformat(), 'limit': 2})
+        payload = response.json()
+        self.assertEqual(len(payload['results']), 2)
+        self.assertIsNotNone(payload['next_cursor'])
+
+    def test_api_rejects_bad_input_and_anonymous_users(self) -> None:
+        url = reverse('contact:activity_log_api')
+        self.assertEqual(self.client.get(url, {'cursor': 'not-a-cursor'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'date_from': '2024-02-02', 'date_to': '2024-02-01'}).status_code, 400)
+        self.client.session.flush()
+        self.client.cookies.clear()
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+    def test_csv_export_streams_filtered_rows(self) -> None:
+        response = self.client.get(
+            reverse('contact:activity_log_export'),
+            {'action': AdminActivityLog.ACTION_DELETE, 'lang': 'en'},
+        )
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], ','.join(audit_log.CSV_HEADER))
+        self.assertEqual(len(lines), 4)
+        self.assertIn('Moved to trash', lines[1])
+
+    def test_html_view_links_to_older_entries(self) -> None:
+        response = self.client.get(reverse('contact:activity_log'), {'lang': 'pl'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['entries']), 5)
+        self.assertIsNone(response.context['next_cursor'])
+        self.assertContains(response, 'Przeniesienie do kosza')
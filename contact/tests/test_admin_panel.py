@@ -1,10 +1,18 @@
 from __future__ import annotations
 
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.messages import get_messages
+from django.core.management import call_command
 from django.test import TestCase, override_settings
 from django.urls import reverse
+from django.utils import timezone
 
 from contact.forms import MessageBulkActionForm, TrashActionForm
-from contact.models import ContactMessage
+from contact.models import AdminActivityLog, ClientChangeLog, ContactMessage, LoginAttempt, PendingPurge
+from contact.services import login_lockout
+from contact.services import messages as message_service
 
 
 @override_settings(COMPANY_NOTIFICATION_RECIPIENTS={'default': []}, SMTP_USER='')
@@ -64,3 +72,182 @@ class AdminPanelTests(TestCase):
         self.assertEqual(restore_response.status_code, 302)
         self.message.refresh_from_db()
         self.assertFalse(self.message.is_deleted)
+
+    def _client_edits(self) -> list[ClientChangeLog]:
+        edits = [
+            ('phone', '+48123123123', '+48111111111'),
+            ('email', 'jane@example.com', 'new@example.com'),
+            ('phone', '+48111111111', '+48222222222'),
+        ]
+        logs = []
+        for field, previous, new in edits:
+            setattr(self.message, field, new)
+            logs.append(ClientChangeLog.objects.create(
+                message=self.message, field=field, previous_value=previous, new_value=new
+            ))
+        self.message.save()
+        return logs
+
+    def test_bulk_rollback_restores_oldest_values_in_one_request(self) -> None:
+        logs = self._client_edits()
+        url = reverse('contact:rollback_client_changes', args=[self.message.id])
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(url, {'log_ids': [log.id for log in logs]})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['phone'], '+48123123123')
+        self.message.refresh_from_db()
+        self.assertEqual((self.message.phone, self.message.email), ('+48123123123', 'jane@example.com'))
+        self.assertFalse(ClientChangeLog.objects.filter(is_reverted=False).exists())
+        self.assertEqual(AdminActivityLog.objects.get().description, 'Rolled back fields phone, email')
+
+    def test_bulk_rollback_since_only_touches_newer_edits(self) -> None:
+        logs = self._client_edits()
+        ClientChangeLog.objects.filter(pk=logs[0].pk).update(changed_at=timezone.now() - timedelta(hours=2))
+        url = reverse('contact:rollback_client_changes', args=[self.message.id])
+        since = (timezone.now() - timedelta(hours=1)).isoformat()
+        self.assertEqual(self.client.post(url, {'since': since}).status_code, 200)
+
+        self.message.refresh_from_db()
+        self.assertEqual((self.message.phone, self.message.email), ('+48111111111', 'jane@example.com'))
+        self.assertFalse(ClientChangeLog.objects.get(pk=logs[0].pk).is_reverted)
+
+        self.assertEqual(self.client.post(url, {'since': since}).status_code, 404)
+        self.assertEqual(self.client.post(url, {}).status_code, 400)
+        response = self.client.post(url, {'since': '2026-13-45T10:00'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'errors': {'since': ['invalid']}})
+
+
+@override_settings(COMPANY_NOTIFICATION_RECIPIENTS={'default': []}, SMTP_USER='')
+class TrashPurgeTests(TestCase):
+    def setUp(self) -> None:
+        self.trashed = [self._message(index, is_deleted=True) for index in range(5)]
+        self.kept = self._message(99, is_deleted=False)
+        for message in self.trashed + [self.kept]:
+            AdminActivityLog.objects.create(message=message, action=AdminActivityLog.ACTION_DELETE)
+            ClientChangeLog.objects.create(message=message, field='phone', previous_value='1', new_value='2')
+        session = self.client.session
+        session['logged_in'] = True
+        session.save()
+
+    def _message(self, index: int, *, is_deleted: bool) -> ContactMessage:
+        return ContactMessage.objects.create(
+            full_name=f'Client {index}',
+            phone='+48123123123',
+            email=f'client{index}@example.com',
+            company='firma1',
+            message='Hello',
+            is_deleted=is_deleted,
+        )
+
+    def test_purge_deletes_children_and_parents_in_chunks(self) -> None:
+        # Per chunk: savepoint, ids, file names, parent SELECT, three child DELETEs, parent DELETE, release.
+        with self.assertNumQueries(3 * 9 + 3):
+            deleted = message_service.purge_messages(batch_size=2)
+
+        self.assertEqual(deleted, 5)
+        self.assertEqual(list(ContactMessage.objects.values_list('id', flat=True)), [self.kept.id])
+        self.assertEqual(ClientChangeLog.objects.count(), 1)
+        self.assertEqual(AdminActivityLog.objects.count(), 1)
+
+    @override_settings(PURGE_SYNC_LIMIT=2, BACKGROUND_TASKS_MODE='off')
+    def test_large_trash_is_emptied_in_background_and_resumable(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse('contact:panel') + '?lang=en',
+                {'form_name': 'trash', 'action': TrashActionForm.ACTION_EMPTY},
+            )
+        self.assertIn(
+            'The trash is being emptied in the background.',
+            [str(message) for message in get_messages(response.wsgi_request)],
+        )
+        self.assertEqual(ContactMessage.objects.filter(is_deleted=True).count(), 5)
+        self.assertTrue(AdminActivityLog.objects.filter(action=AdminActivityLog.ACTION_PURGE).exists())
+
+        self.assertEqual(PendingPurge.objects.count(), 1)
+
+        call_command('purge_trash', '--batch-size', '2', stdout=StringIO())
+        self.assertFalse(ContactMessage.objects.filter(is_deleted=True).exists())
+        self.assertFalse(PendingPurge.objects.exists())
+
+    @override_settings(PURGE_SYNC_LIMIT=2, BACKGROUND_TASKS_MODE='off')
+    def test_resumed_selective_purge_spares_unselected_trash(self) -> None:
+        selected = [message.id for message in self.trashed[:3]]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse('contact:panel') + '?lang=en',
+                {'form_name': 'trash', 'action': TrashActionForm.ACTION_DELETE, 'selected': selected},
+            )
+        self.assertEqual(ContactMessage.objects.filter(is_deleted=True).count(), 5)
+
+        out = StringIO()
+        call_command('purge_trash', '--dry-run', stdout=out)
+        self.assertIn('3 trashed request(s)', out.getvalue())
+        call_command('purge_trash', stdout=StringIO())
+        self.assertEqual(
+            set(ContactMessage.objects.filter(is_deleted=True).values_list('id', flat=True)),
+            {message.id for message in self.trashed[3:]},
+        )
+
+        call_command('purge_trash', '--all', stdout=StringIO())
+        self.assertFalse(ContactMessage.objects.filter(is_deleted=True).exists())
+
+    @override_settings(PURGE_SYNC_LIMIT=2, BACKGROUND_TASKS_MODE='sync')
+    def test_background_purge_spares_messages_trashed_later(self) -> None:
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.assertTrue(message_service.schedule_purge())
+        late = self._message(100, is_deleted=True)
+        for callback in callbacks:
+            callback()
+
+        self.assertEqual(
+            set(ContactMessage.objects.values_list('id', flat=True)),
+            {self.kept.id, late.id},
+        )
+        self.assertFalse(PendingPurge.objects.exists())
+
+
+@override_settings(ADMIN_PASSWORD='secret', ADMIN_LOGIN_MAX_ATTEMPTS=3, ADMIN_LOGIN_LOCKOUT_SECONDS=300)
+class AdminLoginLockoutTests(TestCase):
+    def test_lockout_is_stored_and_cleared_after_expiry(self) -> None:
+        url = reverse('contact:login')
+        for _ in range(3):
+            response = self.client.post(url, {'password': 'wrong'})
+        self.assertTrue(response.context['blocked'])
+        attempt = LoginAttempt.objects.get()
+        self.assertEqual(attempt.failures, 3)
+
+        # The correct password is rejected while blocked.
+        response = self.client.post(url, {'password': 'secret'})
+        self.assertTrue(response.context['blocked'])
+        self.assertNotIn('logged_in', self.client.session)
+
+        LoginAttempt.objects.update(blocked_until=timezone.now() - timedelta(seconds=1))
+        response = self.client.post(url, {'password': 'secret'})
+        self.assertRedirects(response, reverse('contact:panel'), fetch_redirect_response=False)
+        self.assertFalse(LoginAttempt.objects.exists())
+
+    def test_prune_evicts_least_recently_seen_entries(self) -> None:
+        now = timezone.now()
+        with override_settings(ADMIN_LOGIN_LOCKOUT_MAX_ENTRIES=2, ADMIN_LOGIN_PRUNE_EVERY=1):
+            for offset, client in enumerate(['10.0.0.1', '10.0.0.2', '10.0.0.3']):
+                login_lockout.register_failure(client, now=now + timedelta(seconds=offset))
+
+        self.assertEqual(LoginAttempt.objects.count(), 2)
+        self.assertEqual(login_lockout.get_state('10.0.0.1', now=now).failures, 0)
+        self.assertEqual(login_lockout.get_state('10.0.0.3', now=now).failures, 1)
+
+    @override_settings(ADMIN_LOGIN_LOCKOUT_MAX_ENTRIES=2, ADMIN_LOGIN_PRUNE_EVERY=0)
+    def test_new_clients_do_not_prune_inline_when_left_to_the_command(self) -> None:
+        now = timezone.now()
+        for offset, client in enumerate(['10.0.0.1', '10.0.0.2']):
+            login_lockout.register_failure(client, now=now + timedelta(seconds=offset))
+        # get_or_create and the update, each with its savepoints; nothing walks the table.
+        with self.assertNumQueries(7):
+            login_lockout.register_failure('10.0.0.3', now=now + timedelta(seconds=2))
+        self.assertEqual(LoginAttempt.objects.count(), 3)
+
+        call_command('prune_login_attempts', stdout=StringIO())
+        self.assertEqual(LoginAttempt.objects.count(), 2)
+        self.assertEqual(login_lockout.get_state('10.0.0.1', now=now).failures, 0)
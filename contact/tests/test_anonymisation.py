@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import gzip
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from contact.models import (
+    ArchivedAttachment,
+    ArchivedMessage,
+    ClientChangeLog,
+    ContactAttachment,
+    ContactMessage,
+)
+from contact.services import anonymisation, log_archive
+
+from .test_attachments import TemporaryMediaMixin
+
+
+@override_settings(BACKGROUND_TASKS_MODE='sync')
+class AnonymisationTests(TemporaryMediaMixin, TestCase):
+    def setUp(self) -> None:
+        self.use_temporary_media()
+        old = timezone.now() - timedelta(days=800)
+        self.old = [
+            ContactMessage.objects.create(
+                full_name=f'Old {index}',
+                phone='+48123123123',
+                email=f'old{index}@example.com',
+                company='firma2',
+                message='Personal details',
+                created_at=old,
+            )
+            for index in range(3)
+        ]
+        self.recent = ContactMessage.objects.create(
+            full_name='Recent',
+            phone='+48123123123',
+            email='recent@example.com',
+            company='firma1',
+            message='Keep me',
+        )
+        self.attachment = ContactAttachment(
+            message=self.old[0], original_name='id.txt', content_type='text/plain', size=4
+        )
+        self.attachment.file.save('id.txt', ContentFile(b'scan'), save=True)
+        ClientChangeLog.objects.create(message=self.old[0], field='phone', previous_value='111', new_value='222')
+        ClientChangeLog.objects.create(message=self.recent, field='phone', previous_value='333', new_value='444')
+
+        self.archived = ArchivedMessage.objects.create(
+            id=9000,
+            full_name='Archived',
+            phone='+48111',
+            email='archived@example.com',
+            company='firma1',
+            message='Archived details',
+            status=ContactMessage.STATUS_READY,
+            created_at=old,
+            client_logs=[{'field': 'email', 'previous_value': 'a@b.c', 'new_value': 'd@e.f'}],
+        )
+        ArchivedAttachment.objects.create(
+            message=self.archived, file='attachments/old.pdf', original_name='old.pdf', size=1, uploaded_at=old
+        )
+
+    def test_command_scrubs_old_requests_in_batches(self) -> None:
+        out = StringIO()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('anonymise_old_requests', '--older-than-days', '730', '--batch-size', '2', stdout=out)
+
+        for message in ContactMessage.objects.filter(pk__in=[m.pk for m in self.old]):
+            self.assertEqual(message.full_name, anonymisation.ANONYMISED_NAME)
+            self.assertEqual(message.email, anonymisation.ANONYMISED_EMAIL)
+            self.assertEqual((message.phone, message.message, message.access_enabled), ('', '', False))
+            self.assertIsNotNone(message.anonymised_at)
+        self.assertEqual(
+            list(ClientChangeLog.objects.filter(message=self.old[0]).values_list('previous_value', 'new_value')),
+            [('', '')],
+        )
+        self.assertFalse(ContactAttachment.objects.exists())
+        self.assertEqual(self.stored_files(), [])
+
+        self.recent.refresh_from_db()
+        self.assertEqual(self.recent.email, 'recent@example.com')
+        self.assertIsNone(self.recent.anonymised_at)
+        self.assertTrue(ClientChangeLog.objects.filter(message=self.recent, new_value='444').exists())
+
+        self.archived.refresh_from_db()
+        self.assertEqual(self.archived.email, anonymisation.ANONYMISED_EMAIL)
+        self.assertEqual(self.archived.client_logs, [])
+        self.assertFalse(self.archived.attachments.exists())
+        self.assertIn('Anonymised 3 live request(s)', out.getvalue())
+        self.assertIn('Anonymised 1 archive request(s)', out.getvalue())
+
+    def test_archived_client_changes_keep_no_personal_data(self) -> None:
+        archive_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, archive_dir, ignore_errors=True)
+        ClientChangeLog.objects.filter(message=self.old[0]).update(
+            previous_value='old0@example.com', new_value='Jan Kowalski', changed_at=timezone.now() - timedelta(days=400)
+        )
+
+        with override_settings(LOG_ARCHIVE_DIR=archive_dir):
+            call_command('archive_activity_logs', '--older-than-days', '180', stdout=StringIO())
+            with self.captureOnCommitCallbacks(execute=True):
+                call_command('anonymise_old_requests', '--older-than-days', '730', stdout=StringIO())
+            archived = list(log_archive.iter_archived(log_archive.TABLES['client'], message_id=self.old[0].id))
+
+        self.assertEqual([(row['previous_value'], row['new_value']) for row in archived], [('', '')])
+        for path in archive_dir.glob('*.jsonl.gz'):
+            with gzip.open(path, 'rt', encoding='utf-8') as handle:
+                content = handle.read()
+            self.assertNotIn('old0@example.com', content)
+            self.assertNotIn('Jan Kowalski', content)
+
+    def test_interrupted_run_resumes_from_checkpoint(self) -> None:
+        cutoff = timezone.now() - timedelta(days=730)
+        table = anonymisation.TABLES['live']
+        batches = anonymisation.anonymise_requests(table, cutoff, batch_size=2)
+        first = next(batches)
+        batches.close()
+
+        self.assertEqual(first, [self.old[0].id, self.old[1].id])
+        self.assertEqual(list(anonymisation.pending(table, cutoff).values_list('id', flat=True)), [self.old[2].id])
+        with self.assertNumQueries(7 + 3):
+            resumed = list(anonymisation.anonymise_requests(table, cutoff, batch_size=2))
+        self.assertEqual(resumed, [[self.old[2].id]])
@@ -0,0 +1,310 @@
+from __future__ import annotations
+
+import shutil
+import tempfile
+import zipfile
+from io import BytesIO, StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import DatabaseError, connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from PIL import Image
+
+from contact.models import ContactAttachment, ContactMessage
+from contact.services import messages as message_service
+from contact.services.previews import generate_preview
+from contact.views.helpers import serialise_attachment
+
+
+class TemporaryMediaMixin:
+    def use_temporary_media(self) -> None:
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        storage_override = override_settings(
+            STORAGES={
+                'default': {
+                    'BACKEND': 'django.core.files.storage.FileSystemStorage',
+                    'OPTIONS': {'location': self.media_root},
+                },
+                'staticfiles': {
+                    'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+                },
+            },
+        )
+        storage_override.enable()
+        self.addCleanup(storage_override.disable)
+
+    def stored_files(self) -> list[str]:
+        return sorted(
+            str(path.relative_to(self.media_root))
+            for path in Path(self.media_root).rglob('*')
+            if path.is_file()
+        )
+
+
+class AttachmentDownloadTests(TemporaryMediaMixin, TestCase):
+    def setUp(self) -> None:
+        self.use_temporary_media()
+        self.message = ContactMessage.objects.create(
+            full_name='Jane Doe',
+            phone='+48123123123',
+            email='jane@example.com',
+            company='firma1',
+            company_name='JD Consulting',
+            message='Scan attached',
+        )
+        self.attachment = ContactAttachment(
+            message=self.message,
+            original_name='scan.txt',
+            content_type='text/plain',
+            size=10,
+        )
+        self.attachment.file.save('scan.txt', ContentFile(b'0123456789'), save=True)
+        self.url = reverse('contact:download_attachment', args=[self.attachment.id])
+
+    def _grant_user_access(self) -> None:
+        session = self.client.session
+        session['user_message_ids'] = [self.message.id]
+        session.save()
+
+    def test_anonymous_visitor_cannot_download(self) -> None:
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 404)
+
+    def test_owner_downloads_full_file(self) -> None:
+        self._grant_user_access()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), b'0123456789')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertTrue(response.has_header('ETag'))
+
+    def test_range_and_conditional_requests(self) -> None:
+        self._grant_user_access()
+        partial = self.client.get(self.url, HTTP_RANGE='bytes=2-5')
+        self.assertEqual(partial.status_code, 206)
+        self.assertEqual(partial['Content-Range'], 'bytes 2-5/10')
+        self.assertEqual(b''.join(partial.streaming_content), b'2345')
+
+        suffix = self.client.get(self.url, HTTP_RANGE='bytes=-3')
+        self.assertEqual(b''.join(suffix.streaming_content), b'789')
+
+        unsatisfiable = self.client.get(self.url, HTTP_RANGE='bytes=20-')
+        self.assertEqual(unsatisfiable.status_code, 416)
+
+        not_modified = self.client.get(self.url, HTTP_IF_NONE_MATCH=partial['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+
+    @override_settings(ATTACH_SENDFILE_BACKEND='nginx', ATTACH_SENDFILE_URL_PREFIX='/protected/')
+    def test_admin_download_is_delegated_to_proxy(self) -> None:
+        session = self.client.session
+        session['logged_in'] = True
+        session.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Accel-Redirect'], f'/protected/{self.attachment.file.name}')
+        self.assertEqual(response.content, b'')
+
+    def test_image_thumbnail_is_generated_and_cached(self) -> None:
+        buffer = BytesIO()
+        Image.new('RGB', (1200, 800), 'green').save(buffer, format='PNG')
+        image = ContactAttachment(
+            message=self.message,
+            original_name='photo.png',
+            content_type='image/png',
+            size=len(buffer.getvalue()),
+        )
+        image.file.save('photo.png', ContentFile(buffer.getvalue()), save=True)
+
+        self.assertEqual(generate_preview(image), ContactAttachment.PREVIEW_READY)
+        self.assertEqual(generate_preview(self.attachment), ContactAttachment.PREVIEW_UNSUPPORTED)
+        image.refresh_from_db()
+        self.assertTrue(image.thumbnail.name.startswith(image.file.name))
+        self.assertIsNone(serialise_attachment(self.attachment)['thumbnail_url'])
+
+        self._grant_user_access()
+        response = self.client.get(serialise_attachment(image)['thumbnail_url'])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('immutable', response['Cache-Control'])
+        self.assertIn('must-revalidate', response['Cache-Control'])
+        self.assertIn('max-age=60', response['Cache-Control'])
+        with Image.open(BytesIO(b''.join(response.streaming_content))) as thumbnail:
+            self.assertLessEqual(max(thumbnail.size), 320)
+
+        revalidated = self.client.get(
+            serialise_attachment(image)['thumbnail_url'],
+            HTTP_IF_NONE_MATCH=response['ETag'],
+        )
+        self.assertEqual(revalidated.status_code, 304)
+        self.client.logout()
+        revoked = self.client.get(
+            serialise_attachment(image)['thumbnail_url'],
+            HTTP_IF_NONE_MATCH=response['ETag'],
+        )
+        self.assertEqual(revoked.status_code, 404)
+
+
+@override_settings(ATTACH_PREVIEWS_ON_UPLOAD=False)
+class AttachmentPersistenceTests(TemporaryMediaMixin, TestCase):
+    def setUp(self) -> None:
+        self.use_temporary_media()
+
+    def _submit(self, count: int):
+        files = [
+            SimpleUploadedFile(f'doc{index}.txt', b'payload %d' % index, content_type='text/plain')
+            for index in range(count)
+        ]
+        return message_service.add_message(
+            full_name='John Doe',
+            phone='+48123123123',
+            email='john@example.com',
+            company='firma1',
+            company_name='Acme',
+            message='Files attached',
+            attachments=files,
+        )
+
+    def test_files_are_stored_and_rows_bulk_inserted(self) -> None:
+        message, _token = self._submit(3)
+        attachments = list(message.attachments.order_by('original_name'))
+        self.assertEqual([item.original_name for item in attachments], ['doc0.txt', 'doc1.txt', 'doc2.txt'])
+        self.assertEqual(self.stored_files(), sorted(item.file.name for item in attachments))
+        self.assertEqual(attachments[1].file.read(), b'payload 1')
+
+    def test_stored_files_are_removed_when_transaction_fails(self) -> None:
+        with mock.patch.object(
+            ContactAttachment.objects,
+            'bulk_create',
+            side_effect=DatabaseError('insert failed'),
+        ):
+            with self.assertRaises(DatabaseError):
+                self._submit(2)
+        self.assertEqual(self.stored_files(), [])
+        self.assertFalse(ContactMessage.objects.exists())
+
+
+class AttachmentExportTests(TemporaryMediaMixin, TestCase):
+    def setUp(self) -> None:
+        self.use_temporary_media()
+        self.message = ContactMessage.objects.create(
+            full_name='Jane Doe',
+            phone='+48123123123',
+            email='jane@example.com',
+            company='firma1',
+            company_name='JD Consulting',
+            message='Two files',
+        )
+        for name, payload in (('report.pdf', b'%PDF-1.4 data'), ('notes.txt', b'plain text ' * 50)):
+            attachment = ContactAttachment(
+                message=self.message,
+                original_name=name,
+                content_type='application/octet-stream',
+                size=len(payload),
+            )
+            attachment.file.save(name, ContentFile(payload), save=True)
+        session = self.client.session
+        session['logged_in'] = True
+        session.save()
+
+    def test_zip_export_streams_entries_per_request(self) -> None:
+        response = self.client.post(
+            reverse('contact:panel'),
+            {
+                'form_name': 'download',
+                'export': 'attachments',
+                'messages': [str(self.message.id)],
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/zip')
+
+        with zipfile.ZipFile(BytesIO(b''.join(response.streaming_content))) as archive:
+            entries = {info.filename: info for info in archive.infolist()}
+            prefix = f'request_{self.message.id}/'
+            self.assertEqual(set(entries), {prefix + 'report.pdf', prefix + 'notes.txt'})
+            self.assertEqual(entries[prefix + 'report.pdf'].compress_type, zipfile.ZIP_STORED)
+            self.assertEqual(entries[prefix + 'notes.txt'].compress_type, zipfile.ZIP_DEFLATED)
+            self.assertEqual(archive.read(prefix + 'report.pdf'), b'%PDF-1.4 data')
+
+    def test_zip_export_loads_attachments_in_one_query_per_chunk(self) -> None:
+        ids = [str(self.message.id)]
+        for index in range(3):
+            message = ContactMessage.objects.create(
+                full_name='Jane Doe',
+                phone='+48123123123',
+                email='jane@example.com',
+                company='firma1',
+                company_name='JD Consulting',
+                message=f'Extra {index}',
+            )
+            attachment = ContactAttachment(
+                message=message,
+                original_name='extra.txt',
+                content_type='text/plain',
+                size=5,
+            )
+            attachment.file.save('extra.txt', ContentFile(b'extra'), save=True)
+            ids.append(str(message.id))
+
+        response = self.client.post(
+            reverse('contact:panel'),
+            {'form_name': 'download', 'export': 'attachments', 'messages': ids},
+        )
+        with CaptureQueriesContext(connection) as queries:
+            content = b''.join(response.streaming_content)
+
+        attachment_table = ContactAttachment._meta.db_table
+        attachment_queries = [query for query in queries if attachment_table in query['sql']]
+        self.assertEqual(len(attachment_queries), 1)
+        with zipfile.ZipFile(BytesIO(content)) as archive:
+            self.assertEqual(len(archive.infolist()), 5)
+
+
+@override_settings(BACKGROUND_TASKS_MODE='sync', ATTACH_PREVIEWS_ON_UPLOAD=False)
+class OrphanedAttachmentTests(TemporaryMediaMixin, TestCase):
+    def setUp(self) -> None:
+        self.use_temporary_media()
+        self.message = ContactMessage.objects.create(
+            full_name='Jane Doe',
+            phone='+48123123123',
+            email='jane@example.com',
+            company='firma1',
+            company_name='JD Consulting',
+            message='Old request',
+            is_deleted=True,
+        )
+        self.attachment = ContactAttachment(
+            message=self.message,
+            original_name='scan.txt',
+            content_type='text/plain',
+            size=4,
+        )
+        self.attachment.file.save('scan.txt', ContentFile(b'scan'), save=True)
+
+    def test_purge_deletes_files_after_commit(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            message_service.purge_messages([self.message.id])
+        self.assertFalse(ContactAttachment.objects.exists())
+        self.assertEqual(self.stored_files(), [])
+
+    def test_collector_respects_dry_run_and_age_guard(self) -> None:
+        default_storage.save('attachments/2020/01/01/stray.txt', ContentFile(b'stray'))
+        out = StringIO()
+
+        call_command('collect_orphaned_attachments', '--min-age-hours=1', stdout=out)
+        self.assertIn('attachments/2020/01/01/stray.txt', self.stored_files())
+
+        call_command('collect_orphaned_attachments', '--min-age-hours=0', '--dry-run', stdout=out)
+        self.assertIn('orphan: attachments/2020/01/01/stray.txt', out.getvalue())
+        self.assertIn('attachments/2020/01/01/stray.txt', self.stored_files())
+
+        call_command('collect_orphaned_attachments', '--min-age-hours=0', stdout=out)
+        self.assertEqual(self.stored_files(), [self.attachment.file.name])
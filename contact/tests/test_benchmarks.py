@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from contact import benchmarks
+
+
+class BenchmarkBaselineTests(TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / 'baselines.json'
+
+    def test_compare_flags_only_slowdowns_above_the_threshold(self) -> None:
+        results = [
+            benchmarks.Result('fast', 10, 0.011, 0.010),
+            benchmarks.Result('slow', 10, 0.013, 0.012),
+            benchmarks.Result('new', 10, 0.5, 0.5),
+        ]
+        baseline = {'results': {'fast': {'median': 0.010}, 'slow': {'median': 0.010}}}
+
+        comparisons = {item.name: item for item in benchmarks.compare(results, baseline, threshold=0.25)}
+
+        self.assertFalse(comparisons['fast'].regressed)
+        self.assertTrue(comparisons['slow'].regressed)
+        self.assertAlmostEqual(comparisons['slow'].change, 0.3)
+        self.assertIsNone(comparisons['new'].change)
+        self.assertFalse(comparisons['new'].regressed)
+
+    def test_save_baseline_keeps_other_machines_and_benchmarks(self) -> None:
+        benchmarks.save_baseline(self.path, 'other', [benchmarks.Result('a', 1, 1.0, 1.0)])
+        benchmarks.save_baseline(self.path, 'here', [benchmarks.Result('a', 1, 2.0, 2.0)], commit='abc123')
+        benchmarks.save_baseline(self.path, 'here', [benchmarks.Result('b', 1, 3.0, 3.0)])
+
+        data = benchmarks.load_baselines(self.path)
+        self.assertEqual(data['other']['results']['a']['median'], 1.0)
+        self.assertEqual(set(data['here']['results']), {'a', 'b'})
+        self.assertFalse(self.path.with_name(self.path.name + '.tmp').exists())
+
+    def test_select_matches_globs(self) -> None:
+        names = [benchmark.name for benchmark in benchmarks.select(['token_*'])]
+        self.assertEqual(names, ['token_generate', 'token_verify'])
+        self.assertEqual(len(benchmarks.select()), len(benchmarks.BENCHMARKS))
+
+    def test_command_saves_a_baseline_and_fails_on_regression(self) -> None:
+        options = {
+            'current_db': True,
+            'only': ['token_*'],
+            'rounds': 1,
+            'machine': 'test-machine',
+            'baseline_file': str(self.path),
+        }
+        call_command('run_benchmarks', save_baseline=True, stdout=StringIO(), **options)
+        stored = benchmarks.load_baselines(self.path)['test-machine']['results']
+        self.assertEqual(set(stored), {'token_generate', 'token_verify'})
+
+        # A baseline far faster than anything achievable must trip the gate.
+        data = benchmarks.load_baselines(self.path)
+        for entry in data['test-machine']['results'].values():
+            entry['median'] = 1e-12
+        self.path.write_text(json.dumps(data), encoding='utf-8')
+        with self.assertRaisesMessage(CommandError, 'regressed'):
+            call_command('run_benchmarks', stdout=StringIO(), **options)
+
+        out = StringIO()
+        call_command('run_benchmarks', threshold=1e15, stdout=out, **options)
+        self.assertIn('within', out.getvalue())
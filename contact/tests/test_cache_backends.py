@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import threading
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from contact.cache_backends import TwoTierCache
+
+
+def _make_cache(name: str, **options) -> TwoTierCache:
+    return TwoTierCache(name, {'OPTIONS': {'LOCAL_TIMEOUT': 60, **options}})
+
+
+class TwoTierCacheTests(SimpleTestCase):
+    def test_hits_are_served_from_memory(self) -> None:
+        cache = _make_cache('two-tier-hits')
+        cache.set('key', {'value': 1})
+
+        with mock.patch.object(cache.shared, 'get', side_effect=AssertionError):
+            self.assertEqual(cache.get('key'), {'value': 1})
+            self.assertEqual(cache.get_many(['key']), {'key': {'value': 1}})
+        self.assertEqual(cache.stats()['hits'], 2)
+
+    def test_misses_and_foreign_writes_are_cached_locally(self) -> None:
+        cache = _make_cache('two-tier-misses')
+        self.assertIsNone(cache.get('key'))
+
+        # Written by "another process" straight into the shared tier.
+        cache.shared.set('key', 'fresh')
+        self.assertIsNone(cache.get('key'))
+        cache.delete('key')
+        self.assertIsNone(cache.get('key'))
+        cache.shared.set('key', 'fresh')
+        cache._tier.clear()
+        self.assertEqual(cache.get('key'), 'fresh')
+
+    def test_lru_evicts_oldest_entry(self) -> None:
+        cache = _make_cache('two-tier-lru', LOCAL_MAX_ENTRIES=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        stats = cache.stats()
+        self.assertEqual(stats['entries'], 2)
+        self.assertEqual(stats['evictions'], 1)
+        with mock.patch.object(cache.shared, 'get', return_value='shared') as shared_get:
+            self.assertEqual(cache.get('a'), 1)
+            self.assertEqual(cache.get('b'), 'shared')
+        shared_get.assert_called_once()
+
+    def test_incr_updates_local_copy(self) -> None:
+        cache = _make_cache('two-tier-incr')
+        cache.add('counter', 1)
+        self.assertEqual(cache.incr('counter'), 2)
+        self.assertEqual(cache.get('counter'), 2)
+
+    def test_get_or_set_fills_once_per_process(self) -> None:
+        cache = _make_cache('two-tier-fill')
+        calls = []
+        gate = threading.Event()
+
+        def compute() -> str:
+            calls.append(1)
+            gate.wait(1)
+            return 'value'
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get_or_set('key', compute)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        gate.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, ['value'] * 5)
+        self.assertEqual(len(calls), 1)
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import json
+
+from django.test import SimpleTestCase
+
+from contact import catalogue
+from contact.forms import DownloadMessagesForm, MessageFilterForm
+from contact.models import ContactMessage
+
+
+class CatalogueTests(SimpleTestCase):
+    def test_tables_are_shared_and_read_only(self) -> None:
+        labels = catalogue.for_language('pl')
+        self.assertIs(labels, catalogue.for_language('pl'))
+        self.assertIs(catalogue.for_language('de'), catalogue.for_language('en'))
+        with self.assertRaises(TypeError):
+            labels.company_labels['firma1'] = 'changed'
+        with self.assertRaises(TypeError):
+            labels.status_options[0]['label'] = 'changed'
+
+    def test_status_meta_json_matches_options(self) -> None:
+        labels = catalogue.for_language('en')
+        meta = json.loads(labels.status_meta_json)
+        self.assertEqual(meta[ContactMessage.STATUS_IN_PROGRESS], {'label': 'In progress', 'badge': 'badge--warning'})
+        self.assertEqual(labels.status_info('unknown')['badge'], catalogue.DEFAULT_BADGE)
+
+    def test_forms_use_localised_choices(self) -> None:
+        filter_form = MessageFilterForm(language='pl')
+        self.assertEqual(filter_form.fields['company'].choices[0], ('all', 'Wszystkie departamenty'))
+        download_form = DownloadMessagesForm(language='en')
+        self.assertIn(('created_at', 'Submitted at'), download_form.fields['fields'].choices)
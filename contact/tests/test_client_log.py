@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from contact.models import ClientChangeLog, ContactMessage
+from contact.services import client_log
+
+
+@override_settings(CLIENT_LOG_COALESCE_SECONDS=600)
+class ClientLogCoalescingTests(TestCase):
+    def setUp(self) -> None:
+        self.message = ContactMessage.objects.create(
+            full_name='Jane Doe',
+            phone='+48100000000',
+            email='jane@example.com',
+            company='firma1',
+            message='Hello',
+        )
+
+    def _values(self) -> list[tuple[str, str, str]]:
+        return list(
+            ClientChangeLog.objects.order_by('changed_at', 'id').values_list('field', 'previous_value', 'new_value')
+        )
+
+    def test_repeated_edits_extend_the_latest_entry(self) -> None:
+        client_log.record_changes(self.message, [('phone', '1', '2'), ('email', 'a@x.pl', 'b@x.pl')])
+        client_log.record_changes(self.message, [('phone', '2', '3')])
+        client_log.record_changes(self.message, [('phone', '3', '4')])
+
+        self.assertEqual(sorted(self._values()), [('email', 'a@x.pl', 'b@x.pl'), ('phone', '1', '4')])
+
+    def test_edit_back_to_original_drops_the_entry(self) -> None:
+        client_log.record_changes(self.message, [('phone', '1', '2')])
+        client_log.record_changes(self.message, [('phone', '2', '1')])
+
+        self.assertFalse(ClientChangeLog.objects.exists())
+
+    def test_old_or_reverted_entries_are_not_extended(self) -> None:
+        client_log.record_changes(self.message, [('phone', '1', '2')])
+        client_log.record_changes(self.message, [('phone', '2', '3')], now=timezone.now() + timedelta(minutes=30))
+        self.assertEqual(ClientChangeLog.objects.count(), 2)
+
+        ClientChangeLog.objects.update(is_reverted=True)
+        client_log.record_changes(self.message, [('phone', '1', '5')])
+        self.assertEqual(ClientChangeLog.objects.filter(is_reverted=False).count(), 1)
+
+    def test_compaction_merges_existing_runs(self) -> None:
+        now = timezone.now()
+        rows = [
+            ('phone', '1', '2', now - timedelta(minutes=20)),
+            ('phone', '2', '3', now - timedelta(minutes=15)),
+            ('email', 'a', 'b', now - timedelta(minutes=14)),
+            ('phone', '3', '4', now - timedelta(minutes=10)),
+            ('phone', '4', '5', now + timedelta(minutes=30)),
+            ('email', 'b', 'a', now - timedelta(minutes=13)),
+        ]
+        for field, previous, new, changed_at in rows:
+            entry = ClientChangeLog.objects.create(message=self.message, field=field, previous_value=previous, new_value=new)
+            ClientChangeLog.objects.filter(pk=entry.pk).update(changed_at=changed_at)
+
+        out = StringIO()
+        call_command('compact_client_logs', '--dry-run', stdout=out)
+        self.assertIn('4 row(s)', out.getvalue())
+        self.assertEqual(ClientChangeLog.objects.count(), 6)
+
+        call_command('compact_client_logs', stdout=StringIO())
+        self.assertEqual(self._values(), [('phone', '1', '4'), ('phone', '4', '5')])
+
+
+class ClientLogHistoryTests(TestCase):
+    def setUp(self) -> None:
+        self.message = ContactMessage.objects.create(
+            full_name='Jane Doe',
+            phone='+48100000000',
+            email='jane@example.com',
+            company='firma1',
+            message='Hello',
+        )
+        ClientChangeLog.objects.bulk_create([
+            ClientChangeLog(message=self.message, field='phone', previous_value=str(index), new_value=str(index + 1))
+            for index in range(client_log.PAGE_SIZE + 5)
+        ])
+        session = self.client.session
+        session['logged_in'] = True
+        session.save()
+
+    def test_detail_returns_first_page_and_history_endpoint_the_rest(self) -> None:
+        detail = self.client.get(reverse('contact:message_detail', args=[self.message.id])).json()
+        self.assertEqual(len(detail['client_logs']), client_log.PAGE_SIZE)
+        self.assertEqual(detail['client_logs_next_page'], 2)
+
+        history = self.client.get(
+            reverse('contact:client_change_history', args=[self.message.id]), {'page': 2}
+        ).json()
+        self.assertEqual(len(history['client_logs']), 5)
+        self.assertIsNone(history['client_logs_next_page'])
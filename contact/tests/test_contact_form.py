@@ -4,7 +4,7 @@ import json
 
 from django.core.cache import cache
 from django.core.files.uploadedfile import SimpleUploadedFile
-from django.test import TestCase, override_settings
+from django.test import Client, TestCase, override_settings
 from django.urls import reverse
 
 from contact.models import ContactMessage
@@ -42,6 +42,39 @@ class ContactFormTests(TestCase):
         self.assertContains(response, 'Proszę poczekać', status_code=200)
         self.assertEqual(ContactMessage.objects.count(), 1)
 
+    def test_spoofed_forwarded_for_does_not_reset_the_limit(self) -> None:
+        url = reverse('contact:index')
+        self.client.post(url, self._valid_payload(), HTTP_X_FORWARDED_FOR='10.0.0.1')
+        payload = {**self._valid_payload(), 'email': 'other@example.com'}
+
+        response = self.client.post(url, payload, HTTP_X_FORWARDED_FOR='10.0.0.2')
+        self.assertContains(response, 'Proszę poczekać', status_code=200)
+        self.assertEqual(ContactMessage.objects.count(), 1)
+
+    @override_settings(TRUSTED_PROXY_COUNT=1)
+    def test_clients_behind_the_proxy_get_separate_limits(self) -> None:
+        url = reverse('contact:index')
+        for number in range(3):
+            payload = {**self._valid_payload(), 'email': f'client{number}@example.com'}
+            response = self.client.post(
+                url, payload, REMOTE_ADDR='10.0.0.1', HTTP_X_FORWARDED_FOR=f'203.0.113.{number}'
+            )
+            self.assertEqual(response.status_code, 302)
+
+        payload = {**self._valid_payload(), 'email': 'again@example.com'}
+        response = self.client.post(url, payload, REMOTE_ADDR='10.0.0.1', HTTP_X_FORWARDED_FOR='203.0.113.0')
+        self.assertContains(response, 'Proszę poczekać', status_code=200)
+        self.assertEqual(ContactMessage.objects.count(), 3)
+
+    def test_rejected_submission_does_not_use_up_the_limit(self) -> None:
+        url = reverse('contact:index')
+        response = self.client.post(url, {**self._valid_payload(), 'message': ''})
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.post(url, self._valid_payload())
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(ContactMessage.objects.count(), 1)
+
     def test_attachment_validation_rejects_empty_file(self) -> None:
         url = reverse('contact:index')
         payload = self._valid_payload()
@@ -93,3 +126,33 @@ class ContactFormTests(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertIsNone(response.context['active_request_id'])
         self.assertFalse(response.context['has_active_request'])
+
+
+@override_settings(INDEX_PAGE_CACHE_SECONDS=60)
+class LandingPageCacheTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_anonymous_page_is_served_from_cache_with_fresh_csrf_token(self) -> None:
+        url = reverse('contact:index')
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        self.assertIsNotNone(cache.get('contact:index_page:pl'))
+
+        second_client = Client()
+        with self.assertNumQueries(0):
+            second = second_client.get(url)
+        self.assertEqual(second.status_code, 200)
+        self.assertNotContains(second, 'csrf_token_placeholder')
+        self.assertIn('csrftoken', second_client.cookies)
+        self.assertContains(second, 'name="csrfmiddlewaretoken"', count=3)
+
+    def test_visitors_with_session_get_the_full_view(self) -> None:
+        cache.set('contact:index_page:pl', 'stale page', 60)
+        session = self.client.session
+        session['lang'] = 'pl'
+        session.save()
+
+        response = self.client.get(reverse('contact:index'))
+        self.assertNotEqual(response.content, b'stale page')
+        self.assertIsNone(response.context['active_request_id'])
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import time
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from contact import middleware
+from contact.models import ContactMessage
+
+
+class HealthCheckTests(TestCase):
+    def test_liveness_bypasses_sessions_and_views(self) -> None:
+        with self.assertNumQueries(0):
+            response = self.client.get('/health/live/', HTTP_HOST='10.0.0.5')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'status': 'ok'})
+        self.assertEqual(response['Cache-Control'], 'no-store')
+        self.assertNotIn('sessionid', response.cookies)
+        self.assertNotIn('csrftoken', response.cookies)
+
+    def test_readiness_reports_each_dependency(self) -> None:
+        response = self.client.get('/health/ready/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()['checks'],
+            {'database': 'ok', 'cache': 'ok', 'storage': 'ok'},
+        )
+        self.assertFalse(ContactMessage.objects.exists())
+
+    @override_settings(HEALTH_CHECK_TIMEOUT=0.05)
+    def test_readiness_fails_on_error_or_timeout(self) -> None:
+        def slow() -> None:
+            time.sleep(0.5)
+
+        def broken() -> None:
+            raise OSError('disk gone')
+
+        checks = {'database': slow, 'storage': broken}
+        with mock.patch.dict(middleware.READINESS_CHECKS, checks, clear=True), \
+                self.assertLogs('contact.middleware', 'WARNING'):
+            response = self.client.get('/health/ready/')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()['checks'], {'database': 'timeout', 'storage': 'error'})
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import smtplib
+from email.message import EmailMessage
+
+from django.test import SimpleTestCase
+
+from contact.loadtest.smtp_sink import SmtpSink
+from contact.loadtest.stats import Recorder, latency_summary
+
+
+class LoadTestHarnessTests(SimpleTestCase):
+    def test_smtp_sink_accepts_authenticated_mail(self) -> None:
+        message = EmailMessage()
+        message['From'] = 'loadtest@loadtest.invalid'
+        message['To'] = 'visitor@loadtest.invalid'
+        message['Subject'] = 'Token'
+        message.set_content('Token dostępu: abc')
+
+        with SmtpSink() as sink:
+            with smtplib.SMTP('127.0.0.1', sink.port, timeout=5) as server:
+                server.ehlo()
+                server.login('loadtest@loadtest.invalid', 'secret')
+                server.send_message(message)
+                server.send_message(message)
+
+        self.assertEqual(sink.messages, 2)
+        self.assertGreater(sink.bytes, 0)
+
+    def test_summary_reports_percentiles_errors_and_throughput(self) -> None:
+        recorder = Recorder()
+        for millis in range(1, 101):
+            recorder.record('GET /panel/', millis / 1000)
+        recorder.record('POST /', 0.5, error='HTTP 200')
+
+        summary = recorder.summary(wall_seconds=10)
+
+        panel = summary['GET /panel/']
+        self.assertEqual((panel['requests'], panel['errors'], panel['throughput_rps']), (100, 0, 10.0))
+        self.assertEqual(panel['latency_ms']['p50'], 50.5)
+        self.assertEqual(panel['latency_ms']['p99'], 99.01)
+        self.assertEqual(summary['POST /']['error_kinds'], {'HTTP 200': 1})
+        self.assertEqual(latency_summary([0.2])['p95'], 200.0)
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import gzip
+import json
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from contact.models import ActivityLogRollup, AdminActivityLog, ClientChangeLog, ContactMessage
+from contact.services import log_archive
+
+
+class LogArchiveTests(TestCase):
+    def setUp(self) -> None:
+        self.archive_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.archive_dir, ignore_errors=True)
+        override = override_settings(LOG_ARCHIVE_DIR=self.archive_dir, LOG_RETENTION_DAYS=30)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.message = ContactMessage.objects.create(
+            full_name='Jan Kowalski',
+            phone='+48123123123',
+            email='jan@example.com',
+            company='firma1',
+            message='Hello',
+        )
+        old = timezone.now() - timedelta(days=90)
+        for index in range(5):
+            AdminActivityLog.objects.create(
+                message=self.message,
+                action=AdminActivityLog.ACTION_DELETE if index % 2 else AdminActivityLog.ACTION_STATUS_CHANGE,
+                description=f'Old entry {index}',
+            )
+        AdminActivityLog.objects.update(created_at=old)
+        self.recent = AdminActivityLog.objects.create(
+            message=self.message, action=AdminActivityLog.ACTION_EMAIL, description='Fresh'
+        )
+        ClientChangeLog.objects.create(
+            message=self.message, field=ClientChangeLog.FIELD_PHONE, previous_value='1', new_value='2'
+        )
+        ClientChangeLog.objects.update(changed_at=old)
+
+    def test_old_rows_move_to_archive_files_in_batches(self) -> None:
+        call_command('archive_activity_logs', '--batch-size', '2', stdout=StringIO())
+
+        self.assertEqual(list(AdminActivityLog.objects.values_list('id', flat=True)), [self.recent.id])
+        self.assertFalse(ClientChangeLog.objects.exists())
+        self.assertEqual(len(list(self.archive_dir.glob('admin-*.jsonl.gz'))), 3)
+        self.assertEqual(len(list(self.archive_dir.glob('client-*.jsonl.gz'))), 1)
+        self.assertFalse(list(self.archive_dir.glob('*.tmp')))
+
+        with gzip.open(sorted(self.archive_dir.glob('admin-*.jsonl.gz'))[0], 'rt', encoding='utf-8') as handle:
+            first = json.loads(handle.readline())
+        self.assertEqual(first['message_id'], self.message.id)
+        self.assertEqual(first['description'], 'Old entry 0')
+
+    def test_client_values_are_redacted_including_older_files(self) -> None:
+        legacy = self.archive_dir / 'client-20200101-1-1.jsonl.gz'
+        with gzip.open(legacy, 'wt', encoding='utf-8') as handle:
+            handle.write(json.dumps({'id': 1, 'message_id': 1, 'field': 'email', 'previous_value': 'a@b.c',
+                                     'new_value': 'd@e.f', 'changed_at': '2020-01-01T00:00:00+00:00'}) + '\n')
+
+        call_command('archive_activity_logs', '--redact-existing', stdout=StringIO())
+
+        rows = list(log_archive.iter_archived(log_archive.TABLES['client']))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual({(row['previous_value'], row['new_value']) for row in rows}, {('', '')})
+
+    def test_rollups_keep_daily_counts_per_action(self) -> None:
+        call_command('archive_activity_logs', stdout=StringIO())
+        call_command('archive_activity_logs', stdout=StringIO())
+
+        counts = {
+            (rollup.source, rollup.action): rollup.count for rollup in ActivityLogRollup.objects.all()
+        }
+        self.assertEqual(counts, {
+            (ActivityLogRollup.SOURCE_ADMIN, AdminActivityLog.ACTION_STATUS_CHANGE): 3,
+            (ActivityLogRollup.SOURCE_ADMIN, AdminActivityLog.ACTION_DELETE): 2,
+            (ActivityLogRollup.SOURCE_CLIENT, ClientChangeLog.FIELD_PHONE): 1,
+        })
+
+    def test_dry_run_changes_nothing(self) -> None:
+        out = StringIO()
+        call_command('archive_activity_logs', '--dry-run', stdout=out)
+
+        self.assertIn('admin: 5 row(s)', out.getvalue())
+        self.assertEqual(AdminActivityLog.objects.count(), 6)
+        self.assertFalse(list(self.archive_dir.iterdir()))
+
+    def test_archived_rows_can_be_searched(self) -> None:
+        call_command('archive_activity_logs', stdout=StringIO())
+        table = log_archive.TABLES['admin']
+
+        deletes = list(log_archive.iter_archived(table, message_id=self.message.id, group=AdminActivityLog.ACTION_DELETE))
+        self.assertEqual([row['description'] for row in deletes], ['Old entry 1', 'Old entry 3'])
+        self.assertEqual(len(list(log_archive.iter_archived(table, text='OLD ENTRY 4'))), 1)
+        self.assertEqual(list(log_archive.iter_archived(table, message_id=self.message.id + 1)), [])
+
+        out = StringIO()
+        call_command('search_log_archive', '--table', 'client', '--message-id', str(self.message.id), stdout=out, stderr=StringIO())
+        self.assertEqual(json.loads(out.getvalue())['field'], ClientChangeLog.FIELD_PHONE)
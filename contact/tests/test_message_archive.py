@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from io import StringIO
+
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from contact.models import (
+    AdminActivityLog,
+    ArchivedAttachment,
+    ArchivedMessage,
+    ClientChangeLog,
+    ContactAttachment,
+    ContactMessage,
+)
+
+from .test_attachments import TemporaryMediaMixin
+
+
+class MessageArchiveTests(TemporaryMediaMixin, TestCase):
+    def setUp(self) -> None:
+        self.use_temporary_media()
+        old = timezone.now() - timedelta(days=400)
+        self.closed = [
+            ContactMessage.objects.create(
+                full_name=f'Closed {index}',
+                phone='+48123123123',
+                email=f'closed{index}@example.com',
+                company='firma2',
+                message='Done long ago',
+                status=ContactMessage.STATUS_READY,
+                created_at=old,
+            )
+            for index in range(3)
+        ]
+        self.open_old = ContactMessage.objects.create(
+            full_name='Still open',
+            phone='+48123123123',
+            email='open@example.com',
+            company='firma1',
+            message='Waiting',
+            status=ContactMessage.STATUS_IN_PROGRESS,
+            created_at=old,
+        )
+        self.attachment = ContactAttachment(
+            message=self.closed[0], original_name='scan.txt', content_type='text/plain', size=4
+        )
+        self.attachment.file.save('scan.txt', ContentFile(b'scan'), save=True)
+        AdminActivityLog.objects.create(message=self.closed[0], action=AdminActivityLog.ACTION_STATUS_CHANGE)
+        ClientChangeLog.objects.create(message=self.closed[0], field='phone', previous_value='1', new_value='2')
+
+    def test_mover_relocates_ready_requests_with_metadata(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('archive_closed_requests', '--older-than-days', '365', '--batch-size', '2', stdout=StringIO())
+
+        self.assertEqual(list(ContactMessage.objects.values_list('id', flat=True)), [self.open_old.id])
+        self.assertFalse(ContactAttachment.objects.exists())
+        archived = ArchivedMessage.objects.get(pk=self.closed[0].id)
+        self.assertEqual(archived.email, 'closed0@example.com')
+        self.assertEqual(archived.admin_logs[0]['action'], AdminActivityLog.ACTION_STATUS_CHANGE)
+        self.assertEqual(archived.client_logs[0]['new_value'], '2')
+        self.assertEqual(archived.attachments.get().file, self.attachment.file.name)
+        self.assertEqual(ArchivedMessage.objects.count(), 3)
+
+    def test_dry_run_moves_nothing(self) -> None:
+        out = StringIO()
+        call_command('archive_closed_requests', '--dry-run', stdout=out)
+        self.assertIn('3 ready request(s)', out.getvalue())
+        self.assertFalse(ArchivedMessage.objects.exists())
+
+    def test_orphan_collector_keeps_archived_files(self) -> None:
+        call_command('archive_closed_requests', stdout=StringIO())
+        call_command('collect_orphaned_attachments', '--min-age-hours=0', stdout=StringIO())
+        self.assertEqual(self.stored_files(), [self.attachment.file.name])
+
+    def test_admin_can_search_archive_and_download_files(self) -> None:
+        call_command('archive_closed_requests', stdout=StringIO())
+        url = reverse('contact:archive_search')
+        self.assertEqual(self.client.get(url).status_code, 302)
+
+        session = self.client.session
+        session['logged_in'] = True
+        session.save()
+        response = self.client.get(url, {'q': 'closed1@'})
+        self.assertEqual([item.id for item in response.context['archive_page']], [self.closed[1].id])
+        response = self.client.get(url, {'q': str(self.closed[0].id)})
+        self.assertContains(response, 'scan.txt')
+
+        attachment = ArchivedAttachment.objects.get()
+        download = self.client.get(reverse('contact:archived_attachment', args=[attachment.id]))
+        self.assertEqual(b''.join(download.streaming_content), b'scan')
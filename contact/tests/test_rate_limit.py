@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import threading
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from contact.cache_backends import TwoTierCache
+from contact.services.rate_limit import (
+    SLIDING_WINDOW,
+    RateLimiter,
+    RateLimitPolicy,
+)
+from contact.utils import get_client_ip
+
+
+class RateLimiterTests(SimpleTestCase):
+    def setUp(self) -> None:
+        self.cache = LocMemCache('rate-limit-tests', {})
+        self.cache.clear()
+
+    def test_token_bucket_blocks_until_refilled(self) -> None:
+        limiter = RateLimiter('test', [RateLimitPolicy('ip', 'ip', 1, 30)], cache=self.cache)
+        identifiers = {'ip': '10.0.0.1'}
+
+        self.assertTrue(limiter.acquire(identifiers, now=1000).allowed)
+
+        blocked = limiter.acquire(identifiers, now=1010)
+        self.assertFalse(blocked.allowed)
+        self.assertAlmostEqual(blocked.retry_after, 20)
+        self.assertTrue(limiter.acquire({'ip': '10.0.0.2'}, now=1010).allowed)
+        self.assertTrue(limiter.acquire(identifiers, now=1030).allowed)
+
+    def test_sliding_window_weights_previous_window(self) -> None:
+        policy = RateLimitPolicy('hourly', 'ip', 4, 100, SLIDING_WINDOW)
+        limiter = RateLimiter('test', [policy], cache=self.cache)
+        identifiers = {'ip': '10.0.0.1'}
+
+        for _ in range(4):
+            self.assertTrue(limiter.acquire(identifiers, now=150).allowed)
+        self.assertFalse(limiter.acquire(identifiers, now=199).allowed)
+
+        # 10% into the next window the previous 4 hits still weigh 3.6.
+        early = limiter.acquire(identifiers, now=210)
+        self.assertFalse(early.allowed)
+        self.assertAlmostEqual(early.retry_after, 15)
+        self.assertTrue(limiter.acquire(identifiers, now=225).allowed)
+
+    def test_policies_without_identifier_are_skipped(self) -> None:
+        limiter = RateLimiter(
+            'test',
+            [RateLimitPolicy('ip', 'ip', 1, 30), RateLimitPolicy('email', 'email', 1, 30)],
+            cache=self.cache,
+        )
+        limiter.acquire({'ip': '10.0.0.1'}, now=0)
+        self.assertTrue(limiter.acquire({'email': 'a@example.com'}, now=1).allowed)
+        self.assertFalse(limiter.acquire({'ip': '10.0.0.1', 'email': 'b@example.com'}, now=1).allowed)
+        # The denied attempt gave back what it took from the e-mail policy.
+        self.assertTrue(limiter.acquire({'email': 'b@example.com'}, now=1).allowed)
+
+    def test_refund_returns_the_request(self) -> None:
+        limiter = RateLimiter(
+            'test',
+            [RateLimitPolicy('ip', 'ip', 1, 30), RateLimitPolicy('hourly', 'ip', 1, 100, SLIDING_WINDOW)],
+            cache=self.cache,
+        )
+        identifiers = {'ip': '10.0.0.1'}
+        result = limiter.acquire(identifiers, now=10)
+        self.assertFalse(limiter.acquire(identifiers, now=11).allowed)
+
+        limiter.refund(result, now=11)
+        self.assertTrue(limiter.acquire(identifiers, now=11).allowed)
+
+    def test_concurrent_requests_cannot_share_the_last_slot(self) -> None:
+        limiter = RateLimiter(
+            'test',
+            [RateLimitPolicy('ip', 'ip', 1, 30), RateLimitPolicy('hourly', 'email', 3, 100, SLIDING_WINDOW)],
+            cache=self.cache,
+        )
+        barrier = threading.Barrier(8)
+        outcomes: list[tuple[bool, bool]] = []
+
+        def attempt() -> None:
+            barrier.wait()
+            by_ip = limiter.acquire({'ip': '10.0.0.1'}, now=50).allowed
+            by_email = limiter.acquire({'email': 'a@example.com'}, now=50).allowed
+            outcomes.append((by_ip, by_email))
+
+        threads = [threading.Thread(target=attempt) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sum(by_ip for by_ip, _ in outcomes), 1)
+        self.assertEqual(sum(by_email for _, by_email in outcomes), 3)
+
+    def test_state_goes_through_the_shared_tier_in_few_round_trips(self) -> None:
+        tiered = TwoTierCache('rate-limit-tiered', {'OPTIONS': {'LOCAL_TIMEOUT': 60}})
+        tiered.shared.clear()
+        calls: list[str] = []
+        depth: list[int] = []
+        for name in ('add', 'get', 'get_many', 'set', 'set_many', 'incr', 'touch', 'delete', 'delete_many'):
+            original = getattr(tiered.shared, name)
+            setattr(tiered.shared, name, self._recording(calls, depth, name, original))
+        limiter = RateLimiter(
+            'test',
+            [
+                RateLimitPolicy('ip', 'ip', 1, 30),
+                RateLimitPolicy('email', 'email', 1, 30),
+                RateLimitPolicy('ip_hourly', 'ip', 20, 3600, SLIDING_WINDOW),
+            ],
+            cache=tiered,
+        )
+        self.assertIs(limiter.cache, tiered.shared)
+
+        identifiers = {'ip': '10.0.0.1', 'email': 'a@example.com'}
+        self.assertTrue(limiter.acquire(identifiers, now=100).allowed)
+        self.assertEqual(calls, ['add', 'add', 'add', 'get_many'])
+
+    @staticmethod
+    def _recording(calls: list[str], depth: list[int], name: str, method):
+        # Only what the limiter calls counts, not what LocMemCache does inside.
+        def wrapper(*args, **kwargs):
+            if not depth:
+                calls.append(name)
+            depth.append(1)
+            try:
+                return method(*args, **kwargs)
+            finally:
+                depth.pop()
+
+        return wrapper
+
+
+class ClientIpTests(SimpleTestCase):
+    def setUp(self) -> None:
+        self.factory = RequestFactory()
+
+    def test_forwarded_for_is_ignored_without_trusted_proxies(self) -> None:
+        request = self.factory.post('/', HTTP_X_FORWARDED_FOR='10.9.9.9', REMOTE_ADDR='203.0.113.5')
+        self.assertEqual(get_client_ip(request), '203.0.113.5')
+
+    @override_settings(TRUSTED_PROXY_COUNT=1)
+    def test_only_the_hop_added_by_the_trusted_proxy_counts(self) -> None:
+        request = self.factory.post('/', HTTP_X_FORWARDED_FOR='10.9.9.9, 198.51.100.7', REMOTE_ADDR='127.0.0.1')
+        self.assertEqual(get_client_ip(request), '198.51.100.7')
+        direct = self.factory.post('/', REMOTE_ADDR='198.51.100.8')
+        self.assertEqual(get_client_ip(direct), '198.51.100.8')
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from contact.forms import ContactForm
+from contact.models import (
+    AdminActivityLog,
+    ArchivedMessage,
+    ClientChangeLog,
+    ContactAttachment,
+    ContactMessage,
+)
+from contact.services import seed_data
+
+
+class SeedContactMessagesTests(TestCase):
+    def test_seeder_fills_every_table_with_form_compatible_values(self) -> None:
+        out = StringIO()
+        call_command(
+            'seed_contact_messages', '--count', '120', '--chunk', '50', '--seed', '7',
+            '--attachment-ratio', '0.5', '--edit-ratio', '0.5', stdout=out,
+        )
+
+        self.assertEqual(ContactMessage.objects.count(), 120)
+        companies = {value for value, _ in ContactForm.COMPANY_CHOICES}
+        self.assertTrue(set(ContactMessage.objects.values_list('company', flat=True)) <= companies)
+        self.assertTrue(ContactAttachment.objects.exists())
+        self.assertTrue(ClientChangeLog.objects.exists())
+        self.assertTrue(AdminActivityLog.objects.filter(action=AdminActivityLog.ACTION_STATUS_CHANGE).exists())
+        self.assertIn('Готово: добавлено 120 заявок', out.getvalue())
+
+        message = ContactMessage.objects.order_by('-created_at').first()
+        self.assertTrue(message.verify_access_token(seed_data.seed_token(message.id)))
+        # Explicit ids must not leave the id sequence behind.
+        created = ContactMessage.objects.create(
+            full_name='After seed', phone='1', email='after@example.com', company='inna', message='Hi'
+        )
+        self.assertGreater(created.id, 120)
+
+    def test_seeded_ids_skip_archived_and_purged_ids(self) -> None:
+        fields = {'full_name': 'Old', 'phone': '1', 'email': 'old@example.com', 'company': 'inna', 'message': 'Hi'}
+        ContactMessage.objects.create(**fields)
+        purged_id = ContactMessage.objects.create(**fields).id
+        ContactMessage.objects.filter(id=purged_id).delete()
+        ArchivedMessage.objects.create(
+            id=50, status=ContactMessage.STATUS_NEW, created_at=timezone.now(), **fields
+        )
+
+        list(seed_data.seed(3, random_seed=1))
+
+        seeded = ContactMessage.objects.filter(id__gt=purged_id).values_list('id', flat=True)
+        self.assertEqual(sorted(seeded), [51, 52, 53])
+        self.assertGreater(ContactMessage.objects.create(**fields).id, 53)
+
+    def test_same_seed_builds_the_same_chunk(self) -> None:
+        now = timezone.now()
+        first = seed_data.build_chunk(1, 30, seed_data.SeedProfile(), 42, now)
+        second = seed_data.build_chunk(1, 30, seed_data.SeedProfile(), 42, now)
+        self.assertEqual(first, second)
+
+    def test_clear_removes_requests_and_children_chunk_by_chunk(self) -> None:
+        profile = seed_data.SeedProfile(attachment_ratio=1.0, client_edit_ratio=1.0)
+        list(seed_data.seed(12, profile=profile, chunk_size=12, random_seed=3))
+        self.assertTrue(ContactAttachment.objects.exists())
+
+        seed_data.clear(chunk_size=5)
+
+        for model in (ContactMessage, ContactAttachment, ClientChangeLog, AdminActivityLog):
+            self.assertFalse(model.objects.exists(), model.__name__)
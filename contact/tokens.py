@@ -0,0 +1,47 @@
+"""Keyed hashing for client access tokens.
+
+Access tokens are 32+ characters from ``secrets.token_urlsafe``, so they need
+no key stretching: a single HMAC-SHA256 under a server-side key is enough and
+costs microseconds instead of a full PBKDF2 run. Hashes written by the old
+``make_password`` scheme are still accepted and reported as needing a rehash.
+"""
+
+from __future__ import annotations
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+ALGORITHM = 'hmac-sha256'
+KEY_SALT = 'contact.tokens.access_token'
+
+
+def hash_token(token: str) -> str:
+    return f'{ALGORITHM}${_digest(token, _secret_keys()[0])}'
+
+
+def verify_token(token: str, encoded: str) -> tuple[bool, bool]:
+    """Return ``(is_valid, needs_rehash)`` for ``token`` against ``encoded``."""
+
+    if not token or not encoded:
+        return False, False
+    algorithm, _, digest = encoded.partition('$')
+    if algorithm != ALGORITHM:
+        # Legacy make_password() hash.
+        return check_password(token, encoded), True
+    for index, secret in enumerate(_secret_keys()):
+        if constant_time_compare(_digest(token, secret), digest):
+            return True, index > 0
+    return False, False
+
+
+def _digest(token: str, secret: str) -> str:
+    return salted_hmac(KEY_SALT, token, secret=secret, algorithm='sha256').hexdigest()
+
+
+def _secret_keys() -> list[str]:
+    # A dedicated key rotates on its own; SECRET_KEY_FALLBACKS must not widen it.
+    key = getattr(settings, 'CONTACT_ACCESS_TOKEN_KEY', '')
+    if key:
+        return [key, *getattr(settings, 'CONTACT_ACCESS_TOKEN_KEY_FALLBACKS', [])]
+    return [settings.SECRET_KEY, *getattr(settings, 'SECRET_KEY_FALLBACKS', [])]
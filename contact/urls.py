@@ -11,11 +11,32 @@ urlpatterns = [
     path('panel/', views.panel, name='panel'),
     path('panel/messages/<int:message_id>/detail/', views.message_detail, name='message_detail'),
     path('panel/messages/<int:message_id>/update/', views.update_message, name='update_message'),
+    path('panel/messages/<int:message_id>/logs/', views.client_change_history, name='client_change_history'),
     path(
         'panel/messages/<int:message_id>/logs/<int:log_id>/rollback/',
         views.rollback_client_change,
         name='rollback_client_change',
     ),
+    path(
+        'panel/messages/<int:message_id>/logs/rollback/',
+        views.rollback_client_changes,
+        name='rollback_client_changes',
+    ),
+    path('panel/activity/', views.activity_log, name='activity_log'),
+    path('panel/activity/api/', views.activity_log_api, name='activity_log_api'),
+    path('panel/activity/export/', views.activity_log_export, name='activity_log_export'),
+    path('panel/archive/', views.archive_search, name='archive_search'),
+    path('panel/archive/attachments/<int:attachment_id>/', views.archived_attachment, name='archived_attachment'),
+    path(
+        'attachments/<int:attachment_id>/',
+        views.download_attachment,
+        name='download_attachment',
+    ),
+    path(
+        'attachments/<int:attachment_id>/thumbnail/',
+        views.attachment_thumbnail,
+        name='attachment_thumbnail',
+    ),
     path('requests/', views.user_requests, name='user_requests'),
     path('requests/restore/', views.restore_access, name='restore_access'),
     path('requests/<int:message_id>/detail/', views.user_message_detail, name='user_message_detail'),
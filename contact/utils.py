@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import hashlib
+import subprocess
 
 from django.conf import settings
 
@@ -17,16 +18,40 @@ def get_language(request) -> str:
 
 
 def get_client_ip(request) -> str:
-    forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR', '')
-    if forwarded_for:
-        for ip in forwarded_for.split(','):
-            candidate = ip.strip()
-            if candidate:
-                return candidate
-    return (request.META.get('REMOTE_ADDR') or '').strip()
+    """Client address as seen by the outermost trusted proxy.
+
+    ``X-Forwarded-For`` is written by whoever sends the request, so only the
+    hops appended by our own ``TRUSTED_PROXY_COUNT`` proxies are believed;
+    without proxies it is ignored and ``REMOTE_ADDR`` is used.
+    """
+
+    remote_addr = (request.META.get('REMOTE_ADDR') or '').strip()
+    proxies = getattr(settings, 'TRUSTED_PROXY_COUNT', 0)
+    if proxies <= 0:
+        return remote_addr
+    hops = [hop.strip() for hop in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',') if hop.strip()]
+    if len(hops) < proxies:
+        return remote_addr
+    return hops[-proxies]
 
 
 def build_rate_limit_key(prefix: str, identifier: str) -> str:
     identifier = identifier or 'anonymous'
     digest = hashlib.sha256(identifier.encode('utf-8')).hexdigest()
     return f"{prefix}:{digest}"
+
+
+def get_git_commit() -> str | None:
+    """Short hash of the checked-out commit, for tagging benchmark and load-test reports."""
+
+    try:
+        result = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
@@ -1,7 +1,20 @@
 from .auth import login, logout
 from .portal import panel
 from .public import index
-from .admin import admin_panel, message_detail, rollback_client_change, update_message
+from .admin import (
+    activity_log,
+    activity_log_api,
+    activity_log_export,
+    admin_panel,
+    archive_search,
+    archived_attachment,
+    client_change_history,
+    message_detail,
+    rollback_client_change,
+    rollback_client_changes,
+    update_message,
+)
+from .attachments import attachment_thumbnail, download_attachment
 from .user import (
     access_portal,
     restore_access,
@@ -21,7 +34,16 @@ __all__ = [
     'restore_access',
     'message_detail',
     'update_message',
+    'client_change_history',
     'rollback_client_change',
+    'rollback_client_changes',
+    'activity_log',
+    'activity_log_api',
+    'activity_log_export',
+    'archive_search',
+    'archived_attachment',
+    'download_attachment',
+    'attachment_thumbnail',
     'user_requests',
     'user_message_detail',
     'user_update_message',
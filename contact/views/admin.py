@@ -1,15 +1,17 @@
 from __future__ import annotations
 
-import json
-
 from django.core.paginator import Paginator
-from django.db import transaction
-from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.http import HttpRequest, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.utils.dateparse import parse_datetime
 from django.views.decorators.http import require_POST, require_http_methods
 
+from .. import catalogue
 from ..forms import (
+    ActivityLogFilterForm,
+    ArchiveSearchForm,
     DownloadMessagesForm,
     EmailForm,
     MessageBulkActionForm,
@@ -17,24 +19,21 @@ from ..forms import (
     MessageUpdateForm,
     TrashActionForm,
 )
-from ..models import AdminActivityLog, ClientChangeLog, ContactMessage
+from ..models import AdminActivityLog, ArchivedAttachment, ContactMessage
+from ..services import audit_log, client_log, message_archive, storage_gc
 from ..services import messages as message_service
 from ..services.activity_log import log_action
+from ..services.attachment_delivery import serve_stored_file
 from ..services.email_service import send_email_with_attachment
 from ..services.pdf_service import build_messages_pdf
+from ..services.zip_export import stream_attachments_zip
 from ..utils import get_language
 from . import helpers
 
 
 def _serialise_admin_message(message: ContactMessage, language: str) -> dict:
-    status_options = helpers.status_options(language)
-    status_lookup = {item['value']: item for item in status_options}
-    company_labels = helpers.company_labels(language)
-    status_info = status_lookup.get(
-        message.status,
-        {'label': message.status, 'badge': 'badge--info'},
-    )
-    logs = ClientChangeLog.objects.filter(message=message).order_by('-changed_at', '-id')
+    labels = catalogue.for_language(language)
+    status_info = labels.status_info(message.status)
     return {
         'id': message.id,
         'full_name': message.full_name,
@@ -42,7 +41,7 @@ def _serialise_admin_message(message: ContactMessage, language: str) -> dict:
         'email': message.email,
         'company': message.company,
         'company_name': message.company_name,
-        'company_label': company_labels.get(message.company, message.company),
+        'company_label': labels.company_labels.get(message.company, message.company),
         'message': message.message,
         'status': message.status,
         'status_label': status_info['label'],
@@ -53,6 +52,13 @@ def _serialise_admin_message(message: ContactMessage, language: str) -> dict:
         'access_token_hash': message.access_token_hash,
         'access_enabled': message.access_enabled,
         'attachments': [helpers.serialise_attachment(att) for att in message.attachments.all()],
+        **_serialise_client_logs(message),
+    }
+
+
+def _serialise_client_logs(message: ContactMessage, page_number: int | str | None = 1) -> dict:
+    page = client_log.history_page(message, page_number)
+    return {
         'client_logs': [
             {
                 'id': log.id,
@@ -62,8 +68,10 @@ def _serialise_admin_message(message: ContactMessage, language: str) -> dict:
                 'changed_at': timezone.localtime(log.changed_at).strftime('%Y-%m-%d %H:%M'),
                 'is_reverted': log.is_reverted,
             }
-            for log in logs
+            for log in page.object_list
         ],
+        'client_logs_page': page.number,
+        'client_logs_next_page': page.next_page_number() if page.has_next() else None,
     }
 
 
@@ -157,9 +165,7 @@ def admin_panel(request: HttpRequest) -> HttpResponse:
         raw_ids = download_form.data.getlist('messages')
         selected_download_ids = list(dict.fromkeys(raw_ids))
 
-    company_options = helpers.company_options(lang)
-    status_options = helpers.status_options(lang)
-    status_meta = {item["value"]: {"label": item["label"], "badge": item["badge"]} for item in status_options}
+    labels = catalogue.for_language(lang)
 
     if lang == 'pl':
         detail_error_message = 'Nie udało się pobrać danych zgłoszenia.'
@@ -185,9 +191,9 @@ def admin_panel(request: HttpRequest) -> HttpResponse:
         'download_has_choices': bool(download_choices),
         'download_fields_total': download_fields_total,
         'selected_download_ids': selected_download_ids,
-        'company_options': company_options,
-        'status_options': status_options,
-        'status_meta_json': json.dumps(status_meta),
+        'company_options': labels.company_options,
+        'status_options': labels.status_options,
+        'status_meta_json': labels.status_meta_json,
         'request_detail_error_message': detail_error_message,
         'request_update_error_message': update_error_message,
     }
@@ -260,6 +266,8 @@ def _handle_download_form(
             sort_by=sort_by,
             company=company_filter,
         ).filter(id__in=ids)
+        if form.cleaned_data['export'] == DownloadMessagesForm.EXPORT_ATTACHMENTS:
+            return form, _attachments_zip_response(selected_messages)
         pdf_bytes = build_messages_pdf(selected_messages, fields=fields, language=lang)
         filename = timezone.localtime().strftime('requests_%Y%m%d_%H%M%S.pdf')
         response = HttpResponse(pdf_bytes, content_type='application/pdf')
@@ -268,6 +276,18 @@ def _handle_download_form(
     return form, None
 
 
+def _attachments_zip_response(messages) -> StreamingHttpResponse:
+    filename = timezone.localtime().strftime('attachments_%Y%m%d_%H%M%S.zip')
+    response = StreamingHttpResponse(
+        stream_attachments_zip(messages.prefetch_related('attachments').iterator(chunk_size=50)),
+        content_type='application/zip',
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    # Ask nginx not to buffer the archive so the download starts right away.
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
 def _handle_email_form(
     request: HttpRequest,
     lang: str,
@@ -325,32 +345,198 @@ def update_message(request: HttpRequest, message_id: int) -> JsonResponse:
     return JsonResponse({'errors': form.errors}, status=400)
 
 
+@require_http_methods(["GET"])
+def client_change_history(request: HttpRequest, message_id: int) -> JsonResponse:
+    if not request.session.get('logged_in'):
+        return JsonResponse({'error': 'unauthorized'}, status=403)
+
+    message = get_object_or_404(ContactMessage, pk=message_id, is_deleted=False)
+    return JsonResponse(_serialise_client_logs(message, request.GET.get('page')))
+
+
 @require_POST
 def rollback_client_change(request: HttpRequest, message_id: int, log_id: int) -> JsonResponse:
     if not request.session.get('logged_in'):
         return JsonResponse({'error': 'unauthorized'}, status=403)
 
     message = get_object_or_404(ContactMessage, pk=message_id, is_deleted=False)
-    with transaction.atomic():
-        log_entry = get_object_or_404(
-            ClientChangeLog.objects.select_for_update(),
-            pk=log_id,
-            message=message,
-            is_reverted=False,
-        )
+    return _rollback_response(request, message, log_ids=[log_id])
+
+
+@require_POST
+def rollback_client_changes(request: HttpRequest, message_id: int) -> JsonResponse:
+    """Revert several client edits at once: ``log_ids`` (repeated), ``since`` (ISO datetime) or both."""
 
-        field_name = log_entry.field
-        setattr(message, field_name, log_entry.previous_value)
-        message.save(update_fields=[field_name])
+    if not request.session.get('logged_in'):
+        return JsonResponse({'error': 'unauthorized'}, status=403)
 
-        log_entry.is_reverted = True
-        log_entry.save(update_fields=['is_reverted'])
+    message = get_object_or_404(ContactMessage, pk=message_id, is_deleted=False)
+    try:
+        log_ids = [int(value) for value in request.POST.getlist('log_ids')] or None
+    except ValueError:
+        return JsonResponse({'errors': {'log_ids': ['invalid']}}, status=400)
+    since = None
+    if request.POST.get('since'):
+        try:
+            since = parse_datetime(request.POST['since'])
+        except ValueError:  # well formed, but not a real date
+            since = None
+        if since is None:
+            return JsonResponse({'errors': {'since': ['invalid']}}, status=400)
+        if timezone.is_naive(since):
+            since = timezone.make_aware(since)
+    if log_ids is None and since is None:
+        return JsonResponse({'errors': {'__all__': ['log_ids or since is required']}}, status=400)
+    return _rollback_response(request, message, log_ids=log_ids, since=since)
+
+
+def _rollback_response(request: HttpRequest, message: ContactMessage, **selection) -> JsonResponse:
+    fields = message_service.rollback_client_changes(message, **selection)
+    if not fields:
+        return JsonResponse({'error': 'not_found'}, status=404)
 
     log_action(
         AdminActivityLog.ACTION_ROLLBACK,
         message_id=message.id,
-        description=f"Rolled back field {field_name}",
+        description=f"Rolled back field{'s' if len(fields) > 1 else ''} {', '.join(fields)}",
     )
 
     language = get_language(request)
     return JsonResponse(_serialise_admin_message(message, language))
+
+
+def _activity_queryset(request: HttpRequest, lang: str):
+    form = ActivityLogFilterForm(request.GET, language=lang)
+    if not form.is_valid():
+        return form, None
+    queryset = audit_log.filtered_logs(
+        action=form.cleaned_data['action'],
+        message_id=form.cleaned_data['message'],
+        date_from=form.cleaned_data['date_from'],
+        date_to=form.cleaned_data['date_to'],
+    )
+    return form, queryset
+
+
+def _activity_page_size(request: HttpRequest) -> int:
+    try:
+        size = int(request.GET.get('limit') or audit_log.PAGE_SIZE)
+    except ValueError:
+        return audit_log.PAGE_SIZE
+    return min(max(size, 1), audit_log.MAX_PAGE_SIZE)
+
+
+@require_http_methods(["GET"])
+def activity_log(request: HttpRequest) -> HttpResponse:
+    if not request.session.get('logged_in'):
+        return redirect('contact:login')
+
+    lang = get_language(request)
+    form, queryset = _activity_queryset(request, lang)
+    entries: list[dict] = []
+    next_cursor = None
+    if queryset is not None:
+        try:
+            logs, next_cursor = audit_log.page(queryset, cursor=request.GET.get('cursor'))
+        except audit_log.InvalidCursor:
+            logs, next_cursor = audit_log.page(queryset)
+        entries = [
+            {
+                **audit_log.serialise_entry(entry, lang),
+                'created_at_display': timezone.localtime(entry.created_at).strftime('%Y-%m-%d %H:%M'),
+            }
+            for entry in logs
+        ]
+
+    filter_query = request.GET.copy()
+    filter_query.pop('cursor', None)
+    context = {
+        'lang': lang,
+        'filter_form': form,
+        'entries': entries,
+        'next_cursor': next_cursor,
+        'is_first_page': not request.GET.get('cursor'),
+        'filter_query': filter_query.urlencode(),
+    }
+    return render(request, 'contact/activity_log.html', context)
+
+
+@require_http_methods(["GET"])
+def activity_log_api(request: HttpRequest) -> JsonResponse:
+    if not request.session.get('logged_in'):
+        return JsonResponse({'error': 'unauthorized'}, status=403)
+
+    lang = get_language(request)
+    form, queryset = _activity_queryset(request, lang)
+    if queryset is None:
+        return JsonResponse({'errors': form.errors}, status=400)
+    try:
+        logs, next_cursor = audit_log.page(
+            queryset,
+            cursor=request.GET.get('cursor'),
+            limit=_activity_page_size(request),
+        )
+    except audit_log.InvalidCursor:
+        return JsonResponse({'errors': {'cursor': ['invalid']}}, status=400)
+    return JsonResponse({
+        'results': [audit_log.serialise_entry(entry, lang) for entry in logs],
+        'next_cursor': next_cursor,
+    })
+
+
+@require_http_methods(["GET"])
+def activity_log_export(request: HttpRequest) -> HttpResponse:
+    if not request.session.get('logged_in'):
+        return redirect('contact:login')
+
+    lang = get_language(request)
+    form, queryset = _activity_queryset(request, lang)
+    if queryset is None:
+        return JsonResponse({'errors': form.errors}, status=400)
+    filename = timezone.localtime().strftime('activity_log_%Y%m%d_%H%M%S.csv')
+    response = StreamingHttpResponse(audit_log.stream_csv(queryset, lang), content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@require_http_methods(["GET"])
+def archive_search(request: HttpRequest) -> HttpResponse:
+    if not request.session.get('logged_in'):
+        return redirect('contact:login')
+
+    lang = get_language(request)
+    form = ArchiveSearchForm(request.GET, language=lang)
+    if form.is_valid():
+        queryset = message_archive.search(query=form.cleaned_data['q'], company=form.cleaned_data['company'])
+    else:
+        queryset = message_archive.search()
+    page_obj = Paginator(queryset, 20).get_page(request.GET.get('page'))
+
+    filter_query = request.GET.copy()
+    filter_query.pop('page', None)
+    context = {
+        'lang': lang,
+        'search_form': form,
+        'archive_page': page_obj,
+        'filter_query': filter_query.urlencode(),
+    }
+    return render(request, 'contact/archive.html', context)
+
+
+@require_http_methods(["GET", "HEAD"])
+def archived_attachment(request: HttpRequest, attachment_id: int) -> HttpResponse:
+    if not request.session.get('logged_in'):
+        return redirect('contact:login')
+
+    attachment = get_object_or_404(ArchivedAttachment, pk=attachment_id)
+    response = serve_stored_file(
+        request,
+        attachment.file,
+        size=attachment.size,
+        filename=attachment.original_name or attachment.file,
+        content_type=attachment.content_type or 'application/octet-stream',
+        storage=storage_gc.attachment_storage(),
+    )
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
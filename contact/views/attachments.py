@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from django.http import Http404, HttpRequest, HttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import require_http_methods
+
+from ..models import ContactAttachment
+from ..services.attachment_delivery import serve_attachment, serve_stored_file
+from ..services.previews import thumbnail_content_type
+from . import helpers
+
+# Thumbnails stay cacheable briefly; after that the browser revalidates with the
+# ETag, so the access check runs again and revoked links stop rendering.
+THUMBNAIL_MAX_AGE = 60
+
+
+@require_http_methods(["GET", "HEAD"])
+def download_attachment(request: HttpRequest, attachment_id: int) -> HttpResponse:
+    attachment = get_object_or_404(
+        ContactAttachment.objects.select_related('message'),
+        pk=attachment_id,
+    )
+    if not helpers.can_access_attachment(request, attachment):
+        raise Http404
+    return serve_attachment(request, attachment)
+
+
+@require_http_methods(["GET", "HEAD"])
+def attachment_thumbnail(request: HttpRequest, attachment_id: int) -> HttpResponse:
+    attachment = get_object_or_404(
+        ContactAttachment.objects.select_related('message'),
+        pk=attachment_id,
+        preview_status=ContactAttachment.PREVIEW_READY,
+    )
+    if not attachment.thumbnail or not helpers.can_access_attachment(request, attachment):
+        raise Http404
+    name = attachment.thumbnail.name
+    response = serve_stored_file(
+        request,
+        name,
+        size=None,
+        filename=name.rsplit('/', 1)[-1],
+        content_type=thumbnail_content_type(name),
+        storage=attachment.thumbnail.storage,
+    )
+    patch_cache_control(response, private=True, max_age=THUMBNAIL_MAX_AGE, must_revalidate=True)
+    return response
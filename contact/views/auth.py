@@ -1,22 +1,25 @@
 from __future__ import annotations
 
 import logging
-from datetime import timedelta
 
 from django.conf import settings
 from django.http import HttpRequest, HttpResponse
 from django.shortcuts import redirect, render
 from django.urls import reverse
-from django.utils import timezone
 from django.views.decorators.http import require_POST, require_http_methods
 
 from ..forms import LoginForm
+from ..services import login_lockout
 from ..utils import get_language
 
 logger = logging.getLogger(__name__)
 
-failed_attempts: dict[str, int] = {}
-blocked_ips: dict[str, timezone.datetime] = {}
+
+def _format_time_left(remaining) -> str | None:
+    if remaining is None:
+        return None
+    minutes, seconds = divmod(int(remaining.total_seconds()), 60)
+    return f"{minutes:02d}:{seconds:02d}"
 
 
 @require_http_methods(["GET", "POST"])
@@ -25,35 +28,20 @@ def login(request: HttpRequest) -> HttpResponse:
     form = LoginForm(request.POST or None)
     ip = request.META.get('REMOTE_ADDR', 'unknown')
 
-    blocked = False
-    time_left = None
-
-    if ip in blocked_ips:
-        if timezone.now() < blocked_ips[ip]:
-            blocked = True
-            remaining_time = blocked_ips[ip] - timezone.now()
-            total_seconds = int(remaining_time.total_seconds())
-            minutes, seconds = divmod(total_seconds, 60)
-            time_left = f"{minutes:02d}:{seconds:02d}"
-        else:
-            blocked_ips.pop(ip, None)
-            failed_attempts[ip] = 0
+    time_left = _format_time_left(login_lockout.get_state(ip).remaining())
+    blocked = time_left is not None
 
     if request.method == 'POST' and not blocked and form.is_valid():
         if form.cleaned_data['password'] == settings.ADMIN_PASSWORD:
             request.session['logged_in'] = True
-            failed_attempts[ip] = 0
+            login_lockout.reset(ip)
             return redirect('contact:panel')
-        failed_attempts[ip] = failed_attempts.get(ip, 0) + 1
-        if failed_attempts[ip] >= 5:
-            blocked_ips[ip] = timezone.now() + timedelta(minutes=5)
+        state = login_lockout.register_failure(ip)
+        time_left = _format_time_left(state.remaining())
+        if time_left is not None:
             blocked = True
-            remaining_time = blocked_ips[ip] - timezone.now()
-            total_seconds = int(remaining_time.total_seconds())
-            minutes, seconds = divmod(total_seconds, 60)
-            time_left = f"{minutes:02d}:{seconds:02d}"
         else:
-            attempts_left = 5 - failed_attempts[ip]
+            attempts_left = state.attempts_left
             error_message = (
                 f"Nieprawidłowe hasło! Pozostało prób: {attempts_left}"
                 if lang == 'pl'
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Callable, Iterable, Sequence
+from typing import Iterable, Sequence
 from urllib.parse import urlencode
 
 from django.contrib import messages
@@ -8,27 +8,37 @@ from django.http import HttpRequest
 from django.urls import reverse
 from django.utils import timezone
 
+from .. import catalogue
 from ..forms import (
-    ContactForm,
     MessageBulkActionForm,
     MessageFilterForm,
     TrashActionForm,
 )
 from ..models import AdminActivityLog, ContactAttachment, ContactMessage
+from ..services import access_grants
 from ..services import messages as message_service
 from ..services.activity_log import log_action, log_bulk_action
 
 
-def remember_user_message(request: HttpRequest, message_id: int) -> None:
+USER_MESSAGE_GRANTS_KEY = 'user_message_grants'
+
+
+def remember_user_message(request: HttpRequest, message: ContactMessage) -> None:
     stored_ids = get_user_message_ids(request)
-    if message_id not in stored_ids:
-        stored_ids.append(message_id)
+    if message.id not in stored_ids:
+        stored_ids.append(message.id)
     store_user_message_ids(request, stored_ids)
+    grant_message_access(request, [message])
 
 
 def store_user_message_ids(request: HttpRequest, message_ids: Sequence[int]) -> None:
     unique_ids = list(dict.fromkeys(int(mid) for mid in message_ids))
     request.session['user_message_ids'] = unique_ids
+    grants = request.session.get(USER_MESSAGE_GRANTS_KEY)
+    if grants:
+        kept = {key: value for key, value in grants.items() if _as_int(key) in unique_ids}
+        if len(kept) != len(grants):
+            request.session[USER_MESSAGE_GRANTS_KEY] = kept
 
 
 def get_user_message_ids(request: HttpRequest) -> list[int]:
@@ -47,8 +57,82 @@ def remove_user_message(request: HttpRequest, message_id: int) -> None:
     store_user_message_ids(request, remaining)
 
 
+def grant_message_access(request: HttpRequest, messages_with_access: Iterable[ContactMessage]) -> None:
+    """Record ``{id: [token expiry, granted at]}`` for messages just verified against the DB."""
+
+    grants = dict(request.session.get(USER_MESSAGE_GRANTS_KEY) or {})
+    granted_at = timezone.now().timestamp()
+    for message in messages_with_access:
+        expires_at = message.access_token_expires_at
+        grants[str(message.id)] = [expires_at.timestamp() if expires_at else None, granted_at]
+    request.session[USER_MESSAGE_GRANTS_KEY] = grants
+
+
 def user_can_access_message(request: HttpRequest, message_id: int) -> bool:
-    return int(message_id) in get_user_message_ids(request)
+    """Decide from the session grant; only stale or missing grants hit the DB."""
+
+    message_id = int(message_id)
+    if message_id not in get_user_message_ids(request):
+        return False
+    if _has_valid_grant(request, message_id):
+        return True
+
+    message = (
+        ContactMessage.objects.filter(pk=message_id, is_deleted=False, access_enabled=True)
+        .only('id', 'access_token_expires_at')
+        .first()
+    )
+    if message is None or message.is_access_token_expired:
+        remove_user_message(request, message_id)
+        return False
+    grant_message_access(request, [message])
+    return True
+
+
+def get_user_message(request: HttpRequest, message_id: int) -> ContactMessage | None:
+    """Load a message from the session's list, deciding access from that one row.
+
+    For views that need the row anyway the grant adds nothing: the row
+    already says whether the message is deleted, disabled or expired.
+    """
+
+    message_id = int(message_id)
+    if message_id not in get_user_message_ids(request):
+        return None
+    message = ContactMessage.objects.filter(pk=message_id, is_deleted=False, access_enabled=True).first()
+    if message is None or message.is_access_token_expired:
+        remove_user_message(request, message_id)
+        return None
+    return message
+
+
+def _has_valid_grant(request: HttpRequest, message_id: int) -> bool:
+    grant = (request.session.get(USER_MESSAGE_GRANTS_KEY) or {}).get(str(message_id))
+    try:
+        expires_at, granted_at = grant
+    except (TypeError, ValueError):
+        return False
+    if expires_at is not None and expires_at <= timezone.now().timestamp():
+        return False
+    revoked_at = access_grants.revoked_at(message_id)
+    return revoked_at is None or revoked_at < granted_at
+
+
+def _as_int(value) -> int | None:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def can_access_attachment(request: HttpRequest, attachment: ContactAttachment) -> bool:
+    if request.session.get('logged_in'):
+        return True
+    if not user_can_access_message(request, attachment.message_id):
+        return False
+    # The message row comes with the attachment query, so re-checking it is free.
+    message = attachment.message
+    return not message.is_deleted and message.access_enabled
 
 
 def panel_redirect_url(
@@ -73,60 +157,6 @@ def panel_redirect_url(
     return f"{base_url}?{urlencode(params)}"
 
 
-def company_options(language: str) -> list[dict[str, str]]:
-    labels = company_labels(language)
-    return [
-        {
-            'value': value,
-            'label': labels.get(value, label),
-        }
-        for value, label in ContactForm.COMPANY_CHOICES
-    ]
-
-
-def company_labels(language: str) -> dict[str, str]:
-    if language == 'pl':
-        return {value: label for value, label in ContactForm.COMPANY_CHOICES}
-    return {
-        'firma1': 'Company 1',
-        'firma2': 'Company 2',
-        'firma3': 'Company 3',
-        'inna': 'Other',
-    }
-
-
-def status_options(language: str) -> list[dict[str, str]]:
-    if language == 'pl':
-        labels = {
-            ContactMessage.STATUS_NEW: 'Nowe',
-            ContactMessage.STATUS_IN_PROGRESS: 'W trakcie',
-            ContactMessage.STATUS_READY: 'Gotowe',
-        }
-    else:
-        labels = {
-            ContactMessage.STATUS_NEW: 'New',
-            ContactMessage.STATUS_IN_PROGRESS: 'In progress',
-            ContactMessage.STATUS_READY: 'Ready',
-        }
-    return [
-        {
-            'value': ContactMessage.STATUS_NEW,
-            'label': labels[ContactMessage.STATUS_NEW],
-            'badge': 'badge--success',
-        },
-        {
-            'value': ContactMessage.STATUS_IN_PROGRESS,
-            'label': labels[ContactMessage.STATUS_IN_PROGRESS],
-            'badge': 'badge--warning',
-        },
-        {
-            'value': ContactMessage.STATUS_READY,
-            'label': labels[ContactMessage.STATUS_READY],
-            'badge': 'badge--info',
-        },
-    ]
-
-
 def resolve_filter_data(request: HttpRequest, language: str) -> dict[str, str]:
     data = request.GET if request.method == 'GET' else request.POST
     if not data or ('sort_by' not in data and 'company' not in data):
@@ -210,71 +240,53 @@ def handle_action(action: str, ids: Iterable[int], lang: str, request: HttpReque
 
 
 def handle_trash_action(action: str, ids: Iterable[int], lang: str, request: HttpRequest) -> None:
-    action_handlers: dict[str, tuple[Callable[[Iterable[int]], None], str, str]] = {
-        TrashActionForm.ACTION_RESTORE: (
-            message_service.restore_messages,
-            'Wybrane wiadomości przywrócono.',
-            'Selected messages restored.',
-        ),
-        TrashActionForm.ACTION_DELETE: (
-            lambda message_ids: message_service.purge_messages(message_ids),
-            'Wybrane wiadomości usunięto bezpowrotnie.',
-            'Selected messages permanently deleted.',
-        ),
-        TrashActionForm.ACTION_EMPTY: (
-            lambda _message_ids: message_service.purge_messages(),
-            'Kosz opróżniono.',
-            'Trash emptied.',
-        ),
-    }
-
     id_list = [int(value) for value in ids]
-    handler = action_handlers.get(action)
-    if not handler:
-        return
-
-    func, message_pl, message_en = handler
-    func(id_list)
     if action == TrashActionForm.ACTION_RESTORE:
+        message_service.restore_messages(id_list)
         log_bulk_action(
             AdminActivityLog.ACTION_RESTORE,
             id_list,
             description='Restored from trash',
         )
+        feedback = ('Wybrane wiadomości przywrócono.', 'Selected messages restored.')
     elif action == TrashActionForm.ACTION_DELETE:
-        log_bulk_action(
+        deferred = message_service.schedule_purge(id_list)
+        # The rows (and their log entries) are gone, so the purge is logged without a message link.
+        log_action(
             AdminActivityLog.ACTION_PURGE,
-            id_list,
-            description='Permanently deleted',
+            description='Permanently deleted ' + ', '.join(f'#{mid}' for mid in id_list),
         )
+        if deferred:
+            feedback = ('Wybrane wiadomości są usuwane w tle.', 'Selected messages are being deleted in the background.')
+        else:
+            feedback = ('Wybrane wiadomości usunięto bezpowrotnie.', 'Selected messages permanently deleted.')
     elif action == TrashActionForm.ACTION_EMPTY:
+        deferred = message_service.schedule_purge()
         log_action(AdminActivityLog.ACTION_PURGE, description='Emptied trash bin')
+        if deferred:
+            feedback = ('Kosz jest opróżniany w tle.', 'The trash is being emptied in the background.')
+        else:
+            feedback = ('Kosz opróżniono.', 'Trash emptied.')
+    else:
+        return
 
+    message_pl, message_en = feedback
     messages.success(request, message_pl if lang == 'pl' else message_en, extra_tags='admin')
 
 
 def localise_action_choices(form: MessageBulkActionForm, lang: str) -> None:
-    if lang == 'pl':
-        form.fields['action'].choices = [
-            (MessageBulkActionForm.ACTION_MARK_NEW, 'Oznacz jako nowe'),
-            (MessageBulkActionForm.ACTION_MARK_IN_PROGRESS, 'Oznacz jako w trakcie'),
-            (MessageBulkActionForm.ACTION_MARK_READY, 'Oznacz jako gotowe'),
-            (MessageBulkActionForm.ACTION_DELETE, 'Usuń'),
-        ]
-    else:
-        form.fields['action'].choices = [
-            (MessageBulkActionForm.ACTION_MARK_NEW, 'Mark as new'),
-            (MessageBulkActionForm.ACTION_MARK_IN_PROGRESS, 'Mark as in progress'),
-            (MessageBulkActionForm.ACTION_MARK_READY, 'Mark as ready'),
-            (MessageBulkActionForm.ACTION_DELETE, 'Delete'),
-        ]
+    form.fields['action'].choices = catalogue.for_language(lang).action_choices
 
 
-def serialise_attachment(attachment: ContactAttachment) -> dict[str, str | int]:
+def serialise_attachment(attachment: ContactAttachment) -> dict[str, str | int | None]:
+    thumbnail_url = None
+    if attachment.preview_status == ContactAttachment.PREVIEW_READY and attachment.thumbnail:
+        thumbnail_url = reverse('contact:attachment_thumbnail', args=[attachment.id])
     return {
         'id': attachment.id,
         'name': attachment.original_name or attachment.file.name,
-        'url': attachment.file.url,
+        'url': reverse('contact:download_attachment', args=[attachment.id]),
+        'thumbnail_url': thumbnail_url,
         'content_type': attachment.content_type,
         'size': attachment.size,
     }
@@ -285,13 +297,8 @@ def serialise_client_message(
     *,
     language: str,
 ) -> dict[str, object]:
-    status_choices = status_options(language)
-    status_lookup = {item['value']: item for item in status_choices}
-    company_lookup = company_labels(language)
-    status_info = status_lookup.get(
-        message.status,
-        {'label': message.status, 'badge': 'badge--info'},
-    )
+    labels = catalogue.for_language(language)
+    status_info = labels.status_info(message.status)
     created_at = timezone.localtime(message.created_at).strftime('%Y-%m-%d %H:%M')
     return {
         'id': message.id,
@@ -300,11 +307,11 @@ def serialise_client_message(
         'email': message.email,
         'company': message.company,
         'company_name': message.company_name,
-        'company_label': company_lookup.get(message.company, message.company),
+        'company_label': labels.company_labels.get(message.company, message.company),
         'message': message.message,
         'status': message.status,
-        'status_label': status_info.get('label', message.status),
-        'status_badge': status_info.get('badge', 'badge--info'),
+        'status_label': status_info['label'],
+        'status_badge': status_info['badge'],
         'created_at': created_at,
         'final_changes': message.final_changes,
         'final_response': message.final_response,
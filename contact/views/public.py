@@ -2,82 +2,75 @@ from __future__ import annotations
 
 import json
 import logging
-import math
 import smtplib
 
 from django.conf import settings
 from django.contrib import messages
+from django.contrib.messages.storage.cookie import CookieStorage
 from django.core.cache import cache
 from django.db import DatabaseError
-from django.db.models import Q
 from django.http import HttpRequest, HttpResponse
+from django.middleware.csrf import get_token
 from django.shortcuts import redirect, render
+from django.template.loader import render_to_string
 from django.urls import reverse
-from django.utils import timezone
 from django.views.decorators.http import require_http_methods
 
+from .. import catalogue
 from ..forms import ContactForm
 from ..models import ContactMessage
 from ..services import messages as message_service
+from ..services import rate_limit
 from ..services.email_service import (
     send_company_notification,
     send_contact_email,
 )
-from ..utils import build_rate_limit_key, get_client_ip, get_language
+from ..utils import get_client_ip, get_language
 from . import helpers
 
 logger = logging.getLogger(__name__)
 
+INDEX_PAGE_CACHE_PREFIX = 'contact:index_page'
+CSRF_TOKEN_PLACEHOLDER = '__csrf_token_placeholder__'
+INDEX_PAGE_CACHE_LANGUAGES = ('pl', 'en')
+
 
 @require_http_methods(["GET", "POST"])
 def index(request: HttpRequest) -> HttpResponse:
+    if request.method == 'GET' and _is_anonymous_visit(request):
+        return _cached_landing_page(request)
+
     lang = get_language(request)
     form = ContactForm(request.POST or None, request.FILES or None, language=lang)
     success_message = request.session.pop('contact_success', None)
 
-    throttle_seconds = getattr(settings, 'CONTACT_FORM_THROTTLE_SECONDS', 30)
-    throttle_prefix = getattr(settings, 'CONTACT_FORM_RATE_LIMIT_PREFIX', 'contact_form')
+    limiter = rate_limit.contact_form_limiter()
     form_valid = False
-    throttle_error = False
-    submission_timestamp: float | None = None
-    cache_keys: list[str] = []
+    limit_result = rate_limit.RateLimitResult(False)
 
     if request.method == 'POST':
-        submission_timestamp = timezone.now().timestamp()
         client_identifier = get_client_ip(request) or request.session.session_key or 'anonymous'
-        ip_key = build_rate_limit_key(f'{throttle_prefix}:ip', client_identifier)
-        cache_keys.append(ip_key)
-
+        rate_limit_identifiers = {'ip': client_identifier}
         raw_email = (request.POST.get('email') or '').strip().lower()
-        email_key = build_rate_limit_key(f'{throttle_prefix}:email', raw_email) if raw_email else None
-        if email_key:
-            cache_keys.append(email_key)
-
-        remaining_durations: list[float] = []
-        for key in cache_keys:
-            last_submission_raw = cache.get(key)
-            if last_submission_raw is None:
-                continue
-            try:
-                last_submission_ts = float(last_submission_raw)
-            except (TypeError, ValueError):
-                continue
-            elapsed = submission_timestamp - last_submission_ts
-            if elapsed < throttle_seconds:
-                remaining_durations.append(throttle_seconds - elapsed)
-
-        if remaining_durations:
-            remaining_seconds = max(1, int(math.ceil(max(remaining_durations))))
+        if raw_email:
+            rate_limit_identifiers['email'] = raw_email
+
+        # Taken up front so that concurrent posts cannot all get through;
+        # handed back below if the submission does not go through.
+        limit_result = limiter.acquire(rate_limit_identifiers)
+        if not limit_result.allowed:
+            remaining_seconds = rate_limit.retry_after_seconds(limit_result)
             if lang == 'pl':
                 error_message = f'Proszę poczekać {remaining_seconds} s przed ponownym wysłaniem formularza.'
             else:
                 error_message = f'Please wait {remaining_seconds} s before submitting the form again.'
             form.add_error(None, error_message)
-            throttle_error = True
 
         form_valid = form.is_valid()
+        if limit_result.allowed and not form_valid:
+            limiter.refund(limit_result)
 
-    if request.method == 'POST' and form_valid and not throttle_error:
+    if request.method == 'POST' and form_valid and limit_result.allowed:
         payload = {
             "full_name": form.cleaned_data["full_name"],
             "phone": form.cleaned_data["phone"],
@@ -94,6 +87,7 @@ def index(request: HttpRequest) -> HttpResponse:
             )
         except DatabaseError:
             logger.exception('Failed to persist contact message')
+            limiter.refund(limit_result)
             if lang == 'pl':
                 error_text = 'Nie udało się zapisać zgłoszenia. Spróbuj ponownie później.'
             else:
@@ -111,17 +105,15 @@ def index(request: HttpRequest) -> HttpResponse:
                     send_company_notification(message, link=notification_link)
             except smtplib.SMTPException:
                 logger.exception('Failed to send contact form emails')
-                message.delete()
+                message_service.discard_message(message)
+                limiter.refund(limit_result)
                 if lang == 'pl':
                     error_text = 'Nie udało się wysłać wiadomości e-mail. Spróbuj ponownie później.'
                 else:
                     error_text = 'Unable to send the email right now. Please try again later.'
                 form.add_error(None, error_text)
             else:
-                helpers.remember_user_message(request, message.id)
-                if submission_timestamp is not None:
-                    for key in cache_keys:
-                        cache.set(key, submission_timestamp, throttle_seconds)
+                helpers.remember_user_message(request, message)
                 if lang == 'pl':
                     success_message = (
                         'Wiadomość została wysłana. Zostanie przetworzona w ciągu 48 godzin, po czym się z Tobą skontaktujemy. '
@@ -136,6 +128,17 @@ def index(request: HttpRequest) -> HttpResponse:
                 request.session['contact_success'] = success_message
                 return redirect(f"{reverse('contact:index')}?lang={lang}")
 
+    context = _index_context(request, lang, form, success_message)
+    return render(request, 'contact/index.html', context)
+
+
+def _index_context(
+    request: HttpRequest,
+    lang: str,
+    form: ContactForm,
+    success_message: str | None,
+) -> dict[str, object]:
+    labels = catalogue.for_language(lang)
     allowed_types = [
         content_type.strip()
         for content_type in getattr(settings, 'ATTACH_ALLOWED_TYPES', [])
@@ -145,27 +148,24 @@ def index(request: HttpRequest) -> HttpResponse:
     stored_ids = helpers.get_user_message_ids(request)
     active_request: ContactMessage | None = None
     if stored_ids:
-        active_request = (
+        candidates = (
             ContactMessage.objects.filter(
                 id__in=stored_ids,
                 is_deleted=False,
                 access_enabled=True,
             )
-            .filter(Q(access_token_expires_at__isnull=True) | Q(access_token_expires_at__gt=timezone.now()))
             .prefetch_related('attachments')
             .order_by('-created_at')
-            .first()
+        )
+        active_request = next(
+            (message for message in candidates if not message.is_access_token_expired),
+            None,
         )
 
     active_request_data: dict[str, object] | None = None
     if active_request:
         active_request_data = helpers.serialise_client_message(active_request, language=lang)
 
-    status_meta = {
-        item['value']: {'label': item['label'], 'badge': item['badge']}
-        for item in helpers.status_options(lang)
-    }
-
     if lang == 'pl':
         detail_error_message = 'Nie udało się pobrać danych zgłoszenia.'
         update_error_message = 'Nie udało się zapisać zmian. Popraw błędy i spróbuj ponownie.'
@@ -183,11 +183,11 @@ def index(request: HttpRequest) -> HttpResponse:
         'form': form,
         'lang': lang,
         'success_message': success_message,
-        'throttle_seconds': throttle_seconds,
+        'throttle_seconds': getattr(settings, 'CONTACT_FORM_THROTTLE_SECONDS', 30),
         'max_attachment_size': getattr(settings, 'ATTACH_MAX_SIZE_MB', 25),
         'allowed_attachment_types': allowed_types,
-        'status_meta_json': json.dumps(status_meta),
-        'company_options': helpers.company_options(lang),
+        'status_meta_json': labels.status_meta_json,
+        'company_options': labels.company_options,
         'active_request_json': json.dumps(active_request_data) if active_request_data else '',
         'active_request_id': active_request_data['id'] if active_request_data else None,
         'has_active_request': bool(active_request_data),
@@ -197,4 +197,35 @@ def index(request: HttpRequest) -> HttpResponse:
         'restore_error_message': restore_error_message,
         'restore_success_message': restore_success_message,
     }
-    return render(request, 'contact/index.html', context)
+    return context
+
+
+def _is_anonymous_visit(request: HttpRequest) -> bool:
+    """True when the page can only differ by language and CSRF token.
+
+    Without a session there are no stored request IDs, success message or
+    saved language, and without the messages cookie there are no flashes.
+    """
+
+    if getattr(settings, 'INDEX_PAGE_CACHE_SECONDS', 0) <= 0:
+        return False
+    if (request.GET.get('lang') or settings.DEFAULT_LANGUAGE) not in INDEX_PAGE_CACHE_LANGUAGES:
+        return False
+    return (
+        settings.SESSION_COOKIE_NAME not in request.COOKIES
+        and CookieStorage.cookie_name not in request.COOKIES
+    )
+
+
+def _cached_landing_page(request: HttpRequest) -> HttpResponse:
+    lang = get_language(request)
+    cache_key = f'{INDEX_PAGE_CACHE_PREFIX}:{lang}'
+    content = cache.get(cache_key)
+    if content is None:
+        context = _index_context(request, lang, ContactForm(language=lang), None)
+        # Rendered once for everybody: the per-visitor token is swapped in below.
+        context['csrf_token'] = CSRF_TOKEN_PLACEHOLDER
+        context['messages'] = ()
+        content = render_to_string('contact/index.html', context, request=request)
+        cache.set(cache_key, content, getattr(settings, 'INDEX_PAGE_CACHE_SECONDS', 0))
+    return HttpResponse(content.replace(CSRF_TOKEN_PLACEHOLDER, get_token(request)))
@@ -9,10 +9,11 @@ from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.utils import timezone
 from django.views.decorators.http import require_POST, require_http_methods
-from django.db.models import Q
 
+from .. import catalogue
 from ..forms import RequestAccessForm, UserMessageUpdateForm
 from ..models import ClientChangeLog, ContactMessage
+from ..services import client_log
 from ..services import messages as message_service
 from ..utils import get_language
 from . import helpers
@@ -28,20 +29,21 @@ def access_portal(request: HttpRequest) -> HttpResponse:
         message_id = form.cleaned_data['request_id']
         token = form.cleaned_data['access_token']
         message = ContactMessage.objects.filter(id=message_id, is_deleted=False).first()
-        if not message or not message.access_enabled:
-            error = (
-                'Nie znaleziono zgłoszenia o podanym numerze.'
-                if lang == 'pl'
-                else 'No request with this number could be found.'
-            )
-            form.add_error('request_id', error)
-        elif message.is_access_token_expired:
+        if message and message.is_access_token_expired:
+            # Checked first: the sweeper also clears access_enabled on expired tokens.
             error = (
                 'Token wygasł. Poproś o nowy dostęp.'
                 if lang == 'pl'
                 else 'The access token has expired. Please request new access.'
             )
             form.add_error('access_token', error)
+        elif not message or not message.access_enabled:
+            error = (
+                'Nie znaleziono zgłoszenia o podanym numerze.'
+                if lang == 'pl'
+                else 'No request with this number could be found.'
+            )
+            form.add_error('request_id', error)
         elif not message.verify_access_token(token):
             error = (
                 'Token nie pasuje do zgłoszenia.'
@@ -50,7 +52,7 @@ def access_portal(request: HttpRequest) -> HttpResponse:
             )
             form.add_error('access_token', error)
         else:
-            helpers.remember_user_message(request, message.id)
+            helpers.remember_user_message(request, message)
             success = (
                 'Dostęp przyznany. Możesz teraz zarządzać zgłoszeniem.'
                 if lang == 'pl'
@@ -81,6 +83,13 @@ def restore_access(request: HttpRequest) -> JsonResponse:
     message_id = form.cleaned_data['request_id']
     token = form.cleaned_data['access_token']
     message = ContactMessage.objects.filter(id=message_id, is_deleted=False).first()
+    if message and message.is_access_token_expired:
+        error = (
+            'Token wygasł. Poproś o nowy dostęp.'
+            if language == 'pl'
+            else 'The access token has expired. Please request new access.'
+        )
+        return JsonResponse({'errors': {'access_token': [error]}}, status=400)
     if not message or not message.access_enabled:
         error = (
             'Nie znaleziono zgłoszenia o podanym numerze.'
@@ -88,13 +97,6 @@ def restore_access(request: HttpRequest) -> JsonResponse:
             else 'No request with this number could be found.'
         )
         return JsonResponse({'errors': {'request_id': [error]}}, status=400)
-    if message.is_access_token_expired:
-        error = (
-            'Token wygasł. Poproś o nowy dostęp.'
-            if language == 'pl'
-            else 'The access token has expired. Please request new access.'
-        )
-        return JsonResponse({'errors': {'access_token': [error]}}, status=400)
     if not message.verify_access_token(token):
         error = (
             'Token nie pasuje do zgłoszenia.'
@@ -103,7 +105,7 @@ def restore_access(request: HttpRequest) -> JsonResponse:
         )
         return JsonResponse({'errors': {'access_token': [error]}}, status=400)
 
-    helpers.remember_user_message(request, message.id)
+    helpers.remember_user_message(request, message)
     success_message = (
         'Dostęp przywrócono. Możesz kontynuować edycję zgłoszenia.'
         if language == 'pl'
@@ -116,24 +118,25 @@ def restore_access(request: HttpRequest) -> JsonResponse:
 def user_requests(request: HttpRequest) -> HttpResponse:
     lang = get_language(request)
     stored_ids = helpers.get_user_message_ids(request)
-    queryset = (
-        ContactMessage.objects.filter(id__in=stored_ids, is_deleted=False, access_enabled=True)
-        .filter(Q(access_token_expires_at__isnull=True) | Q(access_token_expires_at__gt=timezone.now()))
-        .order_by('-created_at')
-    )
+    # Expired tokens are switched off by sweep_expired_access; until it runs the
+    # handful of stored ids is checked in Python rather than with an OR in SQL.
+    queryset = [
+        message
+        for message in ContactMessage.objects.filter(
+            id__in=stored_ids, is_deleted=False, access_enabled=True
+        ).order_by('-created_at')
+        if not message.is_access_token_expired
+    ]
 
-    status_options = helpers.status_options(lang)
-    status_lookup = {item['value']: item for item in status_options}
-    company_labels = helpers.company_labels(lang)
+    labels = catalogue.for_language(lang)
 
     request_cards: list[dict[str, str]] = []
     valid_ids: list[int] = []
+    messages_with_access: list[ContactMessage] = []
     for message in queryset:
         valid_ids.append(message.id)
-        status_info = status_lookup.get(
-            message.status,
-            {'label': message.status, 'badge': 'badge--info'},
-        )
+        messages_with_access.append(message)
+        status_info = labels.status_info(message.status)
         request_cards.append(
             {
                 'id': message.id,
@@ -141,17 +144,14 @@ def user_requests(request: HttpRequest) -> HttpResponse:
                 'status': message.status,
                 'status_label': status_info['label'],
                 'status_badge': status_info['badge'],
-                'company_label': company_labels.get(message.company, message.company),
+                'company_label': labels.company_labels.get(message.company, message.company),
                 'company_name': message.company_name,
                 'message_preview': message.message,
             }
         )
 
     helpers.store_user_message_ids(request, valid_ids)
-
-    status_meta = {
-        item['value']: {"label": item['label'], "badge": item['badge']} for item in status_options
-    }
+    helpers.grant_message_access(request, messages_with_access)
 
     allowed_types = [
         content_type.strip()
@@ -171,8 +171,8 @@ def user_requests(request: HttpRequest) -> HttpResponse:
     context = {
         'lang': lang,
         'request_cards': request_cards,
-        'status_meta_json': json.dumps(status_meta),
-        'company_options': helpers.company_options(lang),
+        'status_meta_json': labels.status_meta_json,
+        'company_options': labels.company_options,
         'detail_error_message': detail_error_message,
         'update_error_message': update_error_message,
         'delete_confirm_message': delete_confirm_message,
@@ -184,13 +184,10 @@ def user_requests(request: HttpRequest) -> HttpResponse:
 
 @require_http_methods(["GET"])
 def user_message_detail(request: HttpRequest, message_id: int) -> JsonResponse:
-    if not helpers.user_can_access_message(request, message_id):
+    message = helpers.get_user_message(request, message_id)
+    if message is None:
         return JsonResponse({'error': 'not_found'}, status=404)
 
-    message = get_object_or_404(
-        ContactMessage.objects.filter(pk=message_id, is_deleted=False, access_enabled=True)
-        .filter(Q(access_token_expires_at__isnull=True) | Q(access_token_expires_at__gt=timezone.now()))
-    )
     language = get_language(request)
     data = helpers.serialise_client_message(message, language=language)
     return JsonResponse(data)
@@ -198,13 +195,10 @@ def user_message_detail(request: HttpRequest, message_id: int) -> JsonResponse:
 
 @require_POST
 def user_update_message(request: HttpRequest, message_id: int) -> JsonResponse:
-    if not helpers.user_can_access_message(request, message_id):
+    message = helpers.get_user_message(request, message_id)
+    if message is None:
         return JsonResponse({'error': 'not_found'}, status=404)
 
-    message = get_object_or_404(
-        ContactMessage.objects.filter(pk=message_id, is_deleted=False, access_enabled=True)
-        .filter(Q(access_token_expires_at__isnull=True) | Q(access_token_expires_at__gt=timezone.now()))
-    )
     if message.status != ContactMessage.STATUS_NEW:
         return JsonResponse({'error': 'locked'}, status=403)
     language = get_language(request)
@@ -224,22 +218,13 @@ def user_update_message(request: HttpRequest, message_id: int) -> JsonResponse:
         attachments = form.cleaned_data.get('attachments') or []
         if attachments:
             message_service.add_attachments(updated_message, attachments)
-        log_entries: list[ClientChangeLog] = []
+        changes: list[tuple[str, str, str]] = []
         for field in changed_fields:
-            previous = before_values.get(field, '') or ''
-            current = getattr(updated_message, field) or ''
-            if str(previous) == str(current):
-                continue
-            log_entries.append(
-                ClientChangeLog(
-                    message=updated_message,
-                    field=field,
-                    previous_value=str(previous),
-                    new_value=str(current),
-                )
-            )
-        if log_entries:
-            ClientChangeLog.objects.bulk_create(log_entries)
+            previous = str(before_values.get(field, '') or '')
+            current = str(getattr(updated_message, field) or '')
+            if previous != current:
+                changes.append((field, previous, current))
+        client_log.record_changes(updated_message, changes)
         data = helpers.serialise_client_message(updated_message, language=language)
         return JsonResponse(data)
 
@@ -157,6 +157,7 @@
         );
         const fieldCheckboxes = $$('input[name="fields"]', downloadModal);
         const submitButton = $('[data-download-submit]', downloadModal);
+        const attachmentsButton = $('[data-download-attachments]', downloadModal);
         const tableSelection = $$('[data-row-checkbox]');
         const hiddenInputsContainer = $('[data-download-selected]', downloadModal);
         const requestsCountElement = $('[data-download-requests-count]', downloadModal);
@@ -312,6 +313,9 @@
             if (submitButton) {
                 submitButton.disabled = !(hasRequests && hasFields);
             }
+            if (attachmentsButton) {
+                attachmentsButton.disabled = !hasRequests;
+            }
         };
 
         const updateOpenButtonState = () => {
@@ -414,6 +418,7 @@
         const detailTemplate = requestModal.dataset.detailTemplate || '';
         const updateTemplate = requestModal.dataset.updateTemplate || '';
         const rollbackTemplate = requestModal.dataset.rollbackTemplate || '';
+        const logsTemplate = requestModal.dataset.logsTemplate || '';
         const language = requestModal.dataset.language || 'pl';
         const fieldLabels = language === 'pl'
             ? {
@@ -576,6 +581,14 @@
                 link.target = '_blank';
                 link.rel = 'noopener';
                 link.textContent = item.name || 'attachment';
+                if (item.thumbnail_url) {
+                    const preview = document.createElement('img');
+                    preview.className = 'attachment-list__thumb';
+                    preview.src = item.thumbnail_url;
+                    preview.alt = '';
+                    preview.loading = 'lazy';
+                    link.prepend(preview);
+                }
                 if (item.size) {
                     const sizeKb = (Number(item.size) / 1024).toFixed(1);
                     const sizeSpan = document.createElement('span');
@@ -589,12 +602,16 @@
             });
         };
 
-        const renderClientLog = (entries) => {
+        const renderClientLog = (entries, nextPage, append = false) => {
             if (!clientLogList) {
                 return;
             }
-            clientLogList.innerHTML = '';
-            if (!entries || !entries.length) {
+            if (append) {
+                $$('.client-log__more', clientLogList).forEach((item) => item.remove());
+            } else {
+                clientLogList.innerHTML = '';
+            }
+            if (!append && (!entries || !entries.length)) {
                 if (clientLogEmptyMessage) {
                     const emptyItem = document.createElement('li');
                     emptyItem.className = 'client-log__empty';
@@ -636,6 +653,47 @@
                 listItem.appendChild(actions);
                 clientLogList.appendChild(listItem);
             });
+            if (nextPage) {
+                const moreItem = document.createElement('li');
+                moreItem.className = 'client-log__more';
+                const moreButton = document.createElement('button');
+                moreButton.type = 'button';
+                moreButton.className = 'button button--ghost button--compact';
+                moreButton.dataset.logMore = String(nextPage);
+                moreButton.textContent = language === 'pl' ? 'Pokaż starsze' : 'Show older';
+                moreItem.appendChild(moreButton);
+                clientLogList.appendChild(moreItem);
+            }
+        };
+
+        const loadMoreClientLog = (page, trigger) => {
+            if (!logsTemplate || !currentId) {
+                return;
+            }
+            const url = `${buildUrl(logsTemplate, currentId)}?page=${encodeURIComponent(page)}`;
+            if (trigger) {
+                trigger.disabled = true;
+            }
+            fetch(url, {
+                headers: {
+                    'X-Requested-With': 'XMLHttpRequest',
+                },
+            })
+                .then((response) => {
+                    if (!response.ok) {
+                        throw new Error(String(response.status));
+                    }
+                    return response.json();
+                })
+                .then((data) => {
+                    renderClientLog(data.client_logs || [], data.client_logs_next_page, true);
+                })
+                .catch(() => {
+                    alert(detailErrorMessage || 'Unable to load more changes.');
+                    if (trigger) {
+                        trigger.disabled = false;
+                    }
+                });
         };
 
         const setAccessInfo = (data) => {
@@ -671,7 +729,7 @@
             renderAttachments(data.attachments || []);
             setAccessInfo(data);
             if (data.client_logs) {
-                renderClientLog(data.client_logs);
+                renderClientLog(data.client_logs, data.client_logs_next_page);
             }
         };
 
@@ -842,7 +900,14 @@
         if (clientLogList) {
             clientLogList.addEventListener('click', (event) => {
                 const target = event.target;
-                if (!(target instanceof HTMLButtonElement) || target.dataset.logRollback !== 'true') {
+                if (!(target instanceof HTMLButtonElement)) {
+                    return;
+                }
+                if (target.dataset.logMore) {
+                    loadMoreClientLog(target.dataset.logMore, target);
+                    return;
+                }
+                if (target.dataset.logRollback !== 'true') {
                     return;
                 }
                 const logId = target.dataset.logId;
@@ -53,12 +53,28 @@ default_cache_backend = os.getenv(
 )
 default_cache_location = os.getenv('DJANGO_CACHE_LOCATION', str(BASE_DIR / 'cache'))
 
-CACHES = {
-    'default': {
-        'BACKEND': default_cache_backend,
-        'LOCATION': default_cache_location,
+# Локальный LRU-кэш процесса перед общим бэкендом; 0 — отключить.
+cache_local_timeout = float(os.getenv('DJANGO_CACHE_LOCAL_TIMEOUT', '2'))
+
+if cache_local_timeout > 0:
+    CACHES = {
+        'default': {
+            'BACKEND': 'contact.cache_backends.TwoTierCache',
+            'LOCATION': default_cache_location,
+            'OPTIONS': {
+                'BACKEND': default_cache_backend,
+                'LOCAL_TIMEOUT': cache_local_timeout,
+                'LOCAL_MAX_ENTRIES': int(os.getenv('DJANGO_CACHE_LOCAL_MAX_ENTRIES', '1000')),
+            },
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': default_cache_backend,
+            'LOCATION': default_cache_location,
+        }
     }
-}
 
 if default_cache_backend.endswith('FileBasedCache'):
     os.makedirs(default_cache_location, exist_ok=True)
@@ -77,6 +93,8 @@ INSTALLED_APPS = [
 
 # --- Middleware ---
 MIDDLEWARE = [
+    # Пробы /health/live/ и /health/ready/ отвечают до сессий, CSRF и редиректа на HTTPS.
+    'contact.middleware.HealthCheckMiddleware',
     'django.middleware.security.SecurityMiddleware',
     # WhiteNoise добавим ниже условно в проде
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -85,6 +103,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # Журнал действий админа пишется одной пачкой в конце запроса.
+    'contact.middleware.ActivityLogMiddleware',
 ]
 
 ROOT_URLCONF = 'zetom_project.urls'
@@ -176,7 +196,10 @@ else:
     STATICFILES_DIRS = [BASE_DIR / 'static'] if (BASE_DIR / 'static').exists() else []
 
     # Подключаем WhiteNoise
-    MIDDLEWARE.insert(1, 'whitenoise.middleware.WhiteNoiseMiddleware')
+    MIDDLEWARE.insert(
+        MIDDLEWARE.index('django.middleware.security.SecurityMiddleware') + 1,
+        'whitenoise.middleware.WhiteNoiseMiddleware',
+    )
     STORAGES['staticfiles'] = {
         'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage',
     }
@@ -252,9 +275,31 @@ ADMIN_PASSWORD = os.environ.get('ADMIN_PASSWORD', 'admin123')
 DEFAULT_LANGUAGE = os.environ.get('DEFAULT_LANGUAGE', 'pl')
 LOGIN_URL = 'contact:login'
 
+# Готовая страница для анонимных посетителей (по языку); 0 — не кэшировать.
+INDEX_PAGE_CACHE_SECONDS = int(os.getenv('INDEX_PAGE_CACHE_SECONDS', '300'))
 CONTACT_FORM_THROTTLE_SECONDS = int(os.getenv('CONTACT_FORM_THROTTLE_SECONDS', '30'))
 CONTACT_FORM_RATE_LIMIT_PREFIX = os.getenv('CONTACT_FORM_RATE_LIMIT_PREFIX', 'contact_form')
+# Сколько своих обратных прокси дописывают X-Forwarded-For; 0 — заголовку не верим, берём REMOTE_ADDR.
+# На Render перед приложением всегда стоит его прокси, поэтому там по умолчанию 1.
+TRUSTED_PROXY_COUNT = int(os.getenv('TRUSTED_PROXY_COUNT', '1' if render_hostname else '0'))
+# Скользящее окно на IP поверх пауза-троттлинга; 0 — отключить.
+CONTACT_FORM_HOURLY_LIMIT = int(os.getenv('CONTACT_FORM_HOURLY_LIMIT', '20'))
+# Блокировка входа в админку хранится в БД (общая для всех воркеров).
+ADMIN_LOGIN_MAX_ATTEMPTS = int(os.getenv('ADMIN_LOGIN_MAX_ATTEMPTS', '5'))
+ADMIN_LOGIN_LOCKOUT_SECONDS = int(os.getenv('ADMIN_LOGIN_LOCKOUT_SECONDS', '300'))
+ADMIN_LOGIN_ATTEMPT_TTL_SECONDS = int(os.getenv('ADMIN_LOGIN_ATTEMPT_TTL_SECONDS', '900'))
+ADMIN_LOGIN_LOCKOUT_MAX_ENTRIES = int(os.getenv('ADMIN_LOGIN_LOCKOUT_MAX_ENTRIES', '10000'))
+# Чистка таблицы блокировок прямо в запросе — примерно раз на столько новых клиентов; 0 — только prune_login_attempts.
+ADMIN_LOGIN_PRUNE_EVERY = int(os.getenv('ADMIN_LOGIN_PRUNE_EVERY', '100'))
 CONTACT_ACCESS_TOKEN_TTL_HOURS = int(os.getenv('CONTACT_ACCESS_TOKEN_TTL_HOURS', '72'))
+# Ключ HMAC для токенов доступа клиентов; пусто — используется SECRET_KEY.
+CONTACT_ACCESS_TOKEN_KEY = os.getenv('CONTACT_ACCESS_TOKEN_KEY', '').strip()
+# Прежние ключи токенов через запятую — действуют только вместе с CONTACT_ACCESS_TOKEN_KEY.
+CONTACT_ACCESS_TOKEN_KEY_FALLBACKS = [
+    key.strip()
+    for key in os.getenv('CONTACT_ACCESS_TOKEN_KEY_FALLBACKS', '').split(',')
+    if key.strip()
+]
 SMTP_RETRY_ATTEMPTS = int(os.getenv('SMTP_RETRY_ATTEMPTS', '2'))
 SMTP_TIMEOUT = int(os.getenv('SMTP_TIMEOUT', '30'))
 ATTACH_MAX_SIZE_MB = int(os.getenv('ATTACH_MAX_SIZE_MB', '25'))
@@ -268,6 +313,43 @@ ATTACH_ALLOWED_EXTENSIONS = [
     if ext.strip()
 ]
 ATTACH_SCAN_COMMAND = os.getenv('ATTACH_SCAN_COMMAND', '').strip()
+# Вложения отдаются только через проверку доступа. 'nginx' → X-Accel-Redirect,
+# 'apache' → X-Sendfile; пусто — файл стримит сам Django (Range/ETag).
+ATTACH_SENDFILE_BACKEND = os.getenv('ATTACH_SENDFILE_BACKEND', '').strip().lower()
+ATTACH_SENDFILE_URL_PREFIX = os.getenv('ATTACH_SENDFILE_URL_PREFIX', '/protected-media/')
+ATTACH_STORAGE_WRITE_WORKERS = int(os.getenv('ATTACH_STORAGE_WRITE_WORKERS', '4'))
+ATTACH_PREVIEWS_ON_UPLOAD = os.getenv('ATTACH_PREVIEWS_ON_UPLOAD', 'true').lower() in ('1', 'true', 'yes', 'on')
+ATTACH_PREVIEW_SIZE = int(os.getenv('ATTACH_PREVIEW_SIZE', '320'))
+ATTACH_PREVIEW_TIMEOUT = int(os.getenv('ATTACH_PREVIEW_TIMEOUT', '30'))
+# Первая страница PDF: команда читает PDF из stdin и пишет PNG в stdout.
+ATTACH_PDF_PREVIEW_COMMAND = os.getenv(
+    'ATTACH_PDF_PREVIEW_COMMAND',
+    'pdftoppm -png -singlefile -f 1 -l 1 -scale-to 640 - -',
+).strip()
+
+# Фоновые задачи: thread — пул потоков в процессе, sync — сразу, off — только команды.
+BACKGROUND_TASKS_MODE = os.getenv('BACKGROUND_TASKS_MODE', 'thread').strip().lower()
+BACKGROUND_TASKS_WORKERS = int(os.getenv('BACKGROUND_TASKS_WORKERS', '2'))
+# true — пачки журнала действий пишутся фоновым потоком, а не в конце запроса.
+ACTIVITY_LOG_ASYNC = os.getenv('ACTIVITY_LOG_ASYNC', 'false').lower() in ('1', 'true', 'yes', 'on')
+# Журналы старше стольких дней archive_activity_logs переносит в сжатые архивы.
+LOG_RETENTION_DAYS = int(os.getenv('LOG_RETENTION_DAYS', '180'))
+# Каталог архивов журналов (*.jsonl.gz); относительный путь — от BASE_DIR.
+LOG_ARCHIVE_DIR = BASE_DIR / os.getenv('LOG_ARCHIVE_DIR', 'log_archive')
+# Правки клиента одного поля в пределах окна (секунды) сливаются в одну запись истории; 0 — не сливать.
+CLIENT_LOG_COALESCE_SECONDS = int(os.getenv('CLIENT_LOG_COALESCE_SECONDS', '600'))
+# Готовые заявки старше стольких дней archive_closed_requests переносит в архивные таблицы.
+ARCHIVE_READY_AFTER_DAYS = int(os.getenv('ARCHIVE_READY_AFTER_DAYS', '365'))
+# Персональные данные заявок старше стольких дней стирает anonymise_old_requests.
+ANONYMISE_AFTER_DAYS = int(os.getenv('ANONYMISE_AFTER_DAYS', '730'))
+# Очистка корзины: заявок за одну транзакцию и порог, выше которого она уходит в фон.
+PURGE_BATCH_SIZE = int(os.getenv('PURGE_BATCH_SIZE', '500'))
+PURGE_SYNC_LIMIT = int(os.getenv('PURGE_SYNC_LIMIT', '200'))
+# run_benchmarks: файл базовых замеров (по машинам) и допустимое замедление (0.25 — на 25 %).
+BENCHMARK_BASELINE_FILE = BASE_DIR / os.getenv('BENCHMARK_BASELINE_FILE', 'benchmarks/baselines.json')
+BENCHMARK_REGRESSION_THRESHOLD = float(os.getenv('BENCHMARK_REGRESSION_THRESHOLD', '0.25'))
+# Таймаут каждой проверки /health/ready/ (БД, кэш, хранилище), секунды.
+HEALTH_CHECK_TIMEOUT = float(os.getenv('HEALTH_CHECK_TIMEOUT', '2'))
 
 SENTRY_DSN = os.getenv('SENTRY_DSN', '').strip()
 SENTRY_TRACES_SAMPLE_RATE = float(os.getenv('SENTRY_TRACES_SAMPLE_RATE', '0.0'))